@@ -48,6 +48,7 @@ class AnimationController(wx.EvtHandler):
         self.bitmapPool = bitmapPool
         self.mapFilesPool = mapFilesPool
         self.bitmapProvider = provider
+        self.bitmapProvider.frameLoaded.connect(self._frameLoaded)
         for anim, win in zip(self.animations, self.mapwindows):
             anim.SetCallbackUpdateFrame(
                 lambda index, dataId, win=win: self.UpdateFrame(index, win, dataId))
@@ -130,6 +131,13 @@ class AnimationController(wx.EvtHandler):
 
         self.UpdateFrame(index, win, dataId)
 
+    def _frameLoaded(self, dataId):
+        """Redraws windows showing the frame which was just loaded"""
+        for anim, win in zip(self.animations, self.mapwindows):
+            if anim.IsActive() and anim.frames and \
+               anim.GetFrame(anim.currentIndex) == dataId:
+                self.UpdateFrame(anim.currentIndex, win, dataId)
+
     def UpdateFrame(self, index, win, dataId):
         bitmap = self.bitmapProvider.GetBitmap(dataId)
         if not UserSettings.Get(group='animation', key='temporal',
@@ -372,7 +380,8 @@ class AnimationController(wx.EvtHandler):
             self._loadLegend(animData)
         color = UserSettings.Get(group='animation', key='bgcolor', subkey='color')
         cpus = UserSettings.Get(group='animation', key='nprocs', subkey='value')
-        self.bitmapProvider.Load(nprocs=cpus, bgcolor=color)
+        self.bitmapProvider.Load(nprocs=cpus, bgcolor=color,
+                                 position=self._getCurrentFrameIndex())
         # clear pools
         self.bitmapPool.Clear()
         self.mapFilesPool.Clear()
@@ -446,12 +455,21 @@ class AnimationController(wx.EvtHandler):
 
         return temporalMode, tempManager
 
+    def _getCurrentFrameIndex(self):
+        """Returns index of the current frame of the first active animation"""
+        for anim in self.animations:
+            if anim.IsActive():
+                return anim.currentIndex
+        return 0
+
     def Reload(self):
-        self.EndAnimation()
+        # keep the current frame shown, it is loaded first
+        self.PauseAnimation(True)
 
         color = UserSettings.Get(group='animation', key='bgcolor', subkey='color')
         cpus = UserSettings.Get(group='animation', key='nprocs', subkey='value')
-        self.bitmapProvider.Load(nprocs=cpus, bgcolor=color, force=True)
+        self.bitmapProvider.Load(nprocs=cpus, bgcolor=color, force=True,
+                                 position=self._getCurrentFrameIndex())
 
         self.EndAnimation()
 
@@ -91,9 +91,6 @@ class AnimationFrame(wx.Frame):
             self.provider.renderingStarted.connect(self._showRenderingProgress)
             self.provider.renderingContinues.connect(self._updateProgress)
             self.provider.renderingFinished.connect(self._closeProgress)
-            self.provider.compositionStarted.connect(self._showRenderingProgress)
-            self.provider.compositionContinues.connect(self._updateProgress)
-            self.provider.compositionFinished.connect(self._closeProgress)
 
         self.InitStatusbar()
         self._mgr = wx.aui.AuiManager(self)
@@ -309,6 +306,7 @@ class AnimationFrame(wx.Frame):
     def OnCloseWindow(self, event):
         if self.controller.timer.IsRunning():
                 self.controller.timer.Stop()
+        self.provider.Terminate()
         CleanUp(TMP_DIR)()
         self.Destroy()
 
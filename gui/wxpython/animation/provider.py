@@ -6,6 +6,7 @@
 
 Classes:
  - mapwindow::BitmapProvider
+ - mapwindow::RenderPool
  - mapwindow::BitmapRenderer
  - mapwindow::BitmapComposer
  - mapwindow::DictRefCounter
@@ -24,7 +25,9 @@ import os
 import sys
 import wx
 import tempfile
-from multiprocessing import Process, Queue
+import heapq
+from Queue import Queue
+from multiprocessing import Pool
 
 from core.gcmd import RunCommand, GException
 from core.settings import UserSettings
@@ -56,6 +59,8 @@ class BitmapProvider:
         self._uniqueCmds = []
         self._cmdsForComposition = []
         self._opacities = []
+        # index of each composition in its animation and number of frames
+        self._frameIndices = []
 
         self._cmds3D = []
         self._regionFor3D = None
@@ -67,17 +72,16 @@ class BitmapProvider:
         self._composer = BitmapComposer(self._tempDir, self._mapFilesPool,
                                         self._bitmapPool, self.imageWidth,
                                         self.imageHeight)
+        self._renderPool = RenderPool()
+        self._stopLoading = False
+        self._isLoading = False
+
         self.renderingStarted = Signal('BitmapProvider.renderingStarted')
-        self.compositionStarted = Signal('BitmapProvider.compositionStarted')
         self.renderingContinues = Signal('BitmapProvider.renderingContinues')
-        self.compositionContinues = Signal('BitmapProvider.compositionContinues')
         self.renderingFinished = Signal('BitmapProvider.renderingFinished')
-        self.compositionFinished = Signal('BitmapProvider.compositionFinished')
+        self.frameLoaded = Signal('BitmapProvider.frameLoaded')
         self.mapsLoaded = Signal('BitmapProvider.mapsLoaded')
 
-        self._renderer.renderingContinues.connect(self.renderingContinues)
-        self._composer.compositionContinues.connect(self.compositionContinues)
-
     def SetCmds(self, cmdsForComposition, opacities, regions=None):
         """Sets commands to be rendered with opacity levels.
         Applies to 2D mode.
@@ -93,6 +97,8 @@ class BitmapProvider:
         self._cmdsForComposition.extend(cmdsForComposition)
         self._opacities.extend(opacities)
         self._regions.extend(regions)
+        self._frameIndices.extend([(i, len(cmdsForComposition))
+                                   for i in range(len(cmdsForComposition))])
 
         self._getUniqueCmds()
 
@@ -135,58 +141,55 @@ class BitmapProvider:
             self._uniqueCmds = []
             self._cmdsForComposition = []
             self._opacities = []
+            self._frameIndices = []
             self._regions = []
             self._regionsForUniqueCmds = []
         if self._cmds3D:
             self._cmds3D = []
             self._regionFor3D = None
 
-    def _dryRender(self, uniqueCmds, regions, force):
-        """Determines how many files will be rendered.
+    def _getPriorities(self, position):
+        """Determines the order in which the frames and map layers
+        are loaded.
 
-        :param uniqueCmds: list of commands which are to be rendered
-        :param force: if forced rerendering
-        :param regions: list of regions assigned to the commands
-        """
-        count = 0
-        for cmd, region in zip(uniqueCmds, regions):
-            filename = GetFileFromCmd(self._tempDir, cmd, region)
-            if not force and os.path.exists(filename) and \
-               self._mapFilesPool.GetSize(HashCmd(cmd, region)) == (self.imageWidth, self.imageHeight):
-                continue
-            count += 1
-
-        Debug.msg(3, "BitmapProvider._dryRender: {c} files to be rendered".format(c=count))
-
-        return count
+        The priority of a frame is its distance from the position
+        in the playback direction, a map layer gets the priority of
+        the first frame which needs it.
 
-    def _dryCompose(self, cmdLists, regions, force):
-        """Determines how many lists of (commands) files
-        will be composed (with g.pnmcomp).
-
-        :param cmdLists: list of commands lists which are to be composed
-        :param regions: list of regions assigned to the commands
-        :param force: if forced rerendering
+        :param position: index of the frame to be loaded first
+        :return: dictionaries of priorities of frames and of map layers
         """
-        count = 0
-        for cmdList, region in zip(cmdLists, regions):
-            if not force and HashCmds(cmdList, region) in self._bitmapPool and \
-                self._bitmapPool[HashCmds(cmdList, region)].GetSize() == (self.imageWidth,
-                                                                          self.imageHeight):
-                continue
-            count += 1
-
-        Debug.msg(2, "BitmapProvider._dryCompose: {c} files to be composed".format(c=count))
+        framePriorities = {}
+        layerPriorities = {}
+        for cmdList, region, (index, count) in zip(self._cmdsForComposition,
+                                                   self._regions,
+                                                   self._frameIndices):
+            priority = (index - position) % count
+            frameKey = HashCmds(cmdList, region)
+            framePriorities[frameKey] = min(priority,
+                                            framePriorities.get(frameKey, priority))
+            for cmd in cmdList:
+                key = HashCmd(cmd, region)
+                layerPriorities[key] = min(priority,
+                                           layerPriorities.get(key, priority))
+        for index, cmd in enumerate(self._cmds3D):
+            layerPriorities[HashCmd(cmd, None)] = (index - position) % len(self._cmds3D)
 
-        return count
+        return framePriorities, layerPriorities
 
-    def Load(self, force=False, bgcolor=(255, 255, 255), nprocs=4):
+    def Load(self, force=False, bgcolor=(255, 255, 255), nprocs=4, position=0):
         """Loads data, both 2D and 3D. In case of 2D, it creates composites,
         even when there is only 1 layer to compose (to be changed for speedup)
 
+        Maps are rendered and composed by a persistent pool of worker
+        processes. Frames close to the position (in the playback direction)
+        are loaded first and a frame is composed as soon as its map layers
+        are rendered, signal frameLoaded is emitted for each loaded frame.
+
         :param force: if True reload all data, otherwise only missing data
         :param bgcolor: background color as a tuple of 3 values 0 to 255
         :param nprocs: number of procs to be used for rendering
+        :param position: index of the frame to be loaded first
         """
         Debug.msg(2, "BitmapProvider.Load: "
                      "force={f}, bgcolor={b}, nprocs={n}".format(f=force,
@@ -201,37 +204,113 @@ class BitmapProvider:
             cmds.extend(self._cmds3D)
             regions.extend([None] * len(self._cmds3D))
 
-        count = self._dryRender(cmds, regions, force=force)
+        renderTasks = self._renderer.GetTasks(cmds, regions, regionFor3D=self._regionFor3D,
+                                              bgcolor=bgcolor, force=force)
+        composeTasks = []
+        if self._cmdsForComposition:
+            composeTasks = self._composer.GetTasks(self._cmdsForComposition, self._regions,
+                                                   self._opacities, bgcolor=bgcolor,
+                                                   force=force)
+        count = len(renderTasks) + len(composeTasks)
+        Debug.msg(3, "BitmapProvider.Load: {r} files to be rendered, "
+                     "{c} files to be composed".format(r=len(renderTasks),
+                                                       c=len(composeTasks)))
         self.renderingStarted.emit(count=count)
 
         # create no data bitmap
         if None not in self._bitmapPool or force:
             self._bitmapPool[None] = createNoDataBitmap(self.imageWidth, self.imageHeight)
 
-        ok = self._renderer.Render(cmds, regions, regionFor3D=self._regionFor3D,
-                                   bgcolor=bgcolor, force=force, nprocs=nprocs)
-        self.renderingFinished.emit()
-        if not ok:
-            self.mapsLoaded.emit()  # what to do here?
-            return
-        if self._cmdsForComposition:
-            count = self._dryCompose(self._cmdsForComposition, self._regions, force=force)
-            self.compositionStarted.emit(count=count)
-            self._composer.Compose(self._cmdsForComposition, self._regions, self._opacities,
-                                   bgcolor=bgcolor, force=force, nprocs=nprocs)
-            self.compositionFinished.emit()
-        if self._cmds3D:
-            for cmd in self._cmds3D:
+        renderedKeys = set([HashCmd(cmd, region) for cmd, region, function, args in renderTasks])
+        for cmd in self._cmds3D:
+            if HashCmd(cmd, None) not in renderedKeys:
                 self._bitmapPool[HashCmds([cmd], None)] = \
                     wx.Bitmap(GetFileFromCmd(self._tempDir, cmd, None))
 
+        framePriorities, layerPriorities = self._getPriorities(position)
+        # compositions waiting for their map layers to be rendered
+        waitingFrames = {}
+        framesOfLayers = {}
+        for cmdList, region, function, args in composeTasks:
+            frameKey = HashCmds(cmdList, region)
+            layerKeys = set([HashCmd(cmd, region) for cmd in cmdList]) & renderedKeys
+            waitingFrames[frameKey] = (layerKeys, cmdList, region, function, args)
+            for key in layerKeys:
+                framesOfLayers.setdefault(key, []).append(frameKey)
+
+        self._renderPool.Start(nprocs)
+        for cmd, region, function, args in renderTasks:
+            self._renderPool.Submit((layerPriorities.get(HashCmd(cmd, region), 0), 1),
+                                    ('render', cmd, region), function, args)
+        for frameKey in waitingFrames.keys():
+            self._submitComposition(waitingFrames, frameKey, framePriorities)
+
+        current = 0
+        finished = False
+        self._stopLoading = False
+        self._isLoading = True
+        try:
+            while True:
+                result = self._renderPool.GetFinished()
+                if result is None:
+                    break
+                (task, cmd, region), filename = result
+                current += 1
+                if task == 'render':
+                    key = HashCmd(cmd, region)
+                    self._renderer.SetFile(cmd, region, filename)
+                    if cmd[0] == 'm.nviz.image':
+                        self._composer.SetBitmap3D(cmd, filename)
+                        self.frameLoaded.emit(dataId=HashCmds([cmd], None))
+                    for frameKey in framesOfLayers.get(key, []):
+                        waitingFrames[frameKey][0].discard(key)
+                        if not self._stopLoading:
+                            self._submitComposition(waitingFrames, frameKey,
+                                                    framePriorities)
+                    text = _("Rendering map layers")
+                else:
+                    self._composer.SetFile(cmd, region, filename)
+                    self.frameLoaded.emit(dataId=HashCmds(cmd, region))
+                    text = _("Overlaying map layers")
+
+                self.renderingContinues.emit(current=current, text=text)
+                if self._stopLoading:
+                    # wait only for the tasks which are already running
+                    self._renderPool.ClearWaiting()
+            finished = True
+        finally:
+            self._isLoading = False
+            if not finished:
+                self._renderPool.Terminate()
+
+        self.renderingFinished.emit()
         self.mapsLoaded.emit()
 
+    def _submitComposition(self, waitingFrames, frameKey, framePriorities):
+        """Submits the composition of a frame when all its
+        map layers are rendered.
+
+        :param waitingFrames: dictionary of frames waiting for composition
+        :param frameKey: frame to check
+        :param framePriorities: dictionary of priorities of the frames
+        """
+        layerKeys, cmdList, region, function, args = waitingFrames[frameKey]
+        if layerKeys:
+            return
+        del waitingFrames[frameKey]
+        self._renderPool.Submit((framePriorities.get(frameKey, 0), 0),
+                                ('compose', cmdList, region), function, args)
+
     def RequestStopRendering(self):
         """Requests to stop rendering/composition"""
         Debug.msg(2, "BitmapProvider.RequestStopRendering")
-        self._renderer.RequestStopRendering()
-        self._composer.RequestStopComposing()
+        if self._isLoading:
+            self._stopLoading = True
+
+    def Terminate(self):
+        """Stops the worker processes used for rendering"""
+        Debug.msg(2, "BitmapProvider.Terminate")
+        self._renderPool.Terminate()
 
     def GetBitmap(self, dataId):
         """Returns bitmap with given key
@@ -280,8 +359,95 @@ class BitmapProvider:
             raise GException(messages)
 
 
+class RenderPool:
+    """Persistent pool of worker processes which render and compose images.
+
+    Submitted tasks wait in a priority queue and only a few of them are
+    passed to the workers at once, so a task submitted later with
+    a higher priority does not wait for all the tasks submitted before.
+    Results are returned in the order in which the tasks finish.
+    """
+    def __init__(self):
+        self._pool = None
+        self._nprocs = 0
+        self._waiting = []
+        self._running = 0
+        self._count = 0
+        self._finished = Queue()
+
+    def Start(self, nprocs):
+        """Starts the worker processes if they are not running yet.
+
+        :param nprocs: number of worker processes
+        """
+        nprocs = max(1, nprocs)
+        if self._pool is not None and nprocs == self._nprocs:
+            return
+        self.Terminate()
+        Debug.msg(3, "RenderPool.Start: nprocs={n}".format(n=nprocs))
+        self._pool = Pool(processes=nprocs)
+        self._nprocs = nprocs
+
+    def Submit(self, priority, key, function, args):
+        """Adds a task to the queue.
+
+        :param priority: tasks with lower priority values are started first
+        :param key: identifier of the task returned with its result
+        :param function: function to be called in a worker process
+        :param args: tuple of arguments of the function
+        """
+        heapq.heappush(self._waiting, (priority, self._count, key, function, args))
+        self._count += 1
+
+    def ClearWaiting(self):
+        """Removes the tasks which were not started yet."""
+        self._waiting = []
+
+    def GetFinished(self):
+        """Waits for the next finished task.
+
+        :return: tuple of the key and the result of the task,
+                 None when there are no tasks left
+        """
+        while self._waiting and self._running < 2 * self._nprocs:
+            priority, count, key, function, args = heapq.heappop(self._waiting)
+            self._pool.apply_async(_runTask, (function, args),
+                                   callback=lambda result, key=key: self._finished.put((key, result)))
+            self._running += 1
+        if not self._running:
+            return None
+        result = self._finished.get()
+        self._running -= 1
+        return result
+
+    def Terminate(self):
+        """Stops the worker processes and removes all tasks."""
+        if self._pool is not None:
+            Debug.msg(3, "RenderPool.Terminate")
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._waiting = []
+        self._running = 0
+        self._finished = Queue()
+
+
+def _runTask(function, args):
+    """Runs a task in a worker process of RenderPool,
+    returns None when the task fails.
+
+    :param function: function to be called
+    :param args: tuple of arguments of the function
+    """
+    try:
+        return function(*args)
+    except Exception as e:
+        gcore.warning("Rendering failed:\n" + str(e))
+        return None
+
+
 class BitmapRenderer:
-    """Class which renderes 2D and 3D images to files."""
+    """Class which prepares rendering of 2D and 3D images to files."""
     def __init__(self, mapFilesPool, tempDir,
                  imageWidth, imageHeight):
         self._mapFilesPool = mapFilesPool
@@ -289,30 +455,21 @@ class BitmapRenderer:
         self.imageWidth = imageWidth
         self.imageHeight = imageHeight
 
-        self.renderingContinues = Signal('BitmapRenderer.renderingContinues')
-        self._stopRendering = False
-        self._isRendering = False
-
-    def Render(self, cmdList, regions, regionFor3D, bgcolor, force, nprocs):
-        """Renders all maps and stores files.
+    def GetTasks(self, cmdList, regions, regionFor3D, bgcolor, force):
+        """Returns tasks rendering the maps which are not rendered yet.
 
         :param cmdList: list of rendering commands to run
         :param regions: regions for 2D rendering assigned to commands
         :param regionFor3D: region for setting 3D view
         :param bgcolor: background color as a tuple of 3 values 0 to 255
         :param force: if True reload all data, otherwise only missing data
-        :param nprocs: number of procs to be used for rendering
-        """
-        Debug.msg(3, "BitmapRenderer.Render")
-        count = 0
 
-        # Variables for parallel rendering
-        proc_count = 0
-        proc_list = []
-        queue_list = []
-        cmd_list = []
-
-        filteredCmdList = []
+        :return: list of tuples (cmd, region, function, args)
+        """
+        Debug.msg(3, "BitmapRenderer.GetTasks")
+        # the workers are persistent, they need the current settings
+        driver = UserSettings.Get(group='display', key='driver', subkey='type')
+        tasks = []
         for cmd, region in zip(cmdList, regions):
             filename = GetFileFromCmd(self._tempDir, cmd, region)
             if not force and os.path.exists(filename) and \
@@ -320,63 +477,31 @@ class BitmapRenderer:
                 # for reference counting
                 self._mapFilesPool[HashCmd(cmd, region)] = filename
                 continue
-            filteredCmdList.append((cmd, region))
-
-        mapNum = len(filteredCmdList)
-        stopped = False
-        self._isRendering = True
-        for cmd, region in filteredCmdList:
-            count += 1
-
-            # Queue object for interprocess communication
-            q = Queue()
-            # The separate render process
             if cmd[0] == 'm.nviz.image':
-                p = Process(target=RenderProcess3D,
-                            args=(self.imageWidth, self.imageHeight, self._tempDir,
-                                  cmd, regionFor3D, bgcolor, q))
+                args = (self.imageWidth, self.imageHeight, self._tempDir,
+                        cmd, regionFor3D, bgcolor)
+                tasks.append((cmd, region, RenderProcess3D, args))
             else:
-                p = Process(target=RenderProcess2D,
-                            args=(self.imageWidth, self.imageHeight, self._tempDir,
-                                  cmd, region, bgcolor, q))
-            p.start()
-
-            queue_list.append(q)
-            proc_list.append(p)
-            cmd_list.append((cmd, region))
-
-            proc_count += 1
-            # Wait for all running processes and read/store the created images
-            if proc_count == nprocs or count == mapNum:
-                for i in range(len(cmd_list)):
-                    proc_list[i].join()
-                    filename = queue_list[i].get()
-                    self._mapFilesPool[HashCmd(cmd_list[i][0], cmd_list[i][1])] = filename
-                    self._mapFilesPool.SetSize(HashCmd(cmd_list[i][0], cmd_list[i][1]),
-                                               (self.imageWidth, self.imageHeight))
-
-                proc_count = 0
-                proc_list = []
-                queue_list = []
-                cmd_list = []
-
-            self.renderingContinues.emit(current=count, text=_("Rendering map layers"))
-            if self._stopRendering:
-                self._stopRendering = False
-                stopped = True
-                break
-
-        self._isRendering = False
-        return not stopped
+                args = (self.imageWidth, self.imageHeight, self._tempDir,
+                        cmd, region, bgcolor, None, driver)
+                tasks.append((cmd, region, RenderProcess2D, args))
 
-    def RequestStopRendering(self):
-        """Requests to stop rendering."""
-        if self._isRendering:
-            self._stopRendering = True
+        return tasks
+
+    def SetFile(self, cmd, region, filename):
+        """Stores the rendered file.
+
+        :param cmd: rendering command
+        :param region: region assigned to the command
+        :param filename: name of the rendered file
+        """
+        self._mapFilesPool[HashCmd(cmd, region)] = filename
+        self._mapFilesPool.SetSize(HashCmd(cmd, region),
+                                   (self.imageWidth, self.imageHeight))
 
 
 class BitmapComposer:
-    """Class which handles the composition of image files with g.pnmcomp."""
+    """Class which prepares the composition of image files with g.pnmcomp."""
     def __init__(self, tempDir, mapFilesPool, bitmapPool,
                  imageWidth, imageHeight):
         self._mapFilesPool = mapFilesPool
@@ -385,31 +510,21 @@ class BitmapComposer:
         self.imageWidth = imageWidth
         self.imageHeight = imageHeight
 
-        self.compositionContinues = Signal('BitmapComposer.composingContinues')
-        self._stopComposing = False
-        self._isComposing = False
-
-    def Compose(self, cmdLists, regions, opacityList, bgcolor, force, nprocs):
-        """Performs the composition of ppm/pgm files.
+    def GetTasks(self, cmdLists, regions, opacityList, bgcolor, force):
+        """Returns tasks composing the ppm/pgm files which are not
+        composed yet.
 
         :param cmdLists: lists of rendering commands lists to compose
         :param regions: regions for 2D rendering assigned to commands
         :param opacityList: list of lists of opacity values
         :param bgcolor: background color as a tuple of 3 values 0 to 255
         :param force: if True reload all data, otherwise only missing data
-        :param nprocs: number of procs to be used for rendering
-        """
-        Debug.msg(3, "BitmapComposer.Compose")
 
-        count = 0
-
-        # Variables for parallel rendering
-        proc_count = 0
-        proc_list = []
-        queue_list = []
-        cmd_lists = []
-
-        filteredCmdLists = []
+        :return: list of tuples (cmdList, region, function, args)
+        """
+        Debug.msg(3, "BitmapComposer.GetTasks")
+        driver = UserSettings.Get(group='display', key='driver', subkey='type')
+        tasks = []
         for cmdList, region in zip(cmdLists, regions):
             if not force and HashCmds(cmdList, region) in self._bitmapPool and \
                 self._bitmapPool[HashCmds(cmdList, region)].GetSize() == (self.imageWidth,
@@ -417,61 +532,46 @@ class BitmapComposer:
                 # TODO: find a better way than to assign the same to increase the reference
                 self._bitmapPool[HashCmds(cmdList, region)] = self._bitmapPool[HashCmds(cmdList, region)]
                 continue
-            filteredCmdLists.append((cmdList, region))
-
-        num = len(filteredCmdLists)
-
-        self._isComposing = True
-        for cmdList, region in filteredCmdLists:
-            count += 1
-            # Queue object for interprocess communication
-            q = Queue()
-            # The separate render process
-            p = Process(target=CompositeProcess,
-                        args=(self.imageWidth, self.imageHeight, self._tempDir,
-                              cmdList, region, opacityList, bgcolor, q))
-            p.start()
-
-            queue_list.append(q)
-            proc_list.append(p)
-            cmd_lists.append((cmdList, region))
-
-            proc_count += 1
-
-            # Wait for all running processes and read/store the created images
-            if proc_count == nprocs or count == num:
-                for i in range(len(cmd_lists)):
-                    proc_list[i].join()
-                    filename = queue_list[i].get()
-                    if filename is None:
-                        self._bitmapPool[HashCmds(cmd_lists[i][0], cmd_lists[i][1])] = \
-                            createNoDataBitmap(self.imageWidth, self.imageHeight,
-                                               text="Failed to render")
-                    else:
-                        self._bitmapPool[HashCmds(cmd_lists[i][0], cmd_lists[i][1])] = \
-                            wx.BitmapFromImage(wx.Image(filename))
-                        os.remove(filename)
-                proc_count = 0
-                proc_list = []
-                queue_list = []
-                cmd_lists = []
-
-            self.compositionContinues.emit(current=count, text=_("Overlaying map layers"))
-            if self._stopComposing:
-                self._stopComposing = False
-                break
-
-        self._isComposing = False
-
-    def RequestStopComposing(self):
-        """Requests to stop the composition."""
-        if self._isComposing:
-            self._stopComposing = True
-
-
-def RenderProcess2D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor, fileQueue):
-    """Render raster or vector files as ppm image and write the
-       resulting ppm filename in the provided file queue
+            args = (self.imageWidth, self.imageHeight, self._tempDir,
+                    cmdList, region, opacityList, bgcolor, None, driver)
+            tasks.append((cmdList, region, CompositeProcess, args))
+
+        return tasks
+
+    def SetFile(self, cmdList, region, filename):
+        """Stores the composed file as a bitmap and removes the file.
+
+        :param cmdList: list of rendering commands
+        :param region: region assigned to the commands
+        :param filename: name of the composed file or None if it failed
+        """
+        if filename is None:
+            self._bitmapPool[HashCmds(cmdList, region)] = \
+                createNoDataBitmap(self.imageWidth, self.imageHeight,
+                                   text="Failed to render")
+        else:
+            self._bitmapPool[HashCmds(cmdList, region)] = \
+                wx.BitmapFromImage(wx.Image(filename))
+            os.remove(filename)
+
+    def SetBitmap3D(self, cmd, filename):
+        """Stores the image rendered with m.nviz.image as a bitmap.
+
+        :param cmd: m.nviz.image command
+        :param filename: name of the rendered file or None if it failed
+        """
+        if filename is None:
+            self._bitmapPool[HashCmds([cmd], None)] = \
+                createNoDataBitmap(self.imageWidth, self.imageHeight,
+                                   text="Failed to render")
+        else:
+            self._bitmapPool[HashCmds([cmd], None)] = wx.Bitmap(filename)
+
+
+def RenderProcess2D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor,
+                    fileQueue=None, driver=None):
+    """Render raster or vector files as ppm image and return the
+       resulting ppm filename (or write it in the provided file queue)
 
     :param imageWidth: image width
     :param imageHeight: image height
@@ -481,6 +581,9 @@ def RenderProcess2D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor, file
     :param bgcolor: background color as a tuple of 3 values 0 to 255
     :param fileQueue: the inter process communication queue
                       storing the file name of the image
+    :param driver: rendering driver, None for the one from settings
+
+    :return: file name of the image or None if rendering failed
     """
 
     filename = GetFileFromCmd(tempDir, cmd, region)
@@ -488,27 +591,28 @@ def RenderProcess2D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor, file
 
     # Set the environment variables for this process
     _setEnvironment(imageWidth, imageHeight, filename,
-                    transparent=transparency, bgcolor=bgcolor)
+                    transparent=transparency, bgcolor=bgcolor, driver=driver)
     if region:
         os.environ['GRASS_REGION'] = gcore.region_env(**region)
     cmdTuple = cmdlist_to_tuple(cmd)
     returncode, stdout, messages = read2_command(cmdTuple[0], **cmdTuple[1])
+    if region:
+        os.environ.pop('GRASS_REGION')
     if returncode != 0:
         gcore.warning("Rendering failed:\n" + messages)
-        fileQueue.put(None)
-        if region:
-            os.environ.pop('GRASS_REGION')
-        os.remove(filename)
-        return
+        if os.path.exists(filename):
+            os.remove(filename)
+        filename = None
 
-    if region:
-        os.environ.pop('GRASS_REGION')
-    fileQueue.put(filename)
+    if fileQueue:
+        fileQueue.put(filename)
+    return filename
 
 
-def RenderProcess3D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor, fileQueue):
-    """Renders image with m.nviz.image and writes the
-       resulting ppm filename in the provided file queue
+def RenderProcess3D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor,
+                    fileQueue=None):
+    """Renders image with m.nviz.image and returns the
+       resulting ppm filename (or writes it in the provided file queue)
 
     :param imageWidth: image width
     :param imageHeight: image height
@@ -518,6 +622,8 @@ def RenderProcess3D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor, file
     :param bgcolor: background color as a tuple of 3 values 0 to 255
     :param fileQueue: the inter process communication queue
                       storing the file name of the image
+
+    :return: file name of the image or None if rendering failed
     """
 
     filename = GetFileFromCmd(tempDir, cmd, None)
@@ -532,19 +638,20 @@ def RenderProcess3D(imageWidth, imageHeight, tempDir, cmd, region, bgcolor, file
     cmdTuple[1]['format'] = 'ppm'
     cmdTuple[1]['bgcolor'] = bgcolor = ':'.join([str(part) for part in bgcolor])
     returncode, stdout, messages = read2_command(cmdTuple[0], **cmdTuple[1])
+    os.environ.pop('GRASS_REGION')
     if returncode != 0:
         gcore.warning("Rendering failed:\n" + messages)
-        fileQueue.put(None)
-        os.environ.pop('GRASS_REGION')
-        return
+        filename = None
 
-    os.environ.pop('GRASS_REGION')
-    fileQueue.put(filename)
+    if fileQueue:
+        fileQueue.put(filename)
+    return filename
 
 
-def CompositeProcess(imageWidth, imageHeight, tempDir, cmdList, region, opacities, bgcolor, fileQueue):
-    """Performs the composition of image ppm files and writes the
-       resulting ppm filename in the provided file queue
+def CompositeProcess(imageWidth, imageHeight, tempDir, cmdList, region, opacities, bgcolor,
+                     fileQueue=None, driver=None):
+    """Performs the composition of image ppm files and returns the
+       resulting ppm filename (or writes it in the provided file queue)
 
     :param imageWidth: image width
     :param imageHeight: image height
@@ -555,6 +662,9 @@ def CompositeProcess(imageWidth, imageHeight, tempDir, cmdList, region, opacitie
     :param bgcolor: background color as a tuple of 3 values 0 to 255
     :param fileQueue: the inter process communication queue
                       storing the file name of the image
+    :param driver: rendering driver, None for the one from settings
+
+    :return: file name of the image or None if the composition failed
     """
 
     maps = []
@@ -565,7 +675,7 @@ def CompositeProcess(imageWidth, imageHeight, tempDir, cmdList, region, opacitie
     filename = GetFileFromCmds(tempDir, cmdList, region)
     # Set the environment variables for this process
     _setEnvironment(imageWidth, imageHeight, filename,
-                    transparent=False, bgcolor=bgcolor)
+                    transparent=False, bgcolor=bgcolor, driver=driver)
 
     opacities = [str(op) for op in opacities]
     bgcolor = ':'.join([str(part) for part in bgcolor])
@@ -581,11 +691,13 @@ def CompositeProcess(imageWidth, imageHeight, tempDir, cmdList, region, opacitie
 
     if returncode != 0:
         gcore.warning("Rendering composite failed:\n" + messages)
-        fileQueue.put(None)
-        os.remove(filename)
-        return
+        if os.path.exists(filename):
+            os.remove(filename)
+        filename = None
 
-    fileQueue.put(filename)
+    if fileQueue:
+        fileQueue.put(filename)
+    return filename
 
 
 class DictRefCounter:
@@ -677,7 +789,7 @@ class CleanUp:
                 gcore.warning(_("Directory {t} not removed.").format(t=self._tempDir))
 
 
-def _setEnvironment(width, height, filename, transparent, bgcolor):
+def _setEnvironment(width, height, filename, transparent, bgcolor, driver=None):
     """Sets environmental variables for 2D rendering.
 
     :param width: rendering width
@@ -685,6 +797,7 @@ def _setEnvironment(width, height, filename, transparent, bgcolor):
     :param filename: file name
     :param transparent: use transparency
     :param bgcolor: background color as a tuple of 3 values 0 to 255
+    :param driver: rendering driver, None for the one from settings
     """
     Debug.msg(5, "_setEnvironment: width={w}, height={h}, "
                  "filename={f}, transparent={t}, bgcolor={b}".format(w=width,
@@ -695,7 +808,8 @@ def _setEnvironment(width, height, filename, transparent, bgcolor):
 
     os.environ['GRASS_RENDER_WIDTH'] = str(width)
     os.environ['GRASS_RENDER_HEIGHT'] = str(height)
-    driver = UserSettings.Get(group='display', key='driver', subkey='type')
+    if driver is None:
+        driver = UserSettings.Get(group='display', key='driver', subkey='type')
     os.environ['GRASS_RENDER_IMMEDIATE'] = driver
     os.environ['GRASS_RENDER_BACKGROUNDCOLOR'] = '{r:02x}{g:02x}{b:02x}'.format(r=bgcolor[0],
                                                                          g=bgcolor[1],
@@ -783,10 +897,6 @@ def test():
         lambda count: sys.stdout.write("Total number of maps: {c}\n".format(c=count)))
     prov.renderingContinues.connect(
         lambda current, text: sys.stdout.write("Current number: {c}\n".format(c=current)))
-    prov.compositionStarted.connect(
-        lambda count: sys.stdout.write("Composition: total number of maps: {c}\n".format(c=count)))
-    prov.compositionContinues.connect(
-        lambda current, text: sys.stdout.write("Composition: Current number: {c}\n".format(c=current)))
     prov.mapsLoaded.connect(
         lambda: sys.stdout.write("Maps loading finished\n"))
     cmdMatrix = layerListToCmdsMatrix(layerList)
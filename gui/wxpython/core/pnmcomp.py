@@ -0,0 +1,267 @@
+"""
+@package core.pnmcomp
+
+@brief Composition of PPM/PGM images rendered by display drivers.
+
+In-process replacement of g.pnmcomp based on NumPy. The layer images are
+memory-mapped and blended with their masks and opacities with the same
+integer arithmetic as g.pnmcomp, so the result is identical. The module
+does not depend on wxPython.
+
+Usage:
+
+.. code-block:: python
+
+    from core.pnmcomp import CompositeImages
+
+    CompositeImages(maps=['elevation.ppm', 'roads.ppm'],
+                    masks=['elevation.pgm', 'roads.pgm'],
+                    opacities=[1.0, 0.5], width=640, height=480,
+                    output='map.ppm', bgcolor=(255, 255, 255))
+
+Run ``python pnmcomp.py doctest`` to test the module and
+``python pnmcomp.py benchmark`` (in a GRASS session) to compare it
+with g.pnmcomp.
+
+(C) 2015 by the GRASS Development Team
+
+This program is free software under the GNU General Public License
+(>=v2). Read the file COPYING that comes with GRASS for details.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy
+
+if __name__ == '__main__':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.debug import Debug
+
+
+def _readHeaderLine(fileObject):
+    """Reads a line of PNM header skipping the comments"""
+    while True:
+        line = fileObject.readline()
+        if not line:
+            raise ValueError("Error reading PPM file")
+        if not line.startswith('#'):
+            return line
+
+
+def ReadPnm(filename, width, height, components):
+    """Reads PPM (components=3) or PGM (components=1) image.
+
+    Binary images are memory-mapped, values are scaled to 0-255 when
+    the maximum value of the image is not 255.
+
+    >>> import tempfile
+    >>> fd, name = tempfile.mkstemp(suffix='.pgm')
+    >>> os.close(fd)
+    >>> WritePnm(name, numpy.array([[0, 128, 255]], dtype=numpy.uint8))
+    >>> ReadPnm(name, width=3, height=1, components=1).ravel().tolist()
+    [0, 128, 255]
+    >>> ReadPnm(name, width=2, height=1, components=1)
+    Traceback (most recent call last):
+    ...
+    ValueError: Expecting 2x1 image but got 3x1 image.
+    >>> os.remove(name)
+
+    :param filename: name of the image file
+    :param width: expected image width
+    :param height: expected image height
+    :param components: 3 for PPM, 1 for PGM
+
+    :return: array of shape (height, width, components)
+    """
+    with open(filename, 'rb') as fileObject:
+        magic = _readHeaderLine(fileObject)[:2]
+        try:
+            ncols, nrows = [int(value) for value in
+                            _readHeaderLine(fileObject).split()[:2]]
+            maxval = int(_readHeaderLine(fileObject).split()[0])
+        except (ValueError, IndexError):
+            raise ValueError("Invalid PPM file <%s>" % filename)
+        if (ncols, nrows) != (width, height):
+            raise ValueError("Expecting %dx%d image but got %dx%d image." %
+                             (width, height, ncols, nrows))
+        if magic in ('P2', 'P5') and components == 3:
+            raise ValueError("Expecting PPM but got PGM")
+        if magic in ('P3', 'P6') and components == 1:
+            raise ValueError("Expecting PGM but got PPM")
+        if magic not in ('P2', 'P3', 'P5', 'P6'):
+            raise ValueError("Invalid magic number: '%s'" % magic)
+
+        shape = (height, width, components)
+        if magic in ('P5', 'P6'):
+            image = numpy.memmap(fileObject, dtype=numpy.uint8, mode='r',
+                                 offset=fileObject.tell(), shape=shape)
+        else:
+            values = numpy.array(fileObject.read().split()[:numpy.prod(shape)],
+                                 dtype=numpy.int32)
+            if values.size != numpy.prod(shape):
+                raise ValueError("Invalid PPM file <%s>" % filename)
+            image = values.astype(numpy.uint8).reshape(shape)
+
+    if maxval != 255:
+        image = (image.astype(numpy.int32) * 255 // maxval).astype(numpy.uint8)
+    return image
+
+
+def WritePnm(filename, image):
+    """Writes image as binary PPM or PGM file.
+
+    :param filename: name of the image file
+    :param image: array of shape (height, width, 3) for PPM,
+                  (height, width, 1) or (height, width) for PGM
+    """
+    height, width = image.shape[:2]
+    magic = 'P6' if image.ndim == 3 and image.shape[2] == 3 else 'P5'
+    with open(filename, 'wb') as fileObject:
+        fileObject.write("%s\n%d %d\n255\n" % (magic, width, height))
+        fileObject.write(numpy.ascontiguousarray(image, dtype=numpy.uint8).tostring())
+
+
+def CompositeImages(maps, masks, opacities, width, height, output,
+                    bgcolor=None, outputMask=None):
+    """Overlays PPM images using PGM masks and opacities.
+
+    The first image is at the bottom. The result is the same as
+    the result of g.pnmcomp with the same parameters.
+
+    >>> import tempfile
+    >>> tmpdir = tempfile.mkdtemp()
+    >>> names = [os.path.join(tmpdir, name) for name in
+    ...          ('a.ppm', 'a.pgm', 'b.ppm', 'b.pgm', 'out.ppm', 'out.pgm')]
+    >>> WritePnm(names[0], numpy.array([[[200, 100, 0]] * 3], dtype=numpy.uint8))
+    >>> WritePnm(names[1], numpy.array([[255, 255, 0]], dtype=numpy.uint8))
+    >>> WritePnm(names[2], numpy.array([[[0, 0, 100]] * 3], dtype=numpy.uint8))
+    >>> WritePnm(names[3], numpy.array([[0, 255, 255]], dtype=numpy.uint8))
+    >>> CompositeImages(maps=names[0:4:2], masks=names[1:4:2],
+    ...                 opacities=[1.0, 0.5], width=3, height=1,
+    ...                 output=names[4], bgcolor=(10, 20, 30),
+    ...                 outputMask=names[5])
+    >>> ReadPnm(names[4], width=3, height=1, components=3).tolist()
+    [[[200, 100, 0], [100, 50, 49], [5, 10, 64]]]
+    >>> ReadPnm(names[5], width=3, height=1, components=1).ravel().tolist()
+    [255, 255, 127]
+    >>> import shutil
+    >>> shutil.rmtree(tmpdir)
+
+    :param maps: list of names of PPM files
+    :param masks: list of names of PGM files (empty name for no mask)
+    :param opacities: list of layer opacities (0 to 1)
+    :param width: image width
+    :param height: image height
+    :param output: name of the output PPM file
+    :param bgcolor: background color as a tuple of 3 values 0 to 255
+                    or None
+    :param outputMask: name of the output PGM file or None
+    """
+    Debug.msg(3, "CompositeImages(): %d layers, %dx%d" % (len(maps), width, height))
+    image = numpy.zeros((height, width, 3), dtype=numpy.int32)
+    if bgcolor is not None:
+        image[:, :] = [int(value) for value in bgcolor[:3]]
+    mask = numpy.zeros((height, width, 1), dtype=numpy.int32)
+
+    for i, mapfile in enumerate(maps):
+        maskfile = masks[i] if masks else None
+        if not maskfile:
+            image = ReadPnm(mapfile, width, height, 3).astype(numpy.int32)
+            mask.fill(255)
+            continue
+        layer = ReadPnm(mapfile, width, height, 3).astype(numpy.int32)
+        layerMask = ReadPnm(maskfile, width, height, 1).astype(numpy.int32)
+        # g.pnmcomp uses float opacities
+        alpha = numpy.float32(opacities[i]) if opacities else numpy.float32(1.0)
+        if alpha == 1.0:
+            # covers transparent and opaque pixels too
+            c0 = 255 - layerMask
+            image = (image * c0 + layer * layerMask) // 255
+            mask = (mask * c0 + 255 * layerMask) // 255
+        else:
+            c1 = (layerMask.astype(numpy.float32) * alpha).astype(numpy.int32)
+            c0 = 255 - c1
+            visible = layerMask != 0
+            image = numpy.where(visible, (image * c0 + layer * c1) // 256, image)
+            mask = numpy.where(visible, (mask * c0 + 255 * c1) // 255, mask)
+
+    WritePnm(output, image)
+    if outputMask:
+        WritePnm(outputMask, mask)
+
+
+def Benchmark(nlayers=10, width=1024, height=768, runs=5):
+    """Compares the time of composition by CompositeImages and g.pnmcomp.
+
+    Needs to be run in a GRASS session.
+
+    :param nlayers: number of layers to compose
+    :param width: image width
+    :param height: image height
+    :param runs: number of runs
+
+    :return: tuple of mean times of CompositeImages and g.pnmcomp
+    """
+    import shutil
+    import grass.script as grass
+
+    tmpdir = tempfile.mkdtemp()
+    maps = []
+    masks = []
+    opacities = []
+    try:
+        for i in range(nlayers):
+            maps.append(os.path.join(tmpdir, 'layer_%d.ppm' % i))
+            masks.append(os.path.join(tmpdir, 'layer_%d.pgm' % i))
+            opacities.append(1.0 if i % 2 else 0.5)
+            WritePnm(maps[-1], numpy.random.randint(0, 256, (height, width, 3)))
+            WritePnm(masks[-1], numpy.random.randint(0, 2, (height, width)) * 255)
+        outputs = [os.path.join(tmpdir, 'numpy.ppm'),
+                   os.path.join(tmpdir, 'pnmcomp.ppm')]
+
+        start = time.time()
+        for i in range(runs):
+            CompositeImages(maps, masks, opacities, width, height,
+                            output=outputs[0], bgcolor=(255, 255, 255))
+        numpyTime = (time.time() - start) / runs
+
+        start = time.time()
+        for i in range(runs):
+            grass.run_command('g.pnmcomp', overwrite=True,
+                              input=','.join(maps), mask=','.join(masks),
+                              opacity=','.join(map(str, opacities)),
+                              bgcolor='255:255:255', width=width,
+                              height=height, output=outputs[1])
+        pnmcompTime = (time.time() - start) / runs
+
+        same = numpy.array_equal(ReadPnm(outputs[0], width, height, 3),
+                                 ReadPnm(outputs[1], width, height, 3))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print("layers: %d, size: %dx%d, runs: %d" % (nlayers, width, height, runs))
+    print("CompositeImages: %f s" % numpyTime)
+    print("g.pnmcomp:       %f s" % pnmcompTime)
+    print("identical result: %s" % same)
+    return numpyTime, pnmcompTime
+
+
+def doc_test():
+    """Tests the module using doctest
+
+    :return: a number of failed tests
+    """
+    import doctest
+    return doctest.testmod().failed
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        nlayers = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        Benchmark(nlayers=nlayers)
+    else:
+        sys.exit(doc_test())
@@ -10,6 +10,7 @@ Classes:
  - render::Map
  - render::RenderLayerMgr
  - render::RenderMapMgr
+ - render::RenderCache
 
 (C) 2006-2015 by the GRASS Development Team
 
@@ -26,14 +27,18 @@ import sys
 import glob
 import math
 import copy
+import shutil
 import tempfile
 import types
 import time
+import Queue
+import multiprocessing
+from collections import OrderedDict
 
 import wx
 
 from grass.script import core as grass
-from grass.script.utils import try_remove
+from grass.script.utils import try_remove, parse_key_val
 from grass.script.task import cmdlist_to_tuple, cmdtuple_to_list
 from grass.pydispatch.signal import Signal
 from grass.exceptions import CalledModuleError
@@ -46,6 +51,12 @@ from core.debug    import Debug
 from core.settings import UserSettings
 from core.gthread import gThread
 
+try:
+    from core.pnmcomp import CompositeImages
+except ImportError:
+    # NumPy is not available, use g.pnmcomp
+    CompositeImages = None
+
 class Layer(object):
     """Virtual class which stores information about layers (map layers and
     overlays) of the map composition.
@@ -353,6 +364,7 @@ class RenderLayerMgr(wx.EvtHandler):
         
         self._startTime = None
         self._render_env = env
+        self._cacheKey = None
 
     def UpdateRenderEnv(self, env):
         self._render_env.update(env)
@@ -370,6 +382,17 @@ class RenderLayerMgr(wx.EvtHandler):
         env_cmd.update(self._render_env)
         env_cmd['GRASS_RENDER_FILE'] = self.layer.mapfile
 
+        # commands of 'command' layer are rendered into the same file
+        self._cacheKey = None
+        if self.layer.type != 'command':
+            self._cacheKey = renderCache.GetKey(cmd, env_cmd)
+        if self._cacheKey and renderCache.Get(self._cacheKey, self.layer.mapfile,
+                                              self.layer.maskfile):
+            Debug.msg(1, "RenderLayerMgr.Render(%s): image taken from cache" % self.layer)
+            self.layer.forceRender = False
+            self.updateProgress.emit(layer=self.layer)
+            return
+
         cmd_render = copy.deepcopy(cmd)
         cmd_render[1]['quiet'] = True # be quiet
         
@@ -412,9 +435,197 @@ class RenderLayerMgr(wx.EvtHandler):
                 os.remove(self.layer.mapfile)
             except:
                 pass
+        elif self._cacheKey:
+            renderCache.Put(self._cacheKey, self.layer.mapfile, self.layer.maskfile)
         
         self.updateProgress.emit(layer=self.layer)
         
+# maximal size of rendered images kept in cache (in bytes)
+RENDER_CACHE_SIZE = 256 * 1024 * 1024
+
+# display commands with cached results and their parameters with map names
+CACHED_COMMANDS = {'d.rast'  : {'map' : 'raster'},
+                   'd.rgb'   : {'red' : 'raster', 'green' : 'raster', 'blue' : 'raster'},
+                   'd.his'   : {'hue' : 'raster', 'intensity' : 'raster',
+                                'saturation' : 'raster'},
+                   'd.shade' : {'shade' : 'raster', 'color' : 'raster'},
+                   'd.vect'  : {'map' : 'vector'}}
+
+class RenderCache:
+    """Bounded LRU cache of rendered layer images.
+
+    Images (PPM and PGM files) are stored as copies in a temporary
+    directory, the least recently used ones are removed when the total
+    size of the files exceeds the limit. Images are identified by
+    the display command, region, image size, rendering settings and
+    modification time of the displayed maps (see GetKey()).
+    """
+    def __init__(self, maxSize=None):
+        """
+        :param maxSize: maximal size of images in bytes,
+                        RENDER_CACHE_SIZE if None
+        """
+        self.maxSize = maxSize
+        self._entries = OrderedDict()
+        self._size = 0
+        self._count = 0
+        self._dir = None
+
+    def _getMaxSize(self):
+        if self.maxSize is None:
+            return RENDER_CACHE_SIZE
+        return self.maxSize
+
+    def _getMapsModTime(self, cmd, gisenv):
+        """Returns modification times of files of maps displayed by command
+
+        :return: tuple of file names and times or None if maps are unknown
+        """
+        params = CACHED_COMMANDS.get(cmd[0])
+        if params is None:
+            return None
+        location = os.path.join(gisenv['GISDBASE'], gisenv['LOCATION_NAME'])
+        current = os.path.join(location, gisenv['MAPSET'])
+        # mask applies to all raster maps
+        files = [os.path.join(current, 'cell', 'MASK')]
+        for key, maptype in params.iteritems():
+            fullname = cmd[1].get(key)
+            if not fullname:
+                continue
+            if '@' not in fullname:
+                # mapset would have to be found in search path
+                return None
+            name, mapset = fullname.split('@', 1)
+            mapsetPath = os.path.join(location, mapset)
+            if maptype == 'raster':
+                files += [os.path.join(mapsetPath, element, name)
+                          for element in ('cell', 'fcell', 'cellhd', 'colr', 'cats')]
+                files += glob.glob(os.path.join(mapsetPath, 'cell_misc', name, '*'))
+                files.append(os.path.join(current, 'colr2', mapset, name))
+            else:
+                files += glob.glob(os.path.join(mapsetPath, 'vector', name, '*'))
+                # attribute tables
+                files.append(os.path.join(mapsetPath, 'sqlite', 'sqlite.db'))
+                files.append(os.path.join(mapsetPath, 'dbf', name + '.dbf'))
+
+        times = []
+        for name in sorted(files):
+            try:
+                times.append((name, os.path.getmtime(name)))
+            except OSError:
+                times.append((name, None))
+        return tuple(times)
+
+    def GetKey(self, cmd, env):
+        """Returns key identifying image rendered by command
+
+        :param cmd: display command given as tuple
+        :param env: environmental variables used for rendering
+
+        :return: key or None if the image cannot be cached
+        """
+        if cmd[0] not in CACHED_COMMANDS or 'GISRC' not in env:
+            return None
+        try:
+            with open(env['GISRC']) as gisrc:
+                gisenv = parse_key_val(gisrc.read(), sep=':')
+            modTime = self._getMapsModTime(cmd, gisenv)
+        except (IOError, KeyError):
+            return None
+        if modTime is None:
+            return None
+
+        renderEnv = [(key, value) for key, value in env.iteritems()
+                     if key.startswith('GRASS_RENDER_') and key != 'GRASS_RENDER_FILE']
+        params = [(key, value) for key, value in cmd[1].iteritems() if key != 'quiet']
+        return (cmd[0], tuple(sorted(params)), env.get('GRASS_REGION'),
+                tuple(sorted(renderEnv)), modTime)
+
+    def Get(self, key, mapfile, maskfile):
+        """Copies cached image to given files
+
+        :param key: key of image (see GetKey())
+        :param mapfile: name of file for image
+        :param maskfile: name of file for image mask
+
+        :return: True if image was found in cache, otherwise False
+        """
+        if key not in self._entries:
+            return False
+        entry = self._entries.pop(key)
+        try:
+            shutil.copyfile(entry['mapfile'], mapfile)
+            if entry['maskfile']:
+                shutil.copyfile(entry['maskfile'], maskfile)
+            elif maskfile:
+                try_remove(maskfile)
+        except (IOError, OSError):
+            self._size -= entry['size']
+            self._remove(entry)
+            return False
+        # mark as recently used
+        self._entries[key] = entry
+        return True
+
+    def Put(self, key, mapfile, maskfile):
+        """Stores copy of rendered image
+
+        :param key: key of image (see GetKey())
+        :param mapfile: name of file with image
+        :param maskfile: name of file with image mask or None
+        """
+        if key in self._entries:
+            entry = self._entries.pop(key)
+            self._size -= entry['size']
+            self._remove(entry)
+        try:
+            if not self._dir:
+                self._dir = grass.tempdir()
+            self._count += 1
+            entry = {'mapfile' : os.path.join(self._dir, '%d.ppm' % self._count),
+                     'maskfile' : None, 'size' : 0}
+            shutil.copyfile(mapfile, entry['mapfile'])
+            entry['size'] += os.path.getsize(entry['mapfile'])
+            if maskfile and os.path.isfile(maskfile):
+                entry['maskfile'] = os.path.join(self._dir, '%d.pgm' % self._count)
+                shutil.copyfile(maskfile, entry['maskfile'])
+                entry['size'] += os.path.getsize(entry['maskfile'])
+        except (IOError, OSError) as e:
+            Debug.msg(1, "RenderCache.Put(): %s" % e)
+            return
+        if entry['size'] > self._getMaxSize():
+            self._remove(entry)
+            return
+
+        self._entries[key] = entry
+        self._size += entry['size']
+        # remove least recently used images
+        while self._size > self._getMaxSize():
+            oldKey, oldEntry = self._entries.popitem(last=False)
+            self._size -= oldEntry['size']
+            self._remove(oldEntry)
+        Debug.msg(3, "RenderCache.Put(): %d images, %d bytes" % (len(self._entries),
+                                                               self._size))
+
+    def _remove(self, entry):
+        """Removes files of cache entry"""
+        for name in (entry['mapfile'], entry['maskfile']):
+            if name:
+                try_remove(name)
+
+    def Clear(self):
+        """Removes all images from cache"""
+        for entry in self._entries.itervalues():
+            self._remove(entry)
+        self._entries.clear()
+        self._size = 0
+
+# cache shared by all map displays
+renderCache = RenderCache()
+
+# size of tiles (in pixels) used for tiled rendering
+TILE_SIZE = 256
+
 class RenderMapMgr(wx.EvtHandler):
     def __init__(self, Map):
         """Render map layers as image composition
@@ -429,6 +640,8 @@ class RenderMapMgr(wx.EvtHandler):
         self.updateProgress = Signal('RenderMapMgr.updateProgress')
         self.renderDone = Signal('RenderMapMgr.renderDone')
         self.renderDone.connect(self.OnRenderDone)
+        # emitted in tiled mode with map image composed from tiles rendered so far
+        self.tileRendered = Signal('RenderMapMgr.tileRendered')
         
         # GRASS environment variable (for rendering)
         self._render_env = {"GRASS_RENDER_BACKGROUNDCOLOR" : "000000",
@@ -439,6 +652,19 @@ class RenderMapMgr(wx.EvtHandler):
         self._init()
         self._rendering = False
         
+        # tiled rendering
+        self._tiled = False
+        self._lastRenderTiled = False
+        self._tileWorkers = []
+        self._tileQueue = Queue.Queue()
+        self._tileDir = None
+        self._tileRenderId = 0
+        self._tileImage = None
+        self._tiledLayers = []
+        # key of last map composed from tiles and file with its copy
+        self._tiledState = None
+        self._tiledStateNew = None
+        
     def _init(self, env=None):
         """Init render manager
 
@@ -517,9 +743,297 @@ class RenderMapMgr(wx.EvtHandler):
         
         env = self.GetRenderEnv(windres)
         self._init(env)
-        if self._renderLayers(env, force, windres) == 0:
+        self._tiled = self._useTiles(windres)
+        if self._tiled:
+            self._renderTiles(env, force)
+        else:
+            if self._lastRenderTiled:
+                # layers were rendered only into tiles
+                force = True
+            if self._renderLayers(env, force, windres) == 0:
+                self.renderDone.emit()
+        self._lastRenderTiled = self._tiled
+        
+    def _useTiles(self, windres):
+        """Checks if map composition is rendered in tiles
+
+        Tiled rendering is not used for lat/long locations,
+        with resolution of computational region and for web services.
+        """
+        if windres or not UserSettings.Get(group = 'display', key = 'tiledRendering',
+                                           subkey = 'enabled'):
+            return False
+        if self.Map.projinfo.get('proj') == 'll':
+            return False
+        for layer in self.Map.GetListOfLayers(active=True):
+            if layer.GetType() == 'wms':
+                return False
+        return True
+
+    def _getTileRegion(self, region, n, s, e, w):
+        """Get GRASS_REGION string of tile
+
+        :param region: GRASS_REGION string of the whole display
+        :param n, s, e, w: extent of the tile
+
+        :return: GRASS_REGION string
+        """
+        values = {'north' : '%.15g' % n, 'south' : '%.15g' % s,
+                  'east' : '%.15g' % e, 'west' : '%.15g' % w,
+                  'rows' : '%d' % TILE_SIZE, 'cols' : '%d' % TILE_SIZE,
+                  'e-w resol' : '%.15g' % ((e - w) / TILE_SIZE),
+                  'n-s resol' : '%.15g' % ((n - s) / TILE_SIZE)}
+        items = []
+        for item in region.split(';'):
+            if ':' not in item:
+                continue
+            key, value = item.split(':', 1)
+            key = key.strip()
+            items.append("%s: %s" % (key, values.get(key, value.strip())))
+        
+        return '; '.join(items) + ';'
+
+    def _getTiles(self, env):
+        """Splits display into tiles
+
+        Tiles are aligned to a grid given by the display resolution,
+        so they can be reused while panning at the same zoom level.
+
+        :return: list of tiles (dictionaries) sorted from the center
+                 of the display
+        """
+        region = self.Map.region
+        ewres = (region['e'] - region['w']) / self.Map.width
+        nsres = (region['n'] - region['s']) / self.Map.height
+        spanX = TILE_SIZE * ewres
+        spanY = TILE_SIZE * nsres
+        
+        tiles = []
+        for i in range(int(math.floor(region['w'] / spanX)),
+                       int(math.ceil(region['e'] / spanX))):
+            for j in range(int(math.floor(region['s'] / spanY)),
+                           int(math.ceil(region['n'] / spanY))):
+                w, s = i * spanX, j * spanY
+                e, n = w + spanX, s + spanY
+                tiles.append({'id' : (i, j),
+                              'x' : int(round((w - region['w']) / ewres)),
+                              'y' : int(round((region['n'] - n) / nsres)),
+                              'region' : self._getTileRegion(env['GRASS_REGION'],
+                                                             n, s, e, w)})
+        
+        cx = (self.Map.width - TILE_SIZE) / 2.
+        cy = (self.Map.height - TILE_SIZE) / 2.
+        tiles.sort(key = lambda tile: (tile['x'] - cx) ** 2 + (tile['y'] - cy) ** 2)
+        
+        return tiles
+
+    def _renderTiles(self, env, force = False):
+        """Render map layers in tiles and overlays into files
+
+        Tiles are rendered in parallel by worker threads, rendered tiles
+        are stored in the render cache and the map composed from tiles
+        rendered so far is announced by tileRendered signal.
+
+        :param dict env: environmental variables to be used for rendering process
+        :param bool force: True to force rendering
+        """
+        overlays = self.Map.GetListOfLayers(ltype='overlay', active=True)
+        mapLayers = self.Map.GetListOfLayers(active=True,
+                                             ltype='raster_3d',
+                                             except_ltype=True)
+        self.layers = overlays + mapLayers
+        self._tiledLayers = mapLayers
+        self._tileRenderId += 1
+        if not self._tileDir:
+            self._tileDir = grass.tempdir()
+        
+        bgcolor = UserSettings.Get(group = 'display', key = 'bgcolor',
+                                   subkey = 'color')
+        layers = []
+        for layer in mapLayers:
+            if layer.GetType() == 'command':
+                cmds = layer.cmd
+            else:
+                cmds = [layer.cmd]
+            layers.append((cmds, layer.opacity))
+        
+        # reuse the last map if nothing has changed
+        state = (env['GRASS_REGION'], self.Map.width, self.Map.height,
+                 tuple([(layer.GetCmd(string=True), layer.opacity) for layer in mapLayers]),
+                 tuple(bgcolor))
+        self._tiledStateNew = state
+        if not force and self._tiledState and self._tiledState[0] == state and \
+                not [layer for layer in mapLayers if layer.forceRender] and \
+                os.path.isfile(self._tiledState[1]):
+            shutil.copyfile(self._tiledState[1], self.Map.mapfile)
+            tiles = []
+            self._tileImage = None
+        else:
+            tiles = self._getTiles(env)
+            self._tileImage = wx.EmptyImage(self.Map.width, self.Map.height)
+            self._tileImage.Replace(0, 0, 0, *bgcolor[:3])
+        
+        # reset progress
+        self.ReportProgress()
+        self.progressInfo['range'] = len(overlays) + len(tiles)
+        
+        # render overlays if forced
+        for layer in overlays:
+            if force or layer.forceRender:
+                layer.Render(env)
+            else:
+                layer.GetRenderMgr().updateProgress.emit(layer=layer)
+        
+        # layer keys for cache, None if a layer cannot be cached
+        keys = []
+        for layer, (cmds, opacity) in zip(mapLayers, layers):
+            if layer.GetType() == 'command':
+                keys.append(None)
+                continue
+            keyEnv = env.copy()
+            del keyEnv['GRASS_REGION']
+            keys.append(renderCache.GetKey(layer.cmd, keyEnv))
+        
+        Debug.msg(1, "RenderMapMgr.Render(): %d tiles to be rendered "
+                  "(%d map layers)" % (len(tiles), len(mapLayers)))
+        
+        for tile in tiles:
+            if None in keys:
+                key = None
+            else:
+                key = ('tile', tuple(keys), tuple([layer[1] for layer in layers]),
+                       tuple(bgcolor), tile['region'])
+            prefix = os.path.join(self._tileDir, 'tile_%d_%d_%d' % ((self._tileRenderId,) +
+                                                                    tile['id']))
+            if key and renderCache.Get(key, prefix + '.ppm', None):
+                self._addTile(tile, prefix + '.ppm')
+                continue
+            self._getTileWorker().Run(callable = self._renderTile,
+                                      tile = tile, layers = layers, env = env,
+                                      bgcolor = bgcolor, prefix = prefix,
+                                      ondone = self._onTileDone,
+                                      userdata = {'renderId' : self._tileRenderId,
+                                                  'key' : key})
+        
+        if self.progressInfo['range'] == 0:
             self.renderDone.emit()
+
+    def _getTileWorker(self):
+        """Get worker thread for rendering tiles
+
+        Worker threads share one queue of requests, the first call
+        starts the threads.
+        """
+        if not self._tileWorkers:
+            try:
+                nprocs = multiprocessing.cpu_count()
+            except NotImplementedError:
+                nprocs = 2
+            self._tileWorkers = [gThread(requestQ = self._tileQueue)
+                                 for i in range(max(2, nprocs))]
+        
+        return self._tileWorkers[0]
+
+    def _renderTile(self, tile, layers, env, bgcolor, prefix):
+        """Render all map layers of a tile and compose them
+
+        Runs in a worker thread.
+
+        :param tile: tile to be rendered
+        :param layers: list of lists of commands (given as tuples) and opacities
+        :param env: environmental variables used for rendering
+        :param bgcolor: background color
+        :param prefix: prefix of tile file names
+
+        :return: name of the tile file or None if nothing was rendered
+        """
+        tileEnv = env.copy()
+        tileEnv['GRASS_REGION'] = tile['region']
+        tileEnv['GRASS_RENDER_WIDTH'] = tileEnv['GRASS_RENDER_HEIGHT'] = str(TILE_SIZE)
+        
+        maps = list()
+        masks = list()
+        opacities = list()
+        for i, (cmds, opacity) in enumerate(layers):
+            mapfile = '%s_%d.ppm' % (prefix, i)
+            tileEnv['GRASS_RENDER_FILE'] = mapfile
+            tileEnv.pop('GRASS_RENDER_FILE_READ', None)
+            for cmd in cmds:
+                cmd_render = copy.deepcopy(cmd)
+                cmd_render[1]['quiet'] = True # be quiet
+                try:
+                    grass.run_command(cmd_render[0], env=tileEnv, **cmd_render[1])
+                except CalledModuleError:
+                    sys.stderr.write(_("Command '%s' failed\n") % cmd[0])
+                tileEnv['GRASS_RENDER_FILE_READ'] = "TRUE"
+            if os.path.isfile(mapfile):
+                maps.append(mapfile)
+                masks.append(mapfile.rsplit(".", 1)[0] + ".pgm")
+                opacities.append(opacity)
         
+        output = prefix + '.ppm'
+        try:
+            if not maps:
+                return None
+            if CompositeImages:
+                CompositeImages(maps = maps, masks = masks, opacities = opacities,
+                                width = TILE_SIZE, height = TILE_SIZE,
+                                output = output, bgcolor = bgcolor)
+            else:
+                grass.run_command('g.pnmcomp', overwrite = True, quiet = True,
+                                  input = ",".join(maps), mask = ",".join(masks),
+                                  opacity = ",".join(map(str, opacities)),
+                                  bgcolor = ':'.join(map(str, bgcolor[:3])),
+                                  width = TILE_SIZE, height = TILE_SIZE,
+                                  output = output, env = tileEnv)
+        except (IOError, ValueError, CalledModuleError) as e:
+            sys.stderr.write(_("Rendering failed: %s\n") % e)
+            try_remove(output)
+            return None
+        finally:
+            for f in maps + masks:
+                try_remove(f)
+        
+        return output
+
+    def _onTileDone(self, event):
+        """Tile rendered by worker thread"""
+        if event.userdata['renderId'] != self._tileRenderId:
+            # rendering was aborted or restarted
+            if event.ret:
+                try_remove(event.ret)
+            return
+        
+        if event.ret and event.userdata['key']:
+            renderCache.Put(event.userdata['key'], event.ret, None)
+        self._addTile(event.kwds['tile'], event.ret)
+
+    def _addTile(self, tile, filename):
+        """Add rendered tile to map image and report progress
+
+        :param tile: tile
+        :param filename: name of the tile file or None
+        """
+        if filename and os.path.isfile(filename):
+            image = wx.Image(filename, wx.BITMAP_TYPE_ANY)
+            if image.IsOk():
+                self._tileImage.Paste(image, tile['x'], tile['y'])
+            try_remove(filename)
+        
+        self.progressInfo['progresVal'] += 1
+        self.progressInfo['rendered'].append(tile['id'])
+        if self.progressInfo['progresVal'] < self.progressInfo['range']:
+            self.tileRendered.emit(image=self._tileImage)
+            text = _('Rendering...')
+        else:
+            text = ''
+        self.updateProgress.emit(range=self.progressInfo['range'],
+                                 value=self.progressInfo['progresVal'],
+                                 text=text)
+        
+        if self.progressInfo['progresVal'] == self.progressInfo['range']:
+            self.renderDone.emit()
+
     def OnRenderDone(self):
         """Rendering process done
 
@@ -527,6 +1041,10 @@ class RenderMapMgr(wx.EvtHandler):
         """
         stopTime = time.time()
         
+        if self._tiled:
+            self._tiledDone()
+            return
+        
         maps = list()
         masks = list()
         opacities = list()
@@ -538,24 +1056,37 @@ class RenderMapMgr(wx.EvtHandler):
             if os.path.isfile(layer.mapfile):
                 maps.append(layer.mapfile)
                 masks.append(layer.maskfile)
-                opacities.append(str(layer.opacity))
+                opacities.append(layer.opacity)
         
-        # run g.pngcomp to get composite image
-        bgcolor = ':'.join(map(str, UserSettings.Get(group = 'display', key = 'bgcolor',
-                                                     subkey = 'color')))
+        bgcolor = UserSettings.Get(group = 'display', key = 'bgcolor',
+                                   subkey = 'color')
         startCompTime = time.time()
         if maps:
-            ret, msg = RunCommand('g.pnmcomp',
-                                  getErrorMsg = True,
-                                  overwrite = True,
-                                  input = '%s' % ",".join(maps),
-                                  mask = '%s' % ",".join(masks),
-                                  opacity = '%s' % ",".join(opacities),
-                                  bgcolor = bgcolor,
-                                  width = self.Map.width,
-                                  height = self.Map.height,
-                                  output = self.Map.mapfile,
-                                  env=self._env)
+            if CompositeImages:
+                # compose in-process, no need to run g.pnmcomp
+                try:
+                    CompositeImages(maps = maps, masks = masks,
+                                    opacities = opacities,
+                                    width = self.Map.width,
+                                    height = self.Map.height,
+                                    output = self.Map.mapfile,
+                                    bgcolor = bgcolor)
+                    ret, msg = 0, ''
+                except (IOError, ValueError) as e:
+                    ret, msg = 1, str(e)
+            else:
+                # run g.pnmcomp to get composite image
+                ret, msg = RunCommand('g.pnmcomp',
+                                      getErrorMsg = True,
+                                      overwrite = True,
+                                      input = '%s' % ",".join(maps),
+                                      mask = '%s' % ",".join(masks),
+                                      opacity = '%s' % ",".join(map(str, opacities)),
+                                      bgcolor = ':'.join(map(str, bgcolor)),
+                                      width = self.Map.width,
+                                      height = self.Map.height,
+                                      output = self.Map.mapfile,
+                                      env=self._env)
             if ret != 0:
                 self._rendering = False
                 if wx.IsBusy():
@@ -572,11 +1103,44 @@ class RenderMapMgr(wx.EvtHandler):
         
         self.updateMap.emit()
 
+    def _tiledDone(self):
+        """Rendering of tiles done
+
+        Saves map composed from tiles, emits updateMap event.
+        """
+        if self._tileImage is not None:
+            self._tileImage.SaveFile(self.Map.mapfile, wx.BITMAP_TYPE_PNM)
+            self._tileImage = None
+            # keep copy to be reused when nothing changes
+            statefile = os.path.join(self._tileDir, 'map.ppm')
+            shutil.copyfile(self.Map.mapfile, statefile)
+            self._tiledState = (self._tiledStateNew, statefile)
+        for layer in self._tiledLayers:
+            layer.forceRender = False
+        
+        Debug.msg (1, "RenderMapMgr.OnRenderDone() time=%f sec (tiled)" % \
+                   (time.time() - self._startTime))
+        
+        self._rendering = False
+        if wx.IsBusy():
+            wx.EndBusyCursor()
+        
+        self.updateMap.emit()
+
     def Abort(self):
         """Abort all rendering processes"""
         Debug.msg(1, "RenderMapMgr.Abort()")
         for layer in self.layers:
             layer.GetRenderMgr().Abort()
+        
+        # drop waiting tiles, results of running ones are ignored
+        self._tileRenderId += 1
+        self._tileImage = None
+        while True:
+            try:
+                self._tileQueue.get_nowait()
+            except Queue.Empty:
+                break
 
         self._init()
         if wx.IsBusy():
@@ -175,6 +175,9 @@ class Settings:
                 'autoRendering': {
                     'enabled' : True
                     },
+                'tiledRendering': {
+                    'enabled' : False
+                    },
                 'autoZooming' : {
                     'enabled' : False
                     },
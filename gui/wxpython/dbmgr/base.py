@@ -49,7 +49,8 @@ from dbmgr.sqlbuilder import SQLBuilderSelect, SQLBuilderUpdate
 from core.gcmd        import RunCommand, GException, GError, GMessage, GWarning
 from core.utils       import ListOfCatsToRange, _
 from gui_core.dialogs import CreateNewVector
-from dbmgr.vinfo      import VectorDBInfo, GetUnicodeValue, CreateDbInfoDesc
+from dbmgr.vinfo      import VectorDBInfo, GetUnicodeValue, CreateDbInfoDesc, \
+    PagedAttributeData
 from core.debug       import Debug
 from dbmgr.dialogs    import ModifyTableRecord, AddColumnDialog
 from core.settings    import UserSettings
@@ -85,6 +86,8 @@ class VirtualAttributeList(wx.ListCtrl,
         self.columns = {} # <- LoadData()
         
         self.sqlFilter = {}
+        # records read from database page by page (see LoadData())
+        self.pager = None
 
         wx.ListCtrl.__init__(self, parent = parent, id = wx.ID_ANY,
                              style = wx.LC_REPORT | wx.LC_HRULES |
@@ -136,6 +139,10 @@ class VirtualAttributeList(wx.ListCtrl,
     def LoadData(self, layer, columns = None, where = None, sql = None):
         """Load data into list
 
+        Records of tables in databases supporting LIMIT/OFFSET are not
+        loaded at once, only records displayed in the list are read
+        and sorted by the database (see PagedAttributeData).
+
         :param layer: layer number
         :param columns: list of columns for output (-> v.db.select)
         :param where: where statement (-> v.db.select)
@@ -174,16 +181,30 @@ class VirtualAttributeList(wx.ListCtrl,
             keyId = -1
         
         # read data
-        # FIXME: Max. number of rows, while the GUI is still usable
-
-        # stdout can be very large, do not use PIPE, redirect to temp file
-        # TODO: more effective way should be implemented...
-
         # split on field sep breaks if varchar() column contains the
         # values, so while sticking with ASCII we make it something
         # highly unlikely to exist naturally.
         fs = '{_sep_}'
 
+        driver = self.mapDBInfo.layers[layer]['driver']
+        if not sql and driver in PagedAttributeData.drivers:
+            # read only displayed records
+            if self.pager:
+                order = self.pager.GetOrder()
+            else:
+                order = (None, True)
+            self.pager = PagedAttributeData(driver = driver,
+                                            database = self.mapDBInfo.layers[layer]['database'],
+                                            table = tableName, columns = columns,
+                                            key = keyColumn, where = where)
+            # keep sorting when reloaded
+            if order[0] in columns:
+                self.pager.SetOrder(*order)
+            self.sqlFilter = {"where" : where}
+        else:
+            self.pager = None
+
+        # stdout can be very large, do not use PIPE, redirect to temp file
         outFile = tempfile.NamedTemporaryFile(mode = 'w+b')
 
         cmdParams = dict(quiet = True,
@@ -198,7 +219,7 @@ class VirtualAttributeList(wx.ListCtrl,
             ret = RunCommand('db.select',
                              **cmdParams)
             self.sqlFilter = {"sql" : sql}
-        else:
+        elif not self.pager:
             cmdParams.update(dict(map = self.mapDBInfo.map,
                                   layer = layer,
                                   where = where,
@@ -240,7 +261,7 @@ class VirtualAttributeList(wx.ListCtrl,
         i = 0
         outFile.seek(0)
         
-        while True:
+        while not self.pager:
             # os.linesep doesn't work here (MSYS)
             # not sure what the replace is for?
             # but we need strip to get rid of the ending newline
@@ -266,6 +287,9 @@ class VirtualAttributeList(wx.ListCtrl,
                 self.log.write(_("Viewing limit: 100000 records."))
                 break
         
+        if self.pager:
+            i = self.pager.GetCount()
+        
         self.SetItemCount(i)
         
         if where:
@@ -386,10 +410,53 @@ class VirtualAttributeList(wx.ListCtrl,
 
     def OnGetItemText(self, item, col):
         """Get item text"""
+        if self.pager:
+            return self._getPagerItemText(item, col)
         index = self.itemIndexMap[item]
         s = self.itemDataMap[index][col]
         return s
 
+    def _getPagerItemText(self, item, col):
+        """Get item text from records read page by page"""
+        record = self.pager.GetRecord(item)
+        if record is None:
+            return ''
+        value = record[col + 1]
+        if self.columns[self.pager.columns[col]]['ctype'] != types.StringType:
+            return value
+        try:
+            return GetUnicodeValue(value)
+        except UnicodeDecodeError:
+            return _("Unable to decode value. "
+                     "Set encoding in GUI preferences ('Attributes').")
+
+    def GetItemCat(self, item):
+        """Get category (value of key column) of item
+
+        :return: category or -1 if not available
+        """
+        if not self.pager:
+            return self.itemCatsMap[self.itemIndexMap[item]]
+        record = self.pager.GetRecord(item)
+        try:
+            return int(record[0])
+        except (TypeError, ValueError):
+            return -1
+
+    def GetMaxCat(self):
+        """Get maximal category in the table (0 for empty table)"""
+        if self.pager:
+            return self.pager.GetMaxKey()
+        if len(self.itemCatsMap.values()) > 0:
+            return max(self.itemCatsMap.values())
+        return 0
+
+    def HasCat(self, cat):
+        """Check if record with given category exists"""
+        if self.pager:
+            return self.pager.HasKey(cat)
+        return cat in self.itemCatsMap.values()
+
     def OnGetItemAttr(self, item):
         """Get item attributes"""
         if ( item % 2) == 0:
@@ -573,6 +640,13 @@ class VirtualAttributeList(wx.ListCtrl,
 
     def SortItems(self, sorter = cmp):
         """Sort items"""
+        if self.pager:
+            # sorted by database
+            self.pager.SetOrder(column = self.GetColumn(self._col).GetText(),
+                                ascending = self._colSortFlag[self._col])
+            self.Refresh()
+            return
+        
         items = list(self.itemDataMap.keys())
         items.sort(self.Sorter)
         self.itemIndexMap = items
@@ -1308,7 +1382,7 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
             return
         table     = self.dbMgrData['mapDBInfo'].layers[self.selLayer]['table']
         keyColumn = self.dbMgrData['mapDBInfo'].layers[self.selLayer]['key']
-        cat       = tlist.itemCatsMap[tlist.itemIndexMap[item]]
+        cat       = tlist.GetItemCat(item)
 
         # (column name, value)
         data = []
@@ -1366,9 +1440,11 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
                                 idx = i
                             
                             if column['ctype'] != types.StringType:
-                                tlist.itemDataMap[item][idx] = column['ctype'] (values[i])
+                                value = column['ctype'] (values[i])
                             else: # -> string
-                                tlist.itemDataMap[item][idx] = values[i]
+                                value = values[i]
+                            if not tlist.pager:
+                                tlist.itemDataMap[item][idx] = value
                         except ValueError:
                             raise ValueError(_("Value '%(value)s' needs to be entered as %(type)s.") % \
                                                  {'value' : str(values[i]),
@@ -1411,11 +1487,8 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
         for i in range(tlist.GetColumnCount()): 
             columnName.append(tlist.GetColumn(i).GetText())
 
-        # maximal category number
-        if len(tlist.itemCatsMap.values()) > 0:
-            maxCat = max(tlist.itemCatsMap.values())
-        else:
-            maxCat = 0 # starting category '1'
+        # maximal category number (starting category '1')
+        maxCat = tlist.GetMaxCat()
         
         # key column must be always presented
         if keyColumn not in columnName:
@@ -1451,7 +1524,7 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
                 cat = -1
 
             try:
-                if cat in tlist.itemCatsMap.values():
+                if tlist.HasCat(cat):
                     raise ValueError(_("Record with category number %d "
                                        "already exists in the table.") % cat)
 
@@ -1495,16 +1568,17 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
             if missingKey is True:
                 del values[0]
                 
-            # add new item to the tlist
-            if len(tlist.itemIndexMap) > 0:
-                index = max(tlist.itemIndexMap) + 1
-            else:
-                index = 0
-            
-            tlist.itemIndexMap.append(index)
-            tlist.itemDataMap[index] = values
-            tlist.itemCatsMap[index] = cat
-            tlist.SetItemCount(tlist.GetItemCount() + 1)
+            # add new item to the tlist (paged list is reloaded)
+            if not tlist.pager:
+                if len(tlist.itemIndexMap) > 0:
+                    index = max(tlist.itemIndexMap) + 1
+                else:
+                    index = 0
+                
+                tlist.itemIndexMap.append(index)
+                tlist.itemDataMap[index] = values
+                tlist.itemCatsMap[index] = cat
+                tlist.SetItemCount(tlist.GetItemCount() + 1)
 
             self.listOfSQLStatements.append('INSERT INTO %s (%s) VALUES(%s)' % \
                                                 (table,
@@ -1512,6 +1586,8 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
                                                  valuesString.rstrip(',')))
             
             self.ApplyCommands(self.listOfCommands, self.listOfSQLStatements)
+            if tlist.pager:
+                tlist.Update()
 
         
     def OnDataItemDelete(self, event):
@@ -1525,10 +1601,10 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
         indeces = []
         # collect SQL statements
         while item != -1:
-            index = dlist.itemIndexMap[item]
-            indeces.append(index)
+            if not dlist.pager:
+                indeces.append(dlist.itemIndexMap[item])
             
-            cat = dlist.itemCatsMap[index]
+            cat = dlist.GetItemCat(item)
             
             self.listOfSQLStatements.append('DELETE FROM %s WHERE %s=%d' % \
                                                 (table, key, cat))
@@ -1546,26 +1622,26 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
                 self.listOfSQLStatements = []
                 return False
         
-        # restore maps
-        i = 0
-        indexTemp = copy.copy(dlist.itemIndexMap)
-        dlist.itemIndexMap = []
-        dataTemp = copy.deepcopy(dlist.itemDataMap)
-        dlist.itemDataMap = {}
-        catsTemp = copy.deepcopy(dlist.itemCatsMap)
-        dlist.itemCatsMap = {}
-        
-        i = 0
-        for index in indexTemp:
-            if index in indeces:
-                continue
-            dlist.itemIndexMap.append(i)
-            dlist.itemDataMap[i] = dataTemp[index]
-            dlist.itemCatsMap[i] = catsTemp[index]
-            
-            i += 1
+        # restore maps (paged list is reloaded)
+        if not dlist.pager:
+            indexTemp = copy.copy(dlist.itemIndexMap)
+            dlist.itemIndexMap = []
+            dataTemp = copy.deepcopy(dlist.itemDataMap)
+            dlist.itemDataMap = {}
+            catsTemp = copy.deepcopy(dlist.itemCatsMap)
+            dlist.itemCatsMap = {}
             
-        dlist.SetItemCount(len(dlist.itemIndexMap))
+            i = 0
+            for index in indexTemp:
+                if index in indeces:
+                    continue
+                dlist.itemIndexMap.append(i)
+                dlist.itemDataMap[i] = dataTemp[index]
+                dlist.itemCatsMap[i] = catsTemp[index]
+                
+                i += 1
+                
+            dlist.SetItemCount(len(dlist.itemIndexMap))
         
         # deselect items
         item = dlist.GetFirstSelected()
@@ -1575,6 +1651,8 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
         
         # submit SQL statements
         self.ApplyCommands(self.listOfCommands, self.listOfSQLStatements)
+        if dlist.pager:
+            dlist.Update()
         
         return True
 
@@ -1585,7 +1663,7 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
             deleteDialog = wx.MessageBox(parent = self,
                                          message = _("All data records (%d) will be permanently deleted "
                                                    "from table. Do you want to delete them?") % \
-                                             (len(dlist.itemIndexMap)),
+                                             (dlist.GetItemCount()),
                                          caption = _("Delete records"),
                                          style = wx.YES_NO | wx.CENTRE)
             if deleteDialog != wx.YES:
@@ -1600,6 +1678,8 @@ class DbMgrBrowsePage(DbMgrNotebookBase):
         self.listOfSQLStatements.append('DELETE FROM %s' % table)
 
         self.ApplyCommands(self.listOfCommands, self.listOfSQLStatements)
+        if dlist.pager:
+            dlist.Update()
         
         event.Skip()
 
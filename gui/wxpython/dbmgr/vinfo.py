@@ -5,6 +5,7 @@
 
 List of classes:
  - vinfo::VectorDBInfo
+ - vinfo::PagedAttributeData
 
 (C) 2007-2013 by the GRASS Development Team
 
@@ -16,11 +17,13 @@ This program is free software under the GNU General Public License
 
 import os
 import types
+from collections import OrderedDict
 
 import wx
 
 from gui_core.gselect import VectorDBInfo as VectorDBInfoBase
 from core.gcmd        import RunCommand, GError
+from core.debug       import Debug
 from core.settings    import UserSettings
 from core.utils import _
 import grass.script as grass
@@ -175,3 +178,173 @@ class VectorDBInfo(VectorDBInfoBase):
                 nselected = 1
 
         return nselected
+
+class PagedAttributeData:
+    """Attribute table records read from the database page by page
+
+    Only the pages of records which are requested (typically the
+    visible part of a list) are read by db.select using LIMIT/OFFSET.
+    Records are sorted by the database (ORDER BY), recently read pages
+    are cached.
+    """
+    # drivers supporting LIMIT/OFFSET
+    drivers = ('sqlite', 'pg', 'mysql')
+    
+    def __init__(self, driver, database, table, columns, key,
+                 where = None, pageSize = 500, cacheSize = 20):
+        """
+        :param driver: database driver
+        :param database: database name
+        :param table: table name
+        :param columns: list of columns to be read
+        :param key: key column
+        :param where: where statement or None
+        :param pageSize: number of records in one page
+        :param cacheSize: maximal number of cached pages
+        """
+        self.driver = driver
+        self.database = database
+        self.table = table
+        self.columns = columns
+        self.key = key
+        self.where = where
+        self.pageSize = pageSize
+        self.cacheSize = cacheSize
+        
+        # field separator, see VirtualAttributeList.LoadData()
+        self._fs = '{_sep_}'
+        self._order = None
+        self._ascending = True
+        self._count = None
+        self._pages = OrderedDict()
+    
+    def _select(self, sql):
+        """Run select statement
+
+        :return: list of records (lists of strings)
+        :return: None on error
+        """
+        ret = RunCommand('db.select',
+                         read = True,
+                         quiet = True,
+                         flags = 'c',
+                         separator = self._fs,
+                         sql = sql,
+                         database = self.database,
+                         driver = self.driver)
+        if ret is None:
+            return None
+        
+        return [line.split(self._fs) for line in ret.splitlines()]
+    
+    def _getWhere(self):
+        if self.where:
+            return " WHERE %s" % self.where
+        return ""
+    
+    def SetOrder(self, column, ascending = True):
+        """Set sorting of records
+
+        Records are sorted also by the key column to keep the order of
+        records with equal values stable between pages.
+
+        :param column: column name or None for no sorting
+        :param ascending: True for ascending order
+        """
+        if (column, ascending) == (self._order, self._ascending):
+            return
+        self._order = column
+        self._ascending = ascending
+        self._pages.clear()
+    
+    def GetOrder(self):
+        """Get sorting of records as tuple (column, ascending)"""
+        return self._order, self._ascending
+    
+    def GetCount(self):
+        """Get number of records"""
+        if self._count is None:
+            records = self._select("SELECT COUNT(*) FROM %s%s" % \
+                                       (self.table, self._getWhere()))
+            try:
+                self._count = int(records[0][0])
+            except (TypeError, IndexError, ValueError):
+                self._count = 0
+        
+        return self._count
+    
+    def GetPage(self, page):
+        """Get page of records
+
+        :param page: page number
+
+        :return: list of records (values of the key column followed by
+                 the values of the columns)
+        """
+        if page in self._pages:
+            # mark as recently used
+            records = self._pages.pop(page)
+            self._pages[page] = records
+            return records
+        
+        sql = "SELECT %s FROM %s%s" % (','.join([self.key] + self.columns),
+                                       self.table, self._getWhere())
+        order = []
+        if self._order:
+            order.append("%s %s" % (self._order,
+                                    "ASC" if self._ascending else "DESC"))
+        if self._order != self.key:
+            order.append("%s ASC" % self.key)
+        sql += " ORDER BY %s LIMIT %d OFFSET %d" % (','.join(order), self.pageSize,
+                                                    page * self.pageSize)
+        Debug.msg(3, "PagedAttributeData.GetPage(): %s" % sql)
+        
+        records = self._select(sql)
+        if records is None:
+            records = []
+        ncols = len(self.columns) + 1
+        for i, record in enumerate(records):
+            if len(record) != ncols:
+                records[i] = (record + [''] * ncols)[:ncols]
+        
+        self._pages[page] = records
+        while len(self._pages) > self.cacheSize:
+            self._pages.popitem(last = False)
+        
+        return records
+    
+    def GetRecord(self, index):
+        """Get record
+
+        :param index: index of record (in the current order)
+
+        :return: list of values (key column first)
+        :return: None if not available
+        """
+        records = self.GetPage(index // self.pageSize)
+        try:
+            return records[index % self.pageSize]
+        except IndexError:
+            return None
+    
+    def GetMaxKey(self):
+        """Get maximal value of the key column (0 for empty table)"""
+        records = self._select("SELECT MAX(%s) FROM %s" % (self.key, self.table))
+        try:
+            return int(records[0][0])
+        except (TypeError, IndexError, ValueError):
+            return 0
+    
+    def HasKey(self, value):
+        """Check if record with given value of the key column exists"""
+        records = self._select("SELECT COUNT(*) FROM %s WHERE %s=%d" % \
+                                   (self.table, self.key, value))
+        try:
+            return int(records[0][0]) > 0
+        except (TypeError, IndexError, ValueError):
+            return False
+    
+    def Clear(self):
+        """Clear cached records and number of records"""
+        self._count = None
+        self._pages.clear()
@@ -702,6 +702,19 @@ class PreferencesDialog(PreferencesBaseDialog):
         gridSizer.Add(item = autoRendering,
                       pos = (row, 0), span = (1, 2))
         
+        #
+        # tiled rendering
+        #
+        row += 1
+        tiledRendering = wx.CheckBox(parent = panel, id = wx.ID_ANY,
+                                     label = _("Render map display progressively in tiles"),
+                                     name = "IsChecked")
+        tiledRendering.SetValue(self.settings.Get(group = 'display', key = 'tiledRendering', subkey = 'enabled'))
+        self.winId['display:tiledRendering:enabled'] = tiledRendering.GetId()
+
+        gridSizer.Add(item = tiledRendering,
+                      pos = (row, 0), span = (1, 2))
+        
         #
         # auto-zoom
         #
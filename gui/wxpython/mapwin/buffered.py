@@ -184,6 +184,7 @@ class BufferedMapWindow(MapWindowBase, wx.Window):
         # rerender when Map reports change
         self.Map.layerChanged.connect(self.OnUpdateMap)
         self.Map.GetRenderMgr().renderDone.connect(self._updateMFinished)
+        self.Map.GetRenderMgr().tileRendered.connect(self._updateMTile)
         
         # vars for handling mouse clicks
         self.dragid   = -1
@@ -848,6 +849,25 @@ class BufferedMapWindow(MapWindowBase, wx.Window):
         except GException as e:
                 GError(message=e.value)
 
+    def _updateMTile(self, image):
+        """Show map image composed from tiles rendered so far
+
+        :param image: wx.Image instance
+        """
+        if hasattr(self, '_busy'):
+            # exporting image
+            return
+        
+        imgId = 99
+        for key in self.imagedict.keys():
+            if self.imagedict[key]['id'] == imgId:
+                del self.imagedict[key]
+        self.imagedict[image] = { 'id': imgId }
+        
+        self.pdc.ClearId(imgId)
+        self.Draw(self.pdc, image, drawid = imgId)
+        self.Refresh()
+
     def _updateMFinished(self, renderVector=True):
         Debug.msg (1, "BufferedWindow.UpdateMap(): finished")
         self.img = self.GetImage() # id=99
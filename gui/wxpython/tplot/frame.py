@@ -50,7 +50,6 @@ from gui_core.widgets import CoordinatesValidator
 from gui_core import gselect
 from core import globalvar
 from grass.pygrass.vector.geometry import Point
-from grass.pygrass.raster import RasterRow
 from collections import OrderedDict
 from subprocess import PIPE
 try:
@@ -283,7 +282,7 @@ class TplotFrame(wx.Frame):
         """
         mode = None
         unit = None
-        columns = ','.join(['name', 'start_time', 'end_time'])
+        columns = ','.join(['name', 'start_time', 'end_time', 'id'])
         for series in timeseries:
             name = series[0]
             fullname = name + '@' + series[1]
@@ -295,7 +294,6 @@ class TplotFrame(wx.Frame):
                 return
             sp.select(dbif=self.dbif)
 
-            minmin = sp.metadata.get_min_min()
             self.plotNameListR.append(name)
             self.timeDataR[name] = OrderedDict()
 
@@ -329,15 +327,14 @@ class TplotFrame(wx.Frame):
 
             rows = sp.get_registered_maps(columns=columns, where=None,
                                           order='start_time', dbif=self.dbif)
-            for row in rows:
+            # read the values of all the maps at once
+            values = tgis.get_raster_values_at_points(
+                [row[3] for row in rows], [self.poi.coords()])[0]
+            for row, val in zip(rows, values):
                 self.timeDataR[name][row[0]] = {}
                 self.timeDataR[name][row[0]]['start_datetime'] = row[1]
                 self.timeDataR[name][row[0]]['end_datetime'] = row[2]
-                r = RasterRow(row[0])
-                r.open()
-                val = r.get_value(self.poi)
-                r.close()
-                if val == -2147483648 and val < minmin:
+                if np.isnan(val):
                     self.timeDataR[name][row[0]]['value'] = None
                 else:
                     self.timeDataR[name][row[0]]['value'] = val
@@ -3,6 +3,7 @@ from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import os
 import sys
+import time
 import multiprocessing as mltp
 import subprocess as sub
 import shutil as sht
@@ -15,7 +16,7 @@ from grass.pygrass.modules import Module
 from grass.pygrass.utils import get_mapset_raster, findmaps
 
 from grass.pygrass.modules.grid.split import split_region_tiles
-from grass.pygrass.modules.grid.patch import rpatch_map
+from grass.pygrass.modules.grid.patch import rpatch_map, rpatch_map_tiles
 
 
 def select(parms, ptype):
@@ -375,6 +376,52 @@ def cmd_exe(args):
     os.remove(gisrc_dst)
 
 
+def get_tile_env(bbox, region, env=None):
+    """Return a copy of the environment with the GRASS_REGION variable set
+    to the extension of a tile, so a command can be run on the tile without
+    changing the region of the mapset.
+
+    :param bbox: the bounding box of the tile
+    :type bbox: Bbox object
+    :param region: the region with the resolution, projection and zone
+    :type region: Region object
+    :param env: the environment to copy, default is os.environ
+    :type env: dict
+    :returns: a dictionary with the environment variables
+
+    >>> from grass.pygrass.vector.basic import Bbox
+    >>> reg = Region()
+    >>> env = get_tile_env(Bbox(north=reg.north, south=reg.south,
+    ...                         east=reg.east, west=reg.west), reg)
+    >>> 'rows: %d;' % reg.rows in env['GRASS_REGION']
+    True
+    """
+    env = dict(os.environ if env is None else env)
+    rows = int(round((bbox.north - bbox.south) / region.nsres))
+    cols = int(round((bbox.east - bbox.west) / region.ewres))
+    reg_str = ("proj: %d;zone: %d;north: %r;south: %r;east: %r;west: %r;"
+               "n-s resol: %r;e-w resol: %r;rows: %d;cols: %d;")
+    env['GRASS_REGION'] = reg_str % (region.proj, region.zone,
+                                     bbox.north, bbox.south,
+                                     bbox.east, bbox.west,
+                                     region.nsres, region.ewres, rows, cols)
+    return env
+
+
+def cmd_exe_env(args):
+    """Execute a cmd in the source mapset with the region of a tile.
+
+    :param args: is a tuple with the environment (dict) containing the
+                 GRASS_REGION variable of the tile and a dictionary with
+                 all the parameter of a GRASS module.
+    :type args: tuple
+    :returns: the return code of the command
+    """
+    env, cmd = args
+    shell = True if sys.platform == 'win32' else False
+    return sub.Popen(get_cmd(cmd), shell=shell, env=env).wait()
+
+
 class GridModule(object):
     # TODO maybe also i.* could be supported easily
     """Run GRASS raster commands in a multiprocessing mode.
@@ -393,6 +440,13 @@ class GridModule(object):
     :type split: bool
     :param mapset_prefix: if specified created mapsets start with this prefix
     :type mapset_prefix: str
+    :param inplace: if True run the command on each tile in the current
+                    mapset setting the region of the tile with the
+                    GRASS_REGION variable, instead of creating a mapset for
+                    each tile, the outputs of the tiles are temporary maps
+                    of the current mapset, only commands with raster outputs
+                    are supported
+    :type inplace: bool
     :param run_: if False only instantiate the object
     :type run_: bool
     :param args: give all the parameters to the command
@@ -404,14 +458,47 @@ class GridModule(object):
     ...                  elevation='elevation',
     ...                  slope='slope', aspect='aspect', overwrite=True)
     >>> grd.run()
+
+    The time spent in each phase is stored in the times attribute:
+
+    >>> grd = GridModule('r.slope.aspect',
+    ...                  width=500, height=500, overlap=2,
+    ...                  processes=None, inplace=True,
+    ...                  elevation='elevation',
+    ...                  slope='slope', aspect='aspect', overwrite=True)
+    >>> grd.run()
+    >>> sorted(grd.times.keys())
+    [u'clean', u'compute', u'patch', u'split']
+
+    The inplace mode can not be used with commands that write vector maps
+    or files:
+
+    >>> grd = GridModule('r.contour', width=500, height=500, inplace=True,
+    ...                  input='elevation', output='contours', step=10)
+    Traceback (most recent call last):
+    ...
+    ValueError: The inplace mode can be used only with raster outputs: output
     """
     def __init__(self, cmd, width=None, height=None, overlap=0, processes=None,
                  split=False, debug=False, region=None, move=None, log=False,
                  start_row=0, start_col=0, out_prefix='', mapset_prefix=None,
-                 *args, **kargs):
+                 inplace=False, *args, **kargs):
         kargs['run_'] = False
+        if inplace and (move or split):
+            raise ValueError(_("The inplace mode can not be used with the "
+                               "move and split options"))
+        self.inplace = inplace
+        self.times = {}
         self.mset = Mapset()
         self.module = Module(cmd, *args, **kargs)
+        if inplace:
+            # the tiles would write the same vector maps or files at once
+            others = [k for k in self.module.outputs
+                      if self.module.outputs[k].value and
+                      self.module.outputs[k].typedesc != 'raster']
+            if others:
+                raise ValueError(_("The inplace mode can be used only with "
+                                   "raster outputs: %s") % ", ".join(others))
         self.width = width
         self.height = height
         self.overlap = overlap
@@ -449,7 +536,9 @@ class GridModule(object):
             self.msetstr = cmd.replace('.', '') + "_%03d_%03d"
         self.inlist = None
         if split:
+            start = time.time()
             self.split()
+            self.times['split'] = time.time() - start
         self.debug = debug
 
     def __del__(self):
@@ -487,6 +576,46 @@ class GridModule(object):
                                                        pattern=patt))
         self.inlist = inlist
 
+    def get_tile_str(self, name):
+        """Return the string to format with the row and the column of a tile
+        to obtain the name of the tile map in the inplace mode
+
+        :param name: the name of the output map
+        :type name: str
+        """
+        return "%s__%s" % (name, self.msetstr)
+
+    def get_tile_name(self, name, row, col):
+        """Return the name of the map of a tile in the inplace mode
+
+        :param name: the name of the output map
+        :type name: str
+        :param row: the row of the tile
+        :type row: int
+        :param col: the column of the tile
+        :type col: int
+        """
+        return self.get_tile_str(name) % (self.start_row + row,
+                                          self.start_col + col)
+
+    def get_works_inplace(self):
+        """Return a list of tuple with the parameters for cmd_exe_env
+        function, the raster outputs of each tile are renamed using
+        get_tile_name"""
+        works = []
+        reg = self.region
+        cmd = self.module.get_dict()
+        rasters = [k for k in self.module.outputs
+                   if self.module.outputs[k].typedesc == 'raster']
+        for row, box_row in enumerate(self.bboxes):
+            for col, box in enumerate(box_row):
+                tcmd = dict(cmd)
+                tcmd['outputs'] = [(k, self.get_tile_name(v, row, col)
+                                    if k in rasters else v)
+                                   for k, v in cmd['outputs']]
+                works.append((get_tile_env(box, reg), tcmd))
+        return works
+
     def get_works(self):
         """Return a list of tuble with the parameters for cmd_exe function"""
         works = []
@@ -540,20 +669,36 @@ class GridModule(object):
         """
         self.module.flags.overwrite = True
         self.define_mapset_inputs()
+        if self.inplace:
+            start = time.time()
+            works = self.get_works_inplace()
+            self.times['split'] = time.time() - start
+            func = cmd_exe_env
+        else:
+            works = self.get_works()
+            func = cmd_exe
+
+        start = time.time()
         if self.debug:
-            for wrk in self.get_works():
-                cmd_exe(wrk)
+            for wrk in works:
+                func(wrk)
         else:
             pool = mltp.Pool(processes=self.processes)
-            result = pool.map_async(cmd_exe, self.get_works())
+            result = pool.map_async(func, works)
             result.wait()
             pool.close()
             pool.join()
             if not result.successful():
                 raise RuntimeError(_("Execution of subprocesses was not successful"))
+            if self.inplace and any(result.get()):
+                raise RuntimeError(_("Execution of subprocesses was not successful"))
+        self.times['compute'] = time.time() - start
 
+        start = time.time()
         if patch:
-            if self.move:
+            if self.inplace:
+                self.patch()
+            elif self.move:
                 os.environ['GISRC'] = self.gisrc_dst
                 self.n_mset.current()
                 self.patch()
@@ -581,7 +726,12 @@ class GridModule(object):
                                             self.out_prefix + par.value), 'w+')
                     fil.close()
 
-        if clean:
+        self.times['patch'] = time.time() - start
+
+        start = time.time()
+        if clean and self.inplace:
+            self.rm_tiles()
+        elif clean:
             self.clean_location()
             self.rm_tiles()
             if self.n_mset:
@@ -592,10 +742,20 @@ class GridModule(object):
                 self.gisrc_dst = None
                 sht.rmtree(os.path.join(self.move, 'PERMANENT'))
                 sht.rmtree(os.path.join(self.move, self.mset.name))
+        self.times['clean'] = time.time() - start
 
     def patch(self):
         """Patch the final results."""
         bboxes = split_region_tiles(width=self.width, height=self.height)
+        if self.inplace:
+            for otmap in self.module.outputs:
+                otm = self.module.outputs[otmap]
+                if otm.typedesc == 'raster' and otm.value:
+                    rpatch_map_tiles(otm.value, self.get_tile_str(otm.value),
+                                     bboxes, self.module.flags.overwrite,
+                                     self.start_row, self.start_col,
+                                     self.out_prefix)
+            return
         loc = Location()
         mset = loc[self.mset.name]
         mset.visible.extend(loc.mapsets())
@@ -609,6 +769,17 @@ class GridModule(object):
 
     def rm_tiles(self):
         """Remove all the tiles."""
+        # if inplace, remove the outputs of the tiles
+        if self.inplace:
+            names = []
+            for k in self.module.outputs:
+                otm = self.module.outputs[k]
+                if otm.typedesc == 'raster' and otm.value:
+                    for row, box_row in enumerate(self.bboxes):
+                        names.extend([self.get_tile_name(otm.value, row, col)
+                                      for col in range(len(box_row))])
+            if names:
+                Module('g.remove', flags='f', type='raster', name=names)
         # if split, remove tiles
         if self.inlist:
             grm = Module('g.remove')
@@ -6,8 +6,12 @@ Created on Tue Apr  2 18:57:42 2013
 """
 from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
+import numpy as np
+
 from grass.pygrass.gis.region import Region
 from grass.pygrass.raster import RasterRow
+from grass.pygrass.raster.buffer import Buffer
+from grass.pygrass.raster.raster_type import TYPE as RTYPE
 from grass.pygrass.utils import coor2pixel
 
 
@@ -95,3 +99,69 @@ def rpatch_map(raster, mapset, mset_str, bbox_list, overwrite=False,
             del(rst)
 
     rast.close()
+
+
+def rpatch_block_row(rast, rasts, bboxes):
+    """Patch a row of bound boxes reading each tile as a block.
+
+    All the rows of a tile are read with a single row Buffer into a 2D
+    array that covers the whole row of bound boxes, the array is then
+    written row by row.
+
+    :param rast: a Raster object to write
+    :type rast: Raster object
+    :param rasts: a list of Raster object to read
+    :type rasts: list of Raster object
+    :param bboxes: a list of BBox object
+    :type bboxes: list of BBox object
+    """
+    sei = get_start_end_index(bboxes)
+    r_start, r_end = sei[0][:2]
+    ncols = Region().cols
+    band = np.empty((r_end - r_start, ncols),
+                    dtype=RTYPE[rast.mtype]['numpy'])
+    for ras, (r_start, r_end, c_start, c_end) in zip(rasts, sei):
+        ras.get_block(slice(r_start, r_end), slice(c_start, c_end),
+                      band[:, c_start:c_end])
+    row_buffer = Buffer((ncols,), rast.mtype)
+    for row in band:
+        row_buffer[:] = row
+        rast.put_row(row_buffer)
+
+
+def rpatch_map_tiles(raster, tile_str, bbox_list, overwrite=False,
+                     start_row=0, start_col=0, prefix=''):
+    """Patch raster tiles that are in the current mapset, using a bounding
+    box list to trim the tiles.
+
+    :param raster: the name of output raster
+    :type raster: str
+    :param tile_str: the string to format with the row and the column of
+                     the tile to obtain the name of the tile map
+    :type tile_str: str
+    :param bbox_list: a list of BBox object to convert
+    :type bbox_list: list of BBox object
+    :param overwrite: overwrite existing raster
+    :type overwrite: bool
+    :param start_row: the starting row of original raster
+    :type start_row: int
+    :param start_col: the starting column of original raster
+    :type start_col: int
+    :param prefix: the prefix of output raster
+    :type prefix: str
+    """
+    rtype = RasterRow(name=tile_str % (start_row, start_col))
+    rtype.open('r')
+    rast = RasterRow(prefix + raster)
+    rast.open('w', mtype=rtype.mtype, overwrite=overwrite)
+    rtype.close()
+    for row, rbbox in enumerate(bbox_list):
+        rrasts = []
+        for col in range(len(rbbox)):
+            rrasts.append(RasterRow(name=tile_str % (start_row + row,
+                                                     start_col + col)))
+            rrasts[-1].open('r')
+        rpatch_block_row(rast, rrasts, rbbox)
+        for rst in rrasts:
+            rst.close()
+    rast.close()
@@ -3,11 +3,14 @@ from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import sys
 from multiprocessing import cpu_count
+import threading
 import time
 from xml.etree.ElementTree import fromstring
 
-from grass.exceptions import CalledModuleError, GrassError, ParameterError
+from grass.exceptions import (CalledModuleError, GrassError, ParameterError,
+                              ScriptError)
 from grass.script.core import Popen, PIPE
+from grass.script.task import get_interface_description
 from .docstring import docstring_property
 from .parameter import Parameter
 from .flag import Flag
@@ -18,8 +21,10 @@ from .env import G_debug
 
 if sys.version_info[0] == 2:
     from itertools import izip_longest as zip_longest
+    from Queue import Queue
 else:
     from itertools import zip_longest
+    from queue import Queue
     unicode = str
 
 
@@ -33,12 +38,13 @@ class ParallelModuleQueue(object):
 
     Objects of type grass.pygrass.modules.Module can be put into the
     queue using put() method. When the queue is full with the maximum
-    number of parallel processes it will wait for all processes to finish,
-    sets the stdout and stderr of the Module object and removes it
-    from the queue when its finished.
+    number of parallel processes, put() will wait until the first
+    running process finishes and start the new Module immediately in the
+    free slot, so a slow process does not stall the others. The stdout,
+    stderr and the execution time of the Module objects are set as soon
+    as their process finish.
 
-    To finish the queue before the maximum number of parallel
-    processes was reached call wait() .
+    To wait for all the processes in the queue call wait().
 
     This class will raise a GrassError in case a Module process exits
     with a return code other than 0.
@@ -72,6 +78,13 @@ class ParallelModuleQueue(object):
     0
     0
     0
+    >>> len(queue.get_finished_modules())
+    5
+    >>> all(m.time is not None for m in queue.get_finished_modules())
+    True
+    >>> queue.wait()
+    >>> len(queue.get_finished_modules())
+    0
 
     Check with a queue size of 8 and 5 processes
 
@@ -154,15 +167,15 @@ class ParallelModuleQueue(object):
     >>> new_mapcalc = copy.deepcopy(mapcalc)
     >>> mapcalc_list.append(new_mapcalc)
     >>> m = new_mapcalc(expression="test_pygrass_3 =3")
-    >>> queue.put(m) # Now it will wait until all procs finish and set the counter back to 0
+    >>> queue.put(m)
     >>> queue.get_num_run_procs()
-    0
+    3
     >>> new_mapcalc = copy.deepcopy(mapcalc)
     >>> mapcalc_list.append(new_mapcalc)
     >>> m = new_mapcalc(expression="test_pygrass_%i = %i"%(i, i))
-    >>> queue.put(m)
+    >>> queue.put(m) # Now it will wait until the first process finish
     >>> queue.get_num_run_procs()
-    1
+    3
     >>> queue.wait()
     >>> queue.get_num_run_procs()
     0
@@ -175,6 +188,16 @@ class ParallelModuleQueue(object):
     0
     0
 
+    A process that fails raises a GrassError
+
+    >>> queue = ParallelModuleQueue(nprocs=3)
+    >>> m = copy.deepcopy(mapcalc)(expression="test_pygrass_1 = foo(")
+    >>> queue.put(m)
+    >>> queue.wait()      # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    GrassError: Error running module r.mapcalc...
+
     """
     def __init__(self, nprocs=1):
         """Constructor
@@ -186,8 +209,12 @@ class ParallelModuleQueue(object):
         """
         nprocs = int(nprocs) if nprocs else cpu_count()
         self._num_procs = nprocs
-        self._list = nprocs * [None]
-        self._proc_count = 0
+        self._list = []
+        # modules collected since the last call of wait() and modules
+        # collected until the last call of wait()
+        self._collected = []
+        self._finished = []
+        self._finished_queue = Queue()
 
     def put(self, module):
         """Put the next Module object in the queue
@@ -195,19 +222,62 @@ class ParallelModuleQueue(object):
         To run the Module objects in parallel the run\_ and finish\_ options
         of the Module must be set to False.
 
+        If the queue is full wait until the first running process finish
+        and raise a GrassError if its return code is not 0.
+
         :param module: a preconfigured Module object with run\_ and finish\_
                        set to False
         :type module: Module object
         """
-        self._list[self._proc_count] = module
+        if len(self._list) >= self._num_procs:
+            self._check(self._collect())
         # Force that finish is False, otherwise the execution
         # will not be parallel
-        self._list[self._proc_count].finish_ = False
-        self._list[self._proc_count].run()
-        self._proc_count += 1
-
-        if self._proc_count == self._num_procs:
-            self.wait()
+        module.finish_ = False
+        start = time.time()
+        module.run()
+        self._list.append(module)
+        # a thread for each running process reads stdout and stderr
+        # to avoid the process being blocked by a full pipe
+        thread = threading.Thread(target=self._communicate,
+                                  args=(module, start))
+        thread.daemon = True
+        thread.start()
+
+    def _communicate(self, module, start):
+        """Wait for the process of the module to finish, set its stdout,
+        stderr and execution time and notify the queue"""
+        try:
+            stdout, stderr = module.popen.communicate(input=module.stdin)
+            module.outputs['stdout'].value = stdout if stdout else ''
+            module.outputs['stderr'].value = stderr if stderr else ''
+        finally:
+            module.time = time.time() - start
+            self._finished_queue.put(module)
+
+    def _collect(self):
+        """Wait for the next process to finish and remove its Module object
+        from the queue
+
+        :returns: the Module object of the finished process
+        """
+        module = self._finished_queue.get()
+        for i, mod in enumerate(self._list):
+            if mod is module:
+                del self._list[i]
+                break
+        self._collected.append(module)
+        return module
+
+    def _check(self, *modules):
+        """Raise a GrassError if the process of a Module object exited
+        with a return code other than 0"""
+        failed = [mod for mod in modules if mod.popen.returncode != 0]
+        if failed:
+            msg = "\n".join(["Error running module %s (return code %i): %s"
+                             % (mod.name, mod.popen.returncode,
+                                mod.get_bash()) for mod in failed])
+            raise GrassError(msg)
 
     def get(self, num):
         """Get a Module object from the queue
@@ -216,17 +286,17 @@ class ParallelModuleQueue(object):
         :type num: int
         :returns: the Module object or None if num is not in the queue
         """
-        if num < self._num_procs:
+        if num < len(self._list):
             return self._list[num]
         return None
 
     def get_num_run_procs(self):
         """Get the number of Module processes that are in the queue running
-        or finished
+        or finished but not yet collected by put() or wait()
 
         :returns: the number fo Module processes running/finished in the queue
         """
-        return self._proc_count
+        return len(self._list)
 
     def get_max_num_procs(self):
         """Return the maximum number of parallel Module processes
@@ -235,6 +305,20 @@ class ParallelModuleQueue(object):
         """
         return self._num_procs
 
+    def get_finished_modules(self):
+        """Return the Module objects of the processes collected by the
+        last call of wait() or by put() since the previous call, in order of
+        completion. The return code of each process is available in the
+        popen attribute and the execution time in the time attribute.
+
+        The queue does not keep references to Module objects of older
+        calls of wait(), so that long running queues do not keep all
+        Module objects and their outputs alive.
+
+        :returns: a list of Module objects
+        """
+        return self._finished
+
     def set_max_num_procs(self, nprocs):
         """Set the maximum number of Module processes that should run
         in parallel
@@ -249,18 +333,16 @@ class ParallelModuleQueue(object):
     def wait(self):
         """Wait for all Module processes that are in the list to finish
         and set the modules stdout and stderr output options
-        """
-        for proc in self._list:
-            if proc:
-                stdout, stderr = proc.popen.communicate(input=proc.stdin)
-                proc.outputs['stdout'].value = stdout if stdout else ''
-                proc.outputs['stderr'].value = stderr if stderr else ''
-
-                if proc.popen.returncode != 0:
-                    GrassError(("Error running module %s") % (proc.name))
 
-        self._list = self._num_procs * [None]
-        self._proc_count = 0
+        Raise a GrassError if at least one process exited with a return
+        code other than 0.
+        """
+        modules = []
+        while self._list:
+            modules.append(self._collect())
+        self._finished = self._collected
+        self._collected = []
+        self._check(*modules)
 
 
 class Module(object):
@@ -459,14 +541,13 @@ class Module(object):
         else:
             raise GrassError("Problem initializing the module {s}".format(s=cmd))
         try:
-            # call the command with --interface-description
-            get_cmd_xml = Popen([cmd, "--interface-description"], stdout=PIPE)
-        except OSError as e:
-            print("OSError error({0}): {1}".format(e.errno, e.strerror))
+            # get the xml of the module, the description is cached and the
+            # command is called with --interface-description only if needed
+            self.xml = get_interface_description(self.name)
+        except ScriptError as e:
+            print("ScriptError error: {0}".format(e))
             str_err = "Error running: `%s --interface-description`."
             raise GrassError(str_err % self.name)
-        # get the xml of the module
-        self.xml = get_cmd_xml.communicate()[0]
         # transform and parse the xml into an Element class:
         # http://docs.python.org/library/xml.etree.elementtree.html
         tree = fromstring(self.xml)
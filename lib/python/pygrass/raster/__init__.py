@@ -3,7 +3,12 @@ from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import os
 import ctypes
+import threading
 import numpy as np
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 #
 # import GRASS modules
@@ -134,10 +139,98 @@ class RasterRow(RasterAbstractBase):
         >>> elev.is_open()
         False
 
+        Sequential reads can be overlapped with the processing of the rows
+        using the ``prefetch`` parameter: the next rows are decoded in a
+        background thread into a ring of preallocated buffers. The yielded
+        Buffer is reused, copy it if it has to be kept after the next
+        iteration:
+
+        >>> with RasterRow(test_raster_name, prefetch=2) as elev:
+        ...     for row in elev:
+        ...         row
+        Buffer([11, 21, 31, 41], dtype=int32)
+        Buffer([12, 22, 32, 42], dtype=int32)
+        Buffer([13, 23, 33, 43], dtype=int32)
+        Buffer([14, 24, 34, 44], dtype=int32)
+
     """
     def __init__(self, name, mapset='', *args, **kargs):
+        ## Number of rows decoded in advance by a background thread when
+        # the map is iterated, 0 disable the prefetching
+        self.prefetch = kargs.pop('prefetch', 0)
+        self._prefetch = None
         super(RasterRow, self).__init__(name, mapset, *args, **kargs)
 
+    def __iter__(self):
+        """Return a generator of the rows, decoded in a background thread
+        if the prefetch attribute is set"""
+        if self.prefetch and self.mode == 'r' and self.is_open():
+            return self._iter_prefetch()
+        return super(RasterRow, self).__iter__()
+
+    def _iter_prefetch(self):
+        """Private generator that yields the rows decoded by a reader thread.
+
+        The reader thread fills a ring of ``prefetch + 1`` buffers, ctypes
+        releases the GIL while `Rast_get_row` is running, so the decoding
+        of the next rows overlaps with the processing of the current one.
+        The raster library is not thread safe: do not open or close other
+        maps while the iteration is running.
+        """
+        size = self.prefetch + 1
+        ring = [Buffer((self._cols,), self.mtype) for _ in range(size)]
+        free = threading.Semaphore(size)
+        filled = queue.Queue()
+        stop = threading.Event()
+        errors = []
+
+        def reader():
+            try:
+                for row in range(self._rows):
+                    free.acquire()
+                    if stop.is_set():
+                        return
+                    libraster.Rast_get_row(self._fd, ring[row % size].p,
+                                           row, self._gtype)
+                    filled.put(row)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                filled.put(None)
+
+        self._stop_prefetch()
+        thread = threading.Thread(target=reader)
+        thread.daemon = True
+        self._prefetch = (stop, free, thread)
+        thread.start()
+        try:
+            while True:
+                row = filled.get()
+                if row is None:
+                    break
+                yield ring[row % size]
+                free.release()
+            if errors:
+                raise errors[0]
+        finally:
+            self._stop_prefetch()
+
+    def _stop_prefetch(self):
+        """Private method to stop and wait the prefetching thread"""
+        if self._prefetch is None:
+            return
+        stop, free, thread = self._prefetch
+        self._prefetch = None
+        stop.set()
+        free.release()
+        thread.join()
+
+    @must_be_open
+    def close(self):
+        """Close the map, stopping the prefetching thread if running"""
+        self._stop_prefetch()
+        super(RasterRow, self).close()
+
     # mode = "r", method = "row",
     @must_be_open
     def get_row(self, row, row_buffer=None):
@@ -171,7 +264,7 @@ class RasterRow(RasterAbstractBase):
         """
         libraster.Rast_put_row(self._fd, row.p, self._gtype)
 
-    def open(self, mode=None, mtype=None, overwrite=None):
+    def open(self, mode=None, mtype=None, overwrite=None, data_only=False):
         """Open the raster if exist or created a new one.
 
         :param str mode: Specify if the map will be open with read or write mode
@@ -180,6 +273,9 @@ class RasterRow(RasterAbstractBase):
                      `FCELL`, `DCELL`)
         :param bool overwrite: Use this flag to set the overwrite mode of existing
                           raster maps
+        :param bool data_only: In read mode do not read the information,
+                               the categories and the history of the map,
+                               use it to scan the data of many maps
 
         if the map already exist, automatically check the type and set:
 
@@ -191,6 +287,23 @@ class RasterRow(RasterAbstractBase):
             * self._gtype
             * self._rows and self._cols
 
+        In read mode the information, the categories and the history of
+        the map are read on first access:
+
+        >>> elev = RasterRow(test_raster_name)
+        >>> elev.open('r')
+        >>> sorted(elev._unread)
+        [u'cats', u'hist', u'info']
+        >>> elev.info.rows
+        4
+        >>> sorted(elev._unread)
+        [u'cats', u'hist']
+        >>> elev.close()
+        >>> elev.open('r', data_only=True)
+        >>> sorted(elev._unread)
+        []
+        >>> elev.close()
+
         """
         self.mode = mode if mode else self.mode
         self.mtype = mtype if mtype else self.mtype
@@ -198,13 +311,10 @@ class RasterRow(RasterAbstractBase):
 
         if self.mode == 'r':
             if self.exist():
-                self.info.read()
-                self.cats.mtype = self.mtype
-                self.cats.read()
-                self.hist.read()
                 self._fd = libraster.Rast_open_old(self.name, self.mapset)
                 self._gtype = libraster.Rast_get_map_type(self._fd)
                 self.mtype = RTYPE_STR[self._gtype]
+                self._defer_metadata(data_only)
             else:
                 str_err = _("The map does not exist, I can't open in 'r' mode")
                 raise OpenError(str_err)
@@ -233,7 +343,7 @@ class RasterRowIO(RasterRow):
         self.rowio = RowIO()
         super(RasterRowIO, self).__init__(name, *args, **kargs)
 
-    def open(self, mode=None, mtype=None, overwrite=False):
+    def open(self, mode=None, mtype=None, overwrite=False, data_only=False):
         """Open the raster if exist or created a new one.
 
         :param mode: specify if the map will be open with read or write mode
@@ -245,13 +355,17 @@ class RasterRowIO(RasterRow):
         :param overwrite: use this flag to set the overwrite mode of existing
                           raster maps
         :type overwrite: bool
+        :param data_only: in read mode do not read the information, the
+                          categories and the history of the map
+        :type data_only: bool
         """
-        super(RasterRowIO, self).open(mode, mtype, overwrite)
+        super(RasterRowIO, self).open(mode, mtype, overwrite, data_only)
         self.rowio.open(self._fd, self._rows, self._cols, self.mtype)
 
     @must_be_open
     def close(self):
         """Function to close the raster"""
+        self._stop_prefetch()
         self.rowio.release()
         libraster.Rast_close(self._fd)
         # update rows and cols attributes
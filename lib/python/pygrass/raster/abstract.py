@@ -7,6 +7,7 @@ Created on Fri Aug 17 16:05:25 2012
 from __future__ import (nested_scopes, generators, division, absolute_import,
                         with_statement, print_function, unicode_literals)
 import ctypes
+import numpy as np
 
 #
 # import GRASS modules
@@ -30,9 +31,13 @@ from grass.pygrass.shell.show import raw_figure
 from grass.pygrass.raster.raster_type import TYPE as RTYPE, RTYPE_STR
 from grass.pygrass.raster.category import Category
 from grass.pygrass.raster.history import History
+from grass.pygrass.raster.buffer import Buffer
 
 test_raster_name="abstract_test_map"
 
+## Value of the null cells of the CELL maps
+CELL_NULL = np.iinfo(np.int32).min
+
 ## Define global variables to not exceed the 80 columns
 INDXOUTRANGE = "The index (%d) is out of range, have you open the map?."
 INFO = """{name}@{mapset}
@@ -45,6 +50,13 @@ proj: {proj}
 """
 
 
+def _interp_cubic(u, c0, c1, c2, c3):
+    """Cubic convolution interpolation as computed by Rast_interp_cubic"""
+    return (u * (u * (u * (c3 + 3 * c1 - 3 * c2 - c0) +
+                      (2 * c0 - 5 * c1 + 4 * c2 - c3)) +
+                 (c2 - c0)) + 2 * c1) / 2
+
+
 class Info(object):
     def __init__(self, name, mapset=''):
         """Read the information for a raster map. ::
@@ -236,9 +248,12 @@ class RasterAbstractBase(object):
         # when you open the file, using Rast_window_cols()
         self._cols = None
         #self.region = Region()
-        self.hist = History(self.name, self.mapset)
-        self.cats = Category(self.name, self.mapset)
-        self.info = Info(self.name, self.mapset)
+        self._hist = History(self.name, self.mapset)
+        self._cats = Category(self.name, self.mapset)
+        self._info = Info(self.name, self.mapset)
+        ## Private attribute `_unread` with the names of the metadata
+        # ('info', 'cats', 'hist') that are read from the map on first access
+        self._unread = set()
         self._aopen = aopen
         self._kwopen = kwopen
         self._mtype = 'CELL'
@@ -267,6 +282,46 @@ class RasterAbstractBase(object):
 
     mtype = property(fget=_get_mtype, fset=_set_mtype)
 
+    def _get_info(self):
+        """Private method to return the Info object, the information are
+        read on first access"""
+        if 'info' in self._unread:
+            self._unread.discard('info')
+            self._info.read()
+        return self._info
+
+    info = property(fget=_get_info, doc="Information of the raster map")
+
+    def _get_cats(self):
+        """Private method to return the Category object, the categories are
+        read on first access"""
+        if 'cats' in self._unread:
+            self._unread.discard('cats')
+            self._cats.mtype = self.mtype
+            self._cats.read()
+        return self._cats
+
+    cats = property(fget=_get_cats, doc="Categories of the raster map")
+
+    def _get_hist(self):
+        """Private method to return the History object, the history is
+        read on first access"""
+        if 'hist' in self._unread:
+            self._unread.discard('hist')
+            self._hist.read()
+        return self._hist
+
+    hist = property(fget=_get_hist, doc="History of the raster map")
+
+    def _defer_metadata(self, data_only=False):
+        """Private method to read the information, the categories and the
+        history of the map on first access instead of opening time.
+
+        :param bool data_only: if True the metadata are not read at all,
+                               they can be read calling their read method
+        """
+        self._unread = set() if data_only else set(['info', 'cats', 'hist'])
+
     def _get_mode(self):
         return self._mode
 
@@ -325,13 +380,19 @@ class RasterAbstractBase(object):
         return self._rows
 
     def __getitem__(self, key):
-        """Return the row of Raster object, slice allowed."""
+        """Return the row of Raster object, slice allowed.
+
+        A tuple with at least one slice return a 2D numpy array with the
+        selected window of the raster map, see `get_block`.
+        """
         if isinstance(key, slice):
             #import pdb; pdb.set_trace()
             #Get the start, stop, and step from the slice
             return (self.get_row(ii) for ii in range(*key.indices(len(self))))
         elif isinstance(key, tuple):
             x, y = key
+            if isinstance(x, slice) or isinstance(y, slice):
+                return self.get_block(x, y)
             return self.get(x, y)
         elif isinstance(key, int):
             if key < 0:  # Handle negative indices
@@ -350,6 +411,114 @@ class RasterAbstractBase(object):
     def _repr_png_(self):
         return raw_figure(utils.r_export(self))
 
+    def _index2slice(self, key, size):
+        """Private method to convert an int index into a slice"""
+        if isinstance(key, slice):
+            return key
+        if key < 0:  # Handle negative indices
+            key += size
+        if key < 0 or key >= size:
+            raise IndexError(_("Index out of range: %r.") % key)
+        return slice(key, key + 1)
+
+    @must_be_open
+    def get_block(self, rows, cols, block=None):
+        """Return a 2D numpy array with a window of the raster map.
+
+        The rows are read using a single Buffer object that is reused
+        for all the rows of the window.
+
+        :param rows: the rows of the window
+        :type rows: slice or int
+        :param cols: the columns of the window
+        :type cols: slice or int
+        :param block: a 2D numpy array with the right shape used to store
+                      the window, if not given a new array is created
+        :type block: numpy.ndarray
+
+        >>> from grass.pygrass.raster import RasterRow
+        >>> ele = RasterRow(test_raster_name)
+        >>> ele.open()
+        >>> ele[1:3, 0:2]
+        array([[12, 22],
+               [13, 23]], dtype=int32)
+        >>> ele.get_block(slice(0, 4, 2), 3)
+        array([[41],
+               [43]], dtype=int32)
+        >>> ele.close()
+
+        """
+        rows = range(*self._index2slice(rows, self._rows).indices(self._rows))
+        cols = self._index2slice(cols, self._cols)
+        ncols = len(range(*cols.indices(self._cols)))
+        if block is None:
+            block = np.empty((len(rows), ncols),
+                             dtype=RTYPE[self.mtype]['numpy'])
+        elif block.shape != (len(rows), ncols):
+            str_err = _("Block and window are different: %r != %r")
+            raise ValueError(str_err % (block.shape, (len(rows), ncols)))
+        row_buffer = Buffer((self._cols,), self.mtype)
+        for i, row in enumerate(rows):
+            self.get_row(row, row_buffer)
+            block[i] = row_buffer[cols]
+        return block
+
+    @must_be_open
+    def iter_blocks(self, rows, cols, overlap=0):
+        """Return a generator of windows that cover the whole raster map.
+
+        Each item is a tuple with the slices of rows and columns of the
+        window and a 2D numpy array with the values. The rows of the map
+        are read only once, the windows of the same band of rows are views
+        of the same array and the overlapping rows of two bands are copied
+        from the previous band.
+
+        :param int rows: number of rows of the windows
+        :param int cols: number of columns of the windows
+        :param int overlap: number of cells added to each side of the
+                            windows (halo), the windows at the border of the
+                            map are clipped
+
+        >>> from grass.pygrass.raster import RasterRow
+        >>> ele = RasterRow(test_raster_name)
+        >>> ele.open()
+        >>> for rslice, cslice, block in ele.iter_blocks(2, 2):
+        ...     rslice, cslice, block.tolist()
+        (slice(0, 2, None), slice(0, 2, None), [[11, 21], [12, 22]])
+        (slice(0, 2, None), slice(2, 4, None), [[31, 41], [32, 42]])
+        (slice(2, 4, None), slice(0, 2, None), [[13, 23], [14, 24]])
+        (slice(2, 4, None), slice(2, 4, None), [[33, 43], [34, 44]])
+        >>> [block.shape for r, c, block in ele.iter_blocks(2, 2, overlap=1)]
+        [(3, 3), (3, 3), (3, 3), (3, 3)]
+        >>> blocks = list(ele.iter_blocks(2, 2, overlap=1))
+        >>> blocks[2][2].tolist()
+        [[12, 22, 32], [13, 23, 33], [14, 24, 34]]
+        >>> ele.close()
+
+        """
+        if rows <= 0 or cols <= 0 or overlap < 0:
+            raise ValueError(_("Invalid window size: %r, %r, overlap %r")
+                             % (rows, cols, overlap))
+        band = None
+        for row in range(0, self._rows, rows):
+            rstart = max(row - overlap, 0)
+            rstop = min(row + rows + overlap, self._rows)
+            new_band = np.empty((rstop - rstart, self._cols),
+                                dtype=RTYPE[self.mtype]['numpy'])
+            # copy the overlapping rows from the previous band
+            nreused = 0
+            if band is not None:
+                nreused = max(bstop - rstart, 0)
+                new_band[:nreused] = band[rstart - bstart:]
+            self.get_block(slice(rstart + nreused, rstop), slice(None),
+                           new_band[nreused:])
+            band, bstart, bstop = new_band, rstart, rstop
+            for col in range(0, self._cols, cols):
+                cstart = max(col - overlap, 0)
+                cstop = min(col + cols + overlap, self._cols)
+                yield (slice(rstart, rstop), slice(cstart, cstop),
+                       band[:, cstart:cstop])
+
     def exist(self):
         """Return True if the map already exist, and
         set the mapset if were not set.
@@ -486,6 +655,112 @@ class RasterAbstractBase(object):
         line = self.get_row(int(row))
         return line[int(col)]
 
+    @must_be_open
+    def get_values(self, points, region=None, method='nearest'):
+        """Return a numpy array with the values of the raster map at the
+        given coordinates.
+
+        The points are sorted by row, each row of the raster map that is
+        needed is decoded only once. The values of the points outside the
+        region and of the null cells are NaN.
+
+        :param points: a sequence of pairs of coordinates (east, north) or
+                       a numpy array with two columns
+        :param region: the region used to convert the coordinates into
+                       rows and columns, if None the current region is used
+        :param str method: the interpolation method: nearest, bilinear or
+                           bicubic
+
+        >>> from grass.pygrass.raster import RasterRow
+        >>> ele = RasterRow(test_raster_name)
+        >>> ele.open()
+        >>> ele.get_values([(5, 35), (15, 25), (50, 50)]).tolist()
+        [11.0, 22.0, nan]
+        >>> ele.get_values([(20, 20)], method='bilinear').tolist()
+        [27.5]
+        >>> ele.get_values([(20, 20)], method='bicubic').tolist()
+        [27.5]
+        >>> ele.close()
+
+        """
+        if method == 'nearest':
+            offsets = [0]
+        elif method == 'bilinear':
+            offsets = [0, 1]
+        elif method == 'bicubic':
+            offsets = [-1, 0, 1, 2]
+        else:
+            raise ValueError(_("Invalid interpolation method: %r") % method)
+
+        if region is None:
+            region = Region()
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        values = np.empty((len(coords), ), dtype=np.float64)
+        values.fill(np.nan)
+
+        rows = (region.north - coords[:, 1]) / region.nsres
+        cols = (coords[:, 0] - region.west) / region.ewres
+        if method != 'nearest':
+            # interpolate between the centers of the cells
+            rows -= 0.5
+            cols -= 0.5
+        with np.errstate(invalid='ignore'):
+            rows0 = np.floor(rows)
+            cols0 = np.floor(cols)
+            nrows = min(region.rows, self._rows)
+            ncols = min(region.cols, self._cols)
+            inside = ((rows0 + offsets[0] >= 0) &
+                      (rows0 + offsets[-1] < nrows) &
+                      (cols0 + offsets[0] >= 0) &
+                      (cols0 + offsets[-1] < ncols))
+        index = np.nonzero(inside)[0]
+        if not len(index):
+            return values
+
+        index = index[np.argsort(rows0[index], kind='mergesort')]
+        rows0 = rows0[index].astype(np.int64)
+        cols0 = cols0[index].astype(np.int64)
+        u = cols[index] - cols0
+        v = rows[index] - rows0
+        offsets = np.array(offsets)
+
+        row_buffer = Buffer((self._cols, ), self.mtype)
+        cache = {}
+        bounds = np.nonzero(np.diff(rows0))[0] + 1
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(index)]):
+            row = rows0[start]
+            for key in [key for key in cache if key < row + offsets[0]]:
+                del cache[key]
+            for key in row + offsets:
+                if key not in cache:
+                    cache[key] = self._get_float_row(int(key), row_buffer)
+            # cells has shape (offsets, points, offsets)
+            block = np.array([cache[key] for key in row + offsets])
+            cells = block[:, cols0[start:stop, np.newaxis] + offsets]
+            if method == 'nearest':
+                values[index[start:stop]] = cells[0, :, 0]
+            elif method == 'bilinear':
+                pu, pv = u[start:stop], v[start:stop]
+                values[index[start:stop]] = (
+                    cells[0, :, 0] * (1 - pu) * (1 - pv) +
+                    cells[0, :, 1] * pu * (1 - pv) +
+                    cells[1, :, 0] * (1 - pu) * pv +
+                    cells[1, :, 1] * pu * pv)
+            else:
+                pu, pv = u[start:stop], v[start:stop]
+                interp = [_interp_cubic(pu, *cells[i].T) for i in range(4)]
+                values[index[start:stop]] = _interp_cubic(pv, *interp)
+        return values
+
+    def _get_float_row(self, row, row_buffer):
+        """Private method that return a row as float64 array with NaN
+        in place of the null values"""
+        self.get_row(row, row_buffer)
+        values = np.array(row_buffer, dtype=np.float64)
+        if self.mtype == 'CELL':
+            values[np.asarray(row_buffer) == CELL_NULL] = np.nan
+        return values
+
     @must_be_open
     def has_cats(self):
         """Return True if the raster map has categories"""
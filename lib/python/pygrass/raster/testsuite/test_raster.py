@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import math
+
 from grass.exceptions import OpenError
 from grass.gunittest.case import TestCase
 from grass.gunittest.main import test
@@ -65,6 +67,52 @@ class RasterRowTestCase(TestCase):
         self.assertEqual(r.mtype, 'DCELL')
         r.close()
 
+    def test_get_block(self):
+        with RasterRow(self.name) as r:
+            block = r[1:3, 0:2]
+            self.assertEqual(block.shape, (2, 2))
+            self.assertEqual(block.tolist(), [[12., 22.], [13., 23.]])
+            self.assertEqual(r[:, 3].tolist(), [[41.], [42.], [43.], [44.]])
+
+    def test_iter_blocks(self):
+        with RasterRow(self.name) as r:
+            blocks = list(r.iter_blocks(3, 3, overlap=1))
+            self.assertEqual(len(blocks), 4)
+            rslice, cslice, block = blocks[-1]
+            self.assertEqual((rslice, cslice), (slice(2, 4), slice(2, 4)))
+            self.assertEqual(block.tolist(), [[33., 43.], [34., 44.]])
+
+    def test_prefetch(self):
+        with RasterRow(self.name) as r:
+            rows = [row.copy() for row in r]
+        with RasterRow(self.name, prefetch=2) as r:
+            prefetched = [row.copy() for row in r]
+            self.assertEqual(len(prefetched), len(rows))
+            for row, prefetched_row in zip(rows, prefetched):
+                self.assertEqual(row.tolist(), prefetched_row.tolist())
+            # stop the iteration before the end of the map
+            for i, row in enumerate(r):
+                if i == 1:
+                    break
+            self.assertEqual(row.tolist(), rows[1].tolist())
+
+    def test_get_values(self):
+        points = [(35, 5), (5, 35), (25, 15), (15, 25), (45, 5)]
+        with RasterRow(self.name) as r:
+            values = r.get_values(points)
+            for point, value in zip(points[:-1], values[:-1]):
+                self.assertEqual(value, r.get_value(point))
+            self.assertTrue(math.isnan(values[-1]))
+            self.assertEqual(r.get_values([(20, 20)],
+                                          method='bilinear').tolist(),
+                             [27.5])
+            self.assertEqual(r.get_values([(20, 20)],
+                                          method='bicubic').tolist(),
+                             [27.5])
+            # the neighbours of the border cells are outside the region
+            self.assertTrue(math.isnan(r.get_values([(5, 35)],
+                                                    method='bicubic')[0]))
+
     def test_open_w(self):
         r = RasterRow(self.name)
         with self.assertRaises(OpenError):
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the reading and writing of raster maps with grass.script.array
+using the r.out.bin/r.in.bin modules and the native raster library access.
+
+Usage::
+
+    python benchmark_array.py -r 1,0.5,0.25 -n 3
+"""
+from __future__ import (nested_scopes, generators, division, absolute_import,
+                        with_statement, print_function, unicode_literals)
+
+import optparse
+import time
+
+import grass.script as core
+from grass.script import array as garray
+
+
+def test__array_bin__read():
+    garray.array(mapname="test_a")
+
+
+def test__array_bin__write():
+    arr = garray.array(mapname="test_a")
+    arr.write(mapname="test_c", overwrite=True)
+
+
+def test__array_native__read():
+    garray.array(mapname="test_a", native=True)
+
+
+def test__array_native__write():
+    arr = garray.array(mapname="test_a", native=True)
+    arr.write(mapname="test_c", overwrite=True, native=True)
+
+
+def mytimer(func, runs=1):
+    times = []
+    for _ in range(runs):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return sum(times) / runs, times
+
+
+def run_benchmark(resolution_list, runs):
+    tests = sorted([(name, func) for name, func in globals().items()
+                    if name.startswith('test__')])
+    results = []
+    for resolution in resolution_list:
+        core.use_temp_region()
+        core.run_command('g.region', e=50, w=-50, n=50, s=-50,
+                         res=resolution)
+        core.mapcalc("test_a = rand(0.0, 100.0)", seed=1, quiet=True,
+                     overwrite=True)
+        region = core.region()
+        print("cols = {cols} rows = {rows} cells = {cells}".format(**region))
+        for name, func in tests:
+            dummy, execmode, operation = name.split('__')
+            mean, times = mytimer(func, runs)
+            results.append((region['cells'], execmode, operation, mean))
+            print("    {0:<20} - {1:>5} {2: 12.6f}s".format(execmode,
+                                                            operation, mean))
+        core.run_command('g.remove', flags='f', type='raster',
+                         name=['test_a', 'test_c'])
+        core.del_temp_region()
+    return results
+
+
+def main():
+    """Main function"""
+    parser = optparse.OptionParser(usage="usage: %prog [options]")
+    parser.add_option("-n", "--ntimes", dest="ntime", default=5, type="int",
+                      help="Number of run for each test.")
+    parser.add_option("-r", "--resolution", action="store", type="string",
+                      dest="res", default='1,0.25,0.1',
+                      help="Resolution list separete by comma.")
+    options, args = parser.parse_args()
+    res = [float(r) for r in options.res.split(',')]
+    run_benchmark(res, options.ntime)
+
+
+if __name__ == "__main__":
+    main()
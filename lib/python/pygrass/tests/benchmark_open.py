@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the latency of opening a raster map with RasterRow for maps
+with a growing number of categories: reading only the data, reading the
+data in data-only mode and reading all the metadata.
+
+Usage::
+
+    python benchmark_open.py -c 10,10000,100000 -n 10
+"""
+from __future__ import (nested_scopes, generators, division, absolute_import,
+                        with_statement, print_function, unicode_literals)
+
+import optparse
+import time
+
+import grass.script as core
+from grass.pygrass.raster import RasterRow
+
+
+def test__open__lazy():
+    with RasterRow("test_a") as rast:
+        rast.get_row(0)
+
+
+def test__open__data_only():
+    with RasterRow("test_a", data_only=True) as rast:
+        rast.get_row(0)
+
+
+def test__open__metadata():
+    with RasterRow("test_a") as rast:
+        rast.get_row(0)
+        rast.info.rows
+        len(rast.cats)
+        rast.hist.title
+
+
+def mytimer(func, runs=1):
+    times = []
+    for _ in range(runs):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return sum(times) / runs, times
+
+
+def run_benchmark(ncats_list, runs):
+    tests = sorted([(name, func) for name, func in globals().items()
+                    if name.startswith('test__')])
+    results = []
+    core.use_temp_region()
+    core.run_command('g.region', e=50, w=-50, n=50, s=-50, res=1)
+    for ncats in ncats_list:
+        core.mapcalc("test_a = rand(0, %d)" % ncats, seed=1, quiet=True,
+                     overwrite=True)
+        rules = "\n".join(["%d:category %d" % (cat, cat)
+                           for cat in range(ncats)])
+        core.write_command('r.category', map='test_a', rules='-',
+                           separator=':', stdin=rules, quiet=True)
+        print("categories = {0}".format(ncats))
+        for name, func in tests:
+            dummy, operation, mode = name.split('__')
+            mean, times = mytimer(func, runs)
+            results.append((ncats, mode, mean))
+            print("    {0:<20} {1: 12.6f}s".format(mode, mean))
+    core.run_command('g.remove', flags='f', type='raster', name='test_a')
+    core.del_temp_region()
+    return results
+
+
+def main():
+    """Main function"""
+    parser = optparse.OptionParser(usage="usage: %prog [options]")
+    parser.add_option("-n", "--ntimes", dest="ntime", default=10, type="int",
+                      help="Number of run for each test.")
+    parser.add_option("-c", "--categories", action="store", type="string",
+                      dest="ncats", default='10,10000,100000',
+                      help="Number of categories list separete by comma.")
+    options, args = parser.parse_args()
+    ncats = [int(n) for n in options.ncats.split(',')]
+    run_benchmark(ncats, options.ntime)
+
+
+if __name__ == "__main__":
+    main()
@@ -197,9 +197,14 @@ def pixel2coor(pixel, region):
             libraster.Rast_col_to_easting(col, region.byref()))
 
 
-def get_raster_for_points(poi_vector, raster, column=None, region=None):
+def get_raster_for_points(poi_vector, raster, column=None, region=None,
+                          method='nearest'):
     """Query a raster map for each point feature of a vector
 
+    The raster map is sampled at once for all the points with the
+    `get_values` method of the raster, the column is updated with a
+    single executemany statement.
+
     test_vector_name="Utils_test_vector"
     test_raster_name="Utils_test_raster"
 
@@ -239,14 +244,14 @@ def get_raster_for_points(poi_vector, raster, column=None, region=None):
     :param point: point vector object
     :param raster: raster object
     :param str column: column name to update
+    :param region: the region used to convert the coordinates into
+                   rows and columns, if None the current region is used
+    :param str method: the interpolation method: nearest, bilinear or
+                       bicubic
 
     """
     from math import isnan
-    if not column:
-        result = []
-    if region is None:
-        from grass.pygrass.gis.region import Region
-        region = Region()
+    from grass.pygrass.vector import sql
     if not poi_vector.is_open():
         poi_vector.open()
     if not raster.is_open():
@@ -254,22 +259,28 @@ def get_raster_for_points(poi_vector, raster, column=None, region=None):
     if poi_vector.num_primitive_of('point') == 0:
         raise GrassError(_("Vector doesn't contain points"))
 
+    ids, cats, coords = [], [], []
     for poi in poi_vector.viter('points'):
-        val = raster.get_value(poi, region)
-        if column:
-            if val is not None and not isnan(val):
-                poi.attrs[column] = val
-        else:
-            if val is not None and not isnan(val):
-                result.append((poi.id, poi.x, poi.y, val))
-            else:
-                result.append((poi.id, poi.x, poi.y, None))
-    if not column:
-        return result
-    else:
-        poi.attrs.commit()
+        ids.append(poi.id)
+        cats.append(poi.cat)
+        coords.append((poi.x, poi.y))
+    values = raster.get_values(coords, region, method)
+
+    if column:
+        table = poi_vector.table
+        sqlcode = sql.UPDATE_WHERE.format(tname=table.name,
+                                          values="%s=?" % column,
+                                          condition="%s=?" % table.key)
+        rows = [(float(val), cat) for val, cat in zip(values, cats)
+                if not isnan(val)]
+        if rows:
+            table.execute(sqlcode, many=True, values=rows)
+            table.conn.commit()
         return True
 
+    return [(pid, x, y, None if isnan(val) else val)
+            for pid, (x, y), val in zip(ids, coords, values)]
+
 
 def r_export(rast, output='', fmt='png', **kargs):
     from grass.pygrass.modules import Module
@@ -15,6 +15,7 @@ from grass.pygrass.gis import Location
 from grass.pygrass.vector.geometry import GEOOBJ as _GEOOBJ
 from grass.pygrass.vector.geometry import read_line, read_next_line
 from grass.pygrass.vector.geometry import Area as _Area
+from grass.pygrass.vector.geometry import AttrsCache
 from grass.pygrass.vector.abstract import Info
 from grass.pygrass.vector.basic import Bbox, Cats, Ilist
 
@@ -61,6 +62,7 @@ class Vector(Info):
         self._class_name = 'Vector'
         self.overwrite = False
         self._cats = []
+        self._cats_set = set()
 
     def __repr__(self):
         if self.exist():
@@ -120,6 +122,11 @@ class Vector(Info):
                          c_cats attribute of the geometry object will be used.
         :type cat: integer
 
+        The attributes are buffered by the writer of the table
+        (see ``Table.buffered_writer``) and inserted in batches, the
+        buffered attributes are written when the table is read or
+        committed and when the vector map is closed.
+
         Open a new vector map ::
 
             >>> new = VectorTopo('newvect')
@@ -180,14 +187,13 @@ class Vector(Info):
         if attrs and cat is None:
             cat = (self._cats[-1] if self._cats else 0) + 1
 
-        if cat is not None and cat not in self._cats:
+        if cat is not None and cat not in self._cats_set:
             self._cats.append(cat)
+            self._cats_set.add(cat)
             if self.table is not None and attrs is not None:
                 attr = [cat, ]
                 attr.extend(attrs)
-                cur = self.table.conn.cursor()
-                cur.execute(self.table.columns.insert_str, attr)
-                cur.close()
+                self.table.buffered_writer().insert(attr)
         
         if cat is not None:
             cats = Cats(geo_obj.c_cats)
@@ -384,6 +390,10 @@ class VectorTopo(Vector):
                        full features
         :type idonly: bool
 
+        The attribute table is read by a single query the first time an
+        attribute of a feature is requested and it is shared by all the
+        returned features.
+
             >>> test_vect = VectorTopo(test_vector_name, mode='r')
             >>> test_vect.open(mode='r')
             >>> areas = [area for area in test_vect.viter('areas')]
@@ -416,9 +426,13 @@ class VectorTopo(Vector):
                 ids = (indx for indx in range(1, self.number_of(vtype) + 1))
                 if idonly:
                     return ids
+                # the attributes of all features are read at once
+                cache = (AttrsCache(self.table) if self.table is not None
+                         else None)
                 return (_GEOOBJ[vtype](v_id=indx, c_mapinfo=self.c_mapinfo,
                                        table=self.table,
-                                       writeable=self.writeable)
+                                       writeable=self.writeable,
+                                       attrs_cache=cache)
                         for indx in ids)
         else:
             keys = "', '".join(sorted(_GEOOBJ.keys()))
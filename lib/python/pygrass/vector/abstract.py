@@ -398,6 +398,9 @@ class Info(object):
         :type build: bool
         """
         if hasattr(self, 'table') and self.table is not None:
+            if self.table.writer is not None:
+                # write and commit the buffered attributes
+                self.table.commit()
             self.table.conn.close()
         if self.is_open():
             if libvect.Vect_close(self.c_mapinfo) != 0:
@@ -134,13 +134,54 @@ def get_xyz(pnt):
     return x, y, z
 
 
+class AttrsCache(object):
+    """Cache of the rows of an attribute table shared by the features
+    read together, e.g. by ``VectorTopo.viter``. The whole table is read
+    the first time an attribute is requested, the changes of the table
+    made after are visible only if they are made through ``Attrs``.
+    """
+    def __init__(self, table, chunk_size=10000):
+        self.table = table
+        self.chunk_size = chunk_size
+        self.names = None
+        self._rows = None
+
+    def load(self):
+        """Read the rows of the table"""
+        self.names = self.table.columns.names()
+        key = self.names.index(self.table.key)
+        cur = self.table.execute(sql.SELECT.format(cols=', '.join(self.names),
+                                                   tname=self.table.name))
+        rows = {}
+        while True:
+            chunk = cur.fetchmany(self.chunk_size)
+            if not chunk:
+                break
+            for row in chunk:
+                rows[row[key]] = row
+        cur.close()
+        self._rows = rows
+
+    def get(self, cat):
+        """Return the row of a category or None"""
+        if self._rows is None:
+            self.load()
+        return self._rows.get(cat)
+
+    def discard(self, cat):
+        """Remove the row of a category from the cache"""
+        if self._rows is not None:
+            self._rows.pop(cat, None)
+
+
 class Attrs(object):
-    def __init__(self, cat, table, writeable=False):
+    def __init__(self, cat, table, writeable=False, cache=None):
         self._cat = None
         self.cond = ''
         self.table = table
         self.cat = cat
         self.writeable = writeable
+        self.cache = cache
 
     def _get_cat(self):
         return self._cat
@@ -168,6 +209,13 @@ class Attrs(object):
         >>> test_vect.close()
 
         """
+        row = self.cache.get(self.cat) if self.cache is not None else None
+        if row is not None:
+            names = self.cache.names
+            ckeys = (keys, ) if np.isscalar(keys) else keys
+            if all(key in names for key in ckeys):
+                results = tuple(row[names.index(key)] for key in ckeys)
+                return results[0] if len(results) == 1 else results
         sqlcode = sql.SELECT_WHERE.format(cols=(keys if np.isscalar(keys)
                                                 else ', '.join(keys)),
                                           tname=self.table.name,
@@ -203,12 +251,19 @@ class Attrs(object):
             if np.isscalar(keys):
                 keys, values = (keys, ), (values, )
 
-            vals = ','.join(['%s=%r' % (k, v) for k, v in zip(keys, values)])
+            vals = ','.join(['%s=?' % k for k in keys])
             # "UPDATE {tname} SET {values} WHERE {condition};"
             sqlcode = sql.UPDATE_WHERE.format(tname=self.table.name,
                                               values=vals,
-                                              condition=self.cond)
-            self.table.execute(sqlcode)
+                                              condition="%s=?" % self.table.key)
+            values = list(values) + [self.cat, ]
+            if self.table.writer is not None:
+                # the table is written in batches
+                self.table.writer.execute(sqlcode, values)
+            else:
+                self.table.execute(sqlcode, values=values)
+            if self.cache is not None:
+                self.cache.discard(self.cat)
             #self.table.conn.commit()
         else:
             str_err = "You can only read the attributes if the map is in another mapset"
@@ -233,6 +288,9 @@ class Attrs(object):
             >>> test_vect.close()
 
         """
+        row = self.cache.get(self.cat) if self.cache is not None else None
+        if row is not None:
+            return row
         #SELECT {cols} FROM {tname} WHERE {condition}
         cur = self.table.execute(sql.SELECT_WHERE.format(cols='*',
                                                          tname=self.table.name,
@@ -255,7 +313,7 @@ class Attrs(object):
 
     def commit(self):
         """Save the changes"""
-        self.table.conn.commit()
+        self.table.commit()
 
 
 class Geo(object):
@@ -266,7 +324,7 @@ class Geo(object):
 
     def __init__(self, v_id=0, c_mapinfo=None, c_points=None, c_cats=None,
                  table=None, writeable=False, is2D=True, free_points=False,
-                 free_cats=False):
+                 free_cats=False, attrs_cache=None):
         """Constructor of a geometry object
 
             :param v_id:      The vector feature id
@@ -290,6 +348,8 @@ class Geo(object):
                                 should be free'd at object destruction, be aware
                                 that no other object should free them, otherwise
                                 you can expect a double free corruption segfault
+            :param attrs_cache: An AttrsCache object shared by the features
+                                to read the attributes with a single query
 
         """
         self.id = v_id  # vector id
@@ -327,7 +387,7 @@ class Geo(object):
         # set the attributes as last thing to do
         self.attrs = None
         if table is not None and self.cat is not None:
-            self.attrs = Attrs(self.cat, table, writeable)
+            self.attrs = Attrs(self.cat, table, writeable, attrs_cache)
 
     def __del__(self):
         """Take care of the allocated line_pnts and line_cats allocation
@@ -36,6 +36,55 @@ test_vector_name = "table_doctest_map"
 
 DRIVERS = ('sqlite', 'pg')
 
+# default number of rows written at once by TableWriter
+WRITER_BATCH_SIZE = 1000
+
+# default number of rows fetched at once
+FETCH_CHUNK_SIZE = 10000
+
+
+def get_numpy_type(sql_type):
+    """Return the NumPy type used for the values of a SQL column type
+
+    >>> get_numpy_type('INTEGER')
+    <type 'numpy.int64'>
+    >>> get_numpy_type('double precision')
+    <type 'numpy.float64'>
+    >>> get_numpy_type('varchar(50)')
+    <type 'object'>
+
+    """
+    sql_type = sql_type.lower() if sql_type else ''
+    if 'int' in sql_type or 'serial' in sql_type:
+        return np.int64
+    if any(name in sql_type for name in ('double', 'real', 'float', 'numeric',
+                                         'decimal')):
+        return np.float64
+    return object
+
+
+def values_to_array(values, sql_type):
+    """Convert the values of a column to a NumPy array, NULL values of
+    numeric columns are converted to NaN.
+
+    >>> values_to_array((1, 2, 3), 'INTEGER')
+    array([1, 2, 3])
+    >>> values_to_array((1, None, 3), 'INTEGER')
+    array([  1.,  nan,   3.])
+    >>> values_to_array(('a', None), 'TEXT')
+    array([u'a', None], dtype=object)
+
+    """
+    dtype = get_numpy_type(sql_type)
+    if dtype is object:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+    if None in values:
+        return np.array([np.nan if val is None else val for val in values],
+                        dtype=np.float64)
+    return np.array(values, dtype=dtype)
+
 
 def get_path(path):
     """Return the full path to the database; replacing environment variable
@@ -935,6 +984,104 @@ class DBlinks(object):
         return libvect.Vect_get_field_number(self.c_mapinfo, name)
 
 
+class TableWriter(object):
+    """Buffer the rows inserted or updated in a table and write them
+    using ``executemany`` in batches of ``batch_size`` rows. The rows are
+    written in the current transaction of the connection, use the
+    ``commit`` method to write the remaining rows and commit the changes.
+
+    >>> import sqlite3
+    >>> tab = Table(name='writer_doctest',
+    ...             connection=sqlite3.connect(':memory:'))
+    >>> tab.create([('cat', 'INTEGER PRIMARY KEY'), ('name', 'TEXT')])
+    >>> writer = TableWriter(tab, batch_size=2)
+    >>> writer.insert((1, 'a'))
+    >>> len(writer)
+    1
+    >>> writer.insert((2, 'b'))
+    >>> len(writer)
+    0
+    >>> writer.insert((3, 'c'))
+    >>> writer.update(1, ('d', ))
+    >>> writer.commit()
+    >>> tab.execute().fetchall()
+    [(1, u'd'), (2, u'b'), (3, u'c')]
+
+    """
+    def __init__(self, table, batch_size=WRITER_BATCH_SIZE):
+        self.table = table
+        self.batch_size = batch_size
+        # list of pairs: SQL code and list of values
+        self._buffer = []
+        self._nrows = 0
+
+    def __len__(self):
+        """Return the number of buffered rows"""
+        return self._nrows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+
+    def execute(self, sql_code, values):
+        """Buffer a SQL statement with parameters, consecutive statements
+        with the same SQL code are executed by a single ``executemany``
+
+        :param sql_code: the SQL code with parameters
+        :type sql_code: str
+        :param values: the values to substitute into sql_code string
+        :type values: tuple
+        """
+        if self._buffer and self._buffer[-1][0] == sql_code:
+            self._buffer[-1][1].append(values)
+        else:
+            self._buffer.append((sql_code, [values, ]))
+        self._nrows += 1
+        if self._nrows >= self.batch_size:
+            self.flush()
+
+    def insert(self, values):
+        """Buffer a new row
+
+        :param values: a tuple of values to insert
+        :type values: tuple
+        """
+        self.execute(self.table.columns.insert_str, values)
+
+    def update(self, key, values):
+        """Buffer an update of a table row
+
+        :param key: the rowid
+        :type key: int
+        :param values: the values to insert without row id
+        :type values: list
+        """
+        self.execute(self.table.columns.update_str, list(values) + [key, ])
+
+    def flush(self):
+        """Write the buffered rows to the database"""
+        if not self._buffer:
+            return
+        buf, self._buffer, self._nrows = self._buffer, [], 0
+        cur = self.table.conn.cursor()
+        try:
+            for sql_code, values in buf:
+                cur.executemany(sql_code, values)
+        except Exception as exc:
+            raise ValueError("The SQL statement is not correct:\n%r,\n"
+                             "SQL error: %s" % (sql_code, str(exc)))
+        finally:
+            cur.close()
+
+    def commit(self):
+        """Write the buffered rows and commit the changes"""
+        self.flush()
+        self.table.conn.commit()
+
+
 class Table(object):
     """
 
@@ -980,6 +1127,8 @@ class Table(object):
                                self.conn,
                                self.key)
         self.filters = Filters(self.name)
+        # buffered writer, see buffered_writer method
+        self.writer = None
 
     def __repr__(self):
         """
@@ -1036,6 +1185,7 @@ class Table(object):
         >>> tab_sqlite.n_rows()
         3
         """
+        self.flush()
         cur = self.conn.cursor()
         cur.execute(sql.SELECT.format(cols='Count(*)', tname=self.name))
         number = cur.fetchone()[0]
@@ -1054,7 +1204,8 @@ class Table(object):
         :type cursor: Cursor object
         :param many: True to run executemany function
         :type many: bool
-        :param values: The values to substitute into sql_code string
+        :param values: The values to substitute into sql_code string,
+                       a list of tuple if many is True
         :type values: list of tuple
 
         >>> import sqlite3
@@ -1068,11 +1219,14 @@ class Table(object):
          (1, u'point')
 
         """
+        self.flush()
         try:
             sqlc = sql_code if sql_code else self.filters.get_sql()
             cur = cursor if cursor else self.conn.cursor()
             if many and values:
                 return cur.executemany(sqlc, values)
+            elif values and not many:
+                return cur.execute(sqlc, values)
             return cur.execute(sqlc)
         except Exception as exc:
             raise ValueError("The SQL statement is not correct:\n%r,\n"
@@ -1100,6 +1254,7 @@ class Table(object):
         :param many: True to run executemany function
         :type many: bool
         """
+        self.flush()
         cur = cursor if cursor else self.conn.cursor()
         if many:
             return cur.executemany(self.columns.insert_str, values)
@@ -1119,10 +1274,127 @@ class Table(object):
                        of connection table object
         :type cursor: Cursor object
         """
+        self.flush()
         cur = cursor if cursor else self.conn.cursor()
         vals = list(values) + [key, ]
         return cur.execute(self.columns.update_str, vals)
 
+    def to_numpy(self, columns=None, where=None, chunk_size=FETCH_CHUNK_SIZE,
+                 structured=True):
+        """Return the rows of the table as NumPy arrays. The rows are
+        fetched and converted in chunks of ``chunk_size`` rows.
+
+        Integer and floating point columns are converted to int64 and
+        float64 arrays, integer columns containing NULL values to float64
+        arrays with NaN, the other columns to arrays of objects.
+
+        :param columns: the list of column names, None for all the columns
+        :type columns: list of str
+        :param where: the SQL where condition
+        :type where: str
+        :param chunk_size: the number of rows fetched at once
+        :type chunk_size: int
+        :param structured: True to return a structured array, False to
+                           return an ordered dictionary with the column
+                           names as keys and the column arrays as values
+        :type structured: bool
+
+        >>> import sqlite3
+        >>> tab = Table(name='numpy_doctest',
+        ...             connection=sqlite3.connect(':memory:'))
+        >>> tab.create([('cat', 'INTEGER PRIMARY KEY'), ('name', 'TEXT'),
+        ...             ('value', 'double precision'), ('num', 'INTEGER')])
+        >>> cur = tab.insert([(1, 'a', 0.5, 1), (2, 'b', 1.5, None),
+        ...                   (3, 'c', None, 3)], many=True)
+        >>> arr = tab.to_numpy(chunk_size=2)
+        >>> arr['cat']
+        array([1, 2, 3])
+        >>> arr['value']
+        array([ 0.5,  1.5,  nan])
+        >>> arr['num']
+        array([  1.,  nan,   3.])
+        >>> cols = tab.to_numpy(['cat', 'name'], where='cat > 1',
+        ...                     structured=False)
+        >>> cols.keys()
+        [u'cat', u'name']
+        >>> cols['name']
+        array([u'b', u'c'], dtype=object)
+
+        """
+        names = columns if columns else self.columns.names()
+        types = dict(self.columns.items())
+        cols = ', '.join(names)
+        if where:
+            sqlc = sql.SELECT_WHERE.format(cols=cols, tname=self.name,
+                                           condition=where)
+        else:
+            sqlc = sql.SELECT.format(cols=cols, tname=self.name)
+        cur = self.execute(sqlc)
+        chunks = [[] for name in names]
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            for chunk, name, values in zip(chunks, names, zip(*rows)):
+                chunk.append(values_to_array(values, types.get(name)))
+        cur.close()
+
+        arrays = OrderedDict()
+        for chunk, name in zip(chunks, names):
+            if chunk:
+                arrays[name] = np.concatenate(chunk)
+            else:
+                arrays[name] = np.array([], dtype=get_numpy_type(types.get(name)))
+        if not structured:
+            return arrays
+
+        nrows = len(arrays[names[0]]) if names else 0
+        result = np.empty(nrows, dtype=[(str(name), arr.dtype)
+                                        for name, arr in arrays.items()])
+        for name, arr in arrays.items():
+            result[str(name)] = arr
+        return result
+
+    def buffered_writer(self, batch_size=None):
+        """Return the buffered writer of the table, the writer is created
+        if it does not exist yet. The buffered rows are written before
+        any other statement is executed by the Table methods.
+
+        :param batch_size: the number of rows written at once, None to
+                           keep the current value
+        :type batch_size: int
+
+        >>> import sqlite3
+        >>> tab = Table(name='buffered_doctest',
+        ...             connection=sqlite3.connect(':memory:'))
+        >>> tab.create([('cat', 'INTEGER PRIMARY KEY'), ('name', 'TEXT')])
+        >>> writer = tab.buffered_writer(batch_size=100)
+        >>> for cat in range(1, 11):
+        ...     writer.insert((cat, 'feature %d' % cat))
+        >>> len(writer)
+        10
+        >>> tab.n_rows()
+        10
+        >>> len(writer)
+        0
+
+        """
+        if self.writer is None:
+            self.writer = TableWriter(self, batch_size or WRITER_BATCH_SIZE)
+        elif batch_size:
+            self.writer.batch_size = batch_size
+        return self.writer
+
+    def flush(self):
+        """Write the rows buffered by the writer of the table"""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def commit(self):
+        """Write the buffered rows and commit the changes"""
+        self.flush()
+        self.conn.commit()
+
     def create(self, cols, name=None, overwrite=False, cursor=None):
         """Create a new table
 
@@ -206,5 +206,59 @@ class TableUpdateTestCase(DBconnection, TestCase):
         self.assertTupleEqual(vals, cur.fetchone())
 
 
+class TableToNumpyTestCase(DBconnection, TestCase):
+
+    def test_to_numpy(self):
+        """Test Table.to_numpy method"""
+        sqlquery = "SELECT cat, cint, creal, ctxt FROM %s"
+        cur = self.connection.cursor()
+        cur.execute(sqlquery % self.tname)
+        vals = cur.fetchall()
+        arr = self.table.to_numpy(chunk_size=3)
+        self.assertEqual(arr.dtype.names, ('cat', 'cint', 'creal', 'ctxt'))
+        self.assertListEqual([tuple(row) for row in arr.tolist()], vals)
+
+    def test_to_numpy_dict(self):
+        """Test Table.to_numpy method returning a dictionary"""
+        cols = self.table.to_numpy(columns=['cat', 'creal'], where='cat > 5',
+                                   structured=False)
+        self.assertListEqual(list(cols.keys()), ['cat', 'creal'])
+        self.assertListEqual(cols['cat'].tolist(), [6, 7, 8, 9, 10])
+        self.assertEqual(cols['creal'].dtype, np.float64)
+
+
+class TableWriterTestCase(DBconnection, TestCase):
+
+    def setUp(self):
+        """Create an empty table instance"""
+        self.table = self.create_empty_table()
+        self.cols = self.table.columns
+
+    def test_batches(self):
+        """Test TableWriter writes the rows in batches"""
+        vals = [(cat, cat * 10, cat / 10., 'test%d' % cat)
+                for cat in range(1, 8)]
+        writer = self.table.buffered_writer(batch_size=3)
+        for row in vals:
+            writer.insert(row)
+        self.assertEqual(len(writer), 1)
+        writer.update(1, (1111, 0.1111, 'test'))
+        writer.commit()
+        self.assertEqual(len(writer), 0)
+        vals[0] = (1, 1111, 0.1111, 'test')
+        sqlquery = "SELECT cat, cint, creal, ctxt FROM %s ORDER BY cat"
+        cur = self.connection.cursor()
+        cur.execute(sqlquery % self.tname)
+        self.assertListEqual(vals, cur.fetchall())
+
+    def test_flush_before_read(self):
+        """Test the buffered rows are written before reading the table"""
+        writer = self.table.buffered_writer()
+        writer.insert((1, 1111, 0.1111, 'test'))
+        self.assertEqual(len(writer), 1)
+        self.assertEqual(self.table.n_rows(), 1)
+        self.assertEqual(len(writer), 0)
+
+
 if __name__ == '__main__':
     test()
@@ -103,6 +103,19 @@ Usage:
 ... map3d_2.write(mapname="map3d_2", overwrite=True)
 0
 
+2D arrays can also be read and written natively through the raster
+library, without running r.out.bin/r.in.bin and without the
+intermediate binary file:
+
+>>> map2d_3 = garray.array(mapname="map2d_1", native=True)
+>>> print(map2d_3)
+[[ 0.  1.  2.  3.  4.  5.]
+ [ 1.  2.  3.  4.  5.  6.]
+ [ 2.  3.  4.  5.  6.  7.]
+ [ 3.  4.  5.  6.  7.  8.]]
+>>> map2d_3.write(mapname="map2d_3", overwrite=True, native=True)
+0
+
 (C) 2010-2012 by Glynn Clements and the GRASS Development Team
 This program is free software under the GNU General Public
 License (>=v2). Read the file COPYING that comes with GRASS
@@ -132,12 +145,144 @@ class _tempfile(object):
 
 ###############################################################################
 
+# Value used for the CELL nulls by the raster library (INT_MIN)
+_CELL_NULL = -2147483648
+
+
+def _native_mtype(dtype):
+    """Return the raster type used to read/write an array natively
+
+    :param dtype: numpy data type of the array
+    """
+    dtype = numpy.dtype(dtype)
+    kind = dtype.kind
+    size = dtype.itemsize
+
+    if kind == 'f':
+        return 'FCELL' if size <= 4 else 'DCELL'
+    elif kind in 'biu':
+        if size not in [1, 2, 4, 8]:
+            raise ValueError(_('Invalid integer size <%d>') % size)
+        return 'CELL'
+    else:
+        raise ValueError(_('Invalid kind <%s>') % kind)
+
+
+def _null_mask(row, mtype):
+    """Return a boolean array with the null cells of a raster row"""
+    if mtype == 'CELL':
+        return row == _CELL_NULL
+    return numpy.isnan(row)
+
+
+def _native_read(arr, mapname, null=None):
+    """Fill a 2D array row by row using the raster library
+
+    Rows are decoded with Rast_get_row directly into the memory of the
+    array when its data type matches the raster type, otherwise a single
+    row buffer is reused and cast into the array.
+
+    :param arr: the 2D array to fill
+    :param str mapname: name of raster map to be read
+    :param null: null value (default: 0, as r.out.bin)
+    """
+    from grass.pygrass.raster import RasterRow
+    from grass.pygrass.raster.buffer import Buffer
+    from grass.pygrass.raster.raster_type import TYPE as RTYPE
+    import grass.lib.raster as libraster
+
+    mtype = _native_mtype(arr.dtype)
+    gtype = RTYPE[mtype]['grass type']
+    null = 0 if null is None else null
+    zerocopy = arr.dtype == numpy.dtype(RTYPE[mtype]['numpy'])
+
+    with RasterRow(mapname, mode='r') as rast:
+        rows, cols = arr.shape
+        if (len(rast), rast._cols) != (rows, cols):
+            raise ValueError(_("Region and array are different: %r != %r")
+                             % ((len(rast), rast._cols), arr.shape))
+        if not zerocopy:
+            row_buffer = Buffer((cols,), mtype)
+        for row in range(rows):
+            if zerocopy:
+                row_buffer = Buffer((cols,), mtype, buffer=arr,
+                                    offset=row * arr.strides[0])
+            # the raster library converts the row to the type of the array
+            libraster.Rast_get_row(rast._fd, row_buffer.p, row, gtype)
+            # mask a plain ndarray, Buffer.__array_wrap__ would convert
+            # the boolean mask into an integer index array
+            view = numpy.asarray(row_buffer)
+            view[_null_mask(view, mtype)] = null
+            if not zerocopy:
+                arr[row] = row_buffer
+
+
+def _native_write(arr, mapname, title=None, null=None, overwrite=None):
+    """Write a 2D array row by row using the raster library
+
+    :param arr: the 2D array to write
+    :param str mapname: name for raster map
+    :param str title: title for raster map
+    :param null: value of the array to be written as null
+    :param bool overwrite: True for overwritting existing raster maps
+
+    :return: 0 on success
+    :return: non-zero code on failure
+    """
+    from grass.pygrass.raster import RasterRow
+    from grass.pygrass.raster.buffer import Buffer
+    from grass.pygrass.raster.raster_type import TYPE as RTYPE
+    from grass.pygrass.errors import OpenError
+    import grass.lib.raster as libraster
+
+    mtype = _native_mtype(arr.dtype)
+    zerocopy = (null is None and
+                arr.dtype == numpy.dtype(RTYPE[mtype]['numpy']))
+    if overwrite is None:
+        overwrite = gcore.overwrite()
+
+    rows, cols = arr.shape
+    rast = RasterRow(mapname)
+    try:
+        rast.open('w', mtype=mtype, overwrite=bool(overwrite))
+    except OpenError as e:
+        gcore.warning(str(e))
+        return 1
+    try:
+        if len(rast) != rows or rast._cols != cols:
+            gcore.warning(_("Region and array are different: %r != %r")
+                          % ((len(rast), rast._cols), arr.shape))
+            return 1
+        if not zerocopy:
+            row_buffer = Buffer((cols,), mtype)
+        for row in range(rows):
+            if zerocopy:
+                row_buffer = Buffer((cols,), mtype, buffer=arr,
+                                    offset=row * arr.strides[0])
+            else:
+                row_buffer[:] = arr[row]
+                if null is not None:
+                    row_buffer[arr[row] == null] = (_CELL_NULL
+                                                    if mtype == 'CELL'
+                                                    else numpy.nan)
+            rast.put_row(row_buffer)
+    finally:
+        rast.close()
+    if title:
+        libraster.Rast_put_cell_title(mapname, title)
+    return 0
+
+###############################################################################
+
 class array(numpy.memmap):
-    def __new__(cls, mapname=None, null=None, dtype=numpy.double):
+    def __new__(cls, mapname=None, null=None, dtype=numpy.double,
+                native=False):
         """Define new numpy array
 
         :param cls:
         :param dtype: data type (default: numpy.double)
+        :param bool native: if True read the raster map directly through
+                            the raster library instead of using r.out.bin
         """
         reg = gcore.region()
         r = reg['rows']
@@ -145,7 +290,7 @@ class array(numpy.memmap):
         shape = (r, c)
 
         tempfile = _tempfile()
-        if mapname:
+        if mapname and not native:
             kind = numpy.dtype(dtype).kind
             size = numpy.dtype(dtype).itemsize
 
@@ -178,6 +323,8 @@ class array(numpy.memmap):
 
         self.tempfile = tempfile
         self.filename = tempfile.filename
+        if mapname and native:
+            _native_read(self, mapname, null)
         return self
 
     def read(self, mapname, null=None):
@@ -224,17 +371,23 @@ class array(numpy.memmap):
         else:
             return 0
 
-    def write(self, mapname, title=None, null=None, overwrite=None):
+    def write(self, mapname, title=None, null=None, overwrite=None,
+              native=False):
         """Write array into raster map
 
         :param str mapname: name for raster map
         :param str title: title for raster map
         :param null: null value
         :param bool overwrite: True for overwritting existing raster maps
+        :param bool native: if True write the raster map directly through
+                            the raster library instead of using r.in.bin
 
         :return: 0 on success
         :return: non-zero code on failure
         """
+        if native:
+            return _native_write(self, mapname, title, null, overwrite)
+
         kind = self.dtype.kind
         size = self.dtype.itemsize
 
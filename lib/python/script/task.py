@@ -20,6 +20,8 @@ for details.
 import re
 import types
 import string
+import hashlib
+from collections import OrderedDict
 try:
     import xml.etree.ElementTree as etree
 except ImportError:
@@ -458,6 +460,82 @@ def convert_xml_to_utf8(xml_text):
     return xml_text_utf8
 
 
+# Maximum number of interface descriptions kept in memory
+INTERFACE_CACHE_SIZE = 256
+_interface_cache = OrderedDict()
+
+
+def _interface_cache_dir():
+    """Return the directory of the on-disk cache of the interface
+    descriptions in the user config directory (None if not available)"""
+    if sys.platform == 'win32':
+        config_dir = os.path.join(os.getenv('APPDATA', ''), 'GRASS7')
+    else:
+        config_dir = os.path.join(os.getenv('HOME', ''), '.grass7')
+    if not os.path.isdir(config_dir):
+        return None
+    return os.path.join(config_dir, 'interface_cache')
+
+
+def _interface_cache_key(cmd):
+    """Return the cache key of the interface description of a command.
+
+    The key depends on the path and the modification time of the module
+    executable, on the GRASS version and on the language used for the
+    messages. Return None if the module executable is not found.
+
+    :param cmd: command (name of GRASS module)
+    """
+    path = shutil_which(cmd)
+    if path is None and sys.platform == 'win32':
+        path = shutil_which(get_real_command(cmd))
+    if path is None:
+        return None
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    key = '\0'.join([os.path.abspath(path), repr(mtime),
+                      os.getenv('GRASS_VERSION', ''),
+                      os.getenv('LC_ALL', ''), os.getenv('LC_MESSAGES', ''),
+                      os.getenv('LANGUAGE', ''), os.getenv('LANG', '')])
+    if not isinstance(key, bytes):
+        key = key.encode('utf-8')
+    return hashlib.md5(key).hexdigest()
+
+
+def _read_interface_cache(key):
+    """Read an interface description from the on-disk cache"""
+    cache_dir = _interface_cache_dir()
+    if not cache_dir:
+        return None
+    try:
+        with open(os.path.join(cache_dir, key + '.xml'), 'rb') as xml:
+            return xml.read()
+    except IOError:
+        return None
+
+
+def _write_interface_cache(key, desc):
+    """Write an interface description in the on-disk cache, the file is
+    renamed at the end to not leave partial files to concurrent processes"""
+    cache_dir = _interface_cache_dir()
+    if not cache_dir:
+        return
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        filename = os.path.join(cache_dir, key + '.xml')
+        tmpname = '%s.%d.tmp' % (filename, os.getpid())
+        with open(tmpname, 'wb') as xml:
+            xml.write(desc)
+        if sys.platform == 'win32' and os.path.exists(filename):
+            os.remove(filename)
+        os.rename(tmpname, filename)
+    except (IOError, OSError):
+        pass
+
+
 def get_interface_description(cmd):
     """Returns the XML description for the GRASS cmd (force text encoding to
     "utf-8").
@@ -465,6 +543,39 @@ def get_interface_description(cmd):
     The DTD must be located in $GISBASE/gui/xml/grass-interface.dtd,
     otherwise the parser will not succeed.
 
+    The descriptions are cached in memory and on disk in the user config
+    directory, the module is run with ``--interface-description`` only
+    if its executable, the GRASS version or the language changed.
+    Set the GRASS_INTERFACE_CACHE environmental variable to 0 to disable
+    the cache.
+
+    :param cmd: command (name of GRASS module)
+    """
+    if os.getenv('GRASS_INTERFACE_CACHE') == '0':
+        return _get_interface_description(cmd)
+
+    key = _interface_cache_key(cmd)
+    if key is None:
+        return _get_interface_description(cmd)
+
+    if key in _interface_cache:
+        desc = _interface_cache.pop(key)
+    else:
+        desc = _read_interface_cache(key)
+        if desc is None:
+            desc = _get_interface_description(cmd)
+            _write_interface_cache(key, desc)
+    # the last used description is moved at the end of the LRU cache
+    _interface_cache[key] = desc
+    while len(_interface_cache) > INTERFACE_CACHE_SIZE:
+        _interface_cache.popitem(last=False)
+    return desc
+
+
+def _get_interface_description(cmd):
+    """Run the GRASS cmd to get its XML description, see
+    get_interface_description()
+
     :param cmd: command (name of GRASS module)
     """
     try:
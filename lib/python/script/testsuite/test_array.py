@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Test the native raster access of grass.script.array"""
+
+import numpy
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+from grass.script import array as garray
+
+
+class TestArrayNative(TestCase):
+    """Compare the native access with the r.out.bin/r.in.bin access"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.use_temp_region()
+        cls.runModule("g.region", n=40, s=0, e=60, w=0, res=10)
+        cls.runModule("r.mapcalc", overwrite=True,
+                      expression="test_array_a = if(row() == 2, null(),"
+                                 " row() + col() / 10.)")
+        cls.runModule("r.mapcalc", overwrite=True,
+                      expression="test_array_c = if(col() == 4, null(),"
+                                 " row() * 10 + col())")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.runModule("g.remove", flags='f', type='raster',
+                      name=['test_array_a', 'test_array_b',
+                            'test_array_c'])
+        cls.del_temp_region()
+
+    def test_read(self):
+        bin_arr = garray.array(mapname="test_array_a")
+        native_arr = garray.array(mapname="test_array_a", native=True)
+        self.assertTrue(numpy.array_equal(bin_arr, native_arr))
+
+    def test_read_null(self):
+        native_arr = garray.array(mapname="test_array_a", null=-1,
+                                  native=True)
+        self.assertTrue((native_arr[1] == -1).all())
+
+    def test_read_null_column(self):
+        for dtype in [numpy.double, numpy.int32]:
+            native_arr = garray.array(mapname="test_array_c", null=-1,
+                                      dtype=dtype, native=True)
+            rows = numpy.arange(1, 5) * 10
+            self.assertTrue((native_arr[:, 3] == -1).all())
+            self.assertTrue((native_arr[:, 0] == rows + 1).all())
+            self.assertTrue((native_arr[:, 1] == rows + 2).all())
+            self.assertFalse((native_arr[:, [0, 1, 2, 4, 5]] == -1).any())
+
+    def test_read_int(self):
+        bin_arr = garray.array(mapname="test_array_a", dtype=numpy.int16)
+        native_arr = garray.array(mapname="test_array_a", dtype=numpy.int16,
+                                  native=True)
+        self.assertTrue(numpy.array_equal(bin_arr, native_arr))
+
+    def test_write(self):
+        arr = garray.array(mapname="test_array_a", null=-1, native=True)
+        self.assertEqual(arr.write(mapname="test_array_b", null=-1,
+                                   overwrite=True, native=True), 0)
+        self.assertRastersNoDifference(actual="test_array_b",
+                                       reference="test_array_a",
+                                       precision=0)
+
+
+if __name__ == '__main__':
+    test()
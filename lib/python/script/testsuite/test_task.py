@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Test the cache of the module interface descriptions"""
+
+import os
+
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+from grass.script import task as gtask
+
+
+class TestInterfaceCache(TestCase):
+    """Test the cached interface descriptions"""
+
+    def test_cached_description(self):
+        desc = gtask.get_interface_description('r.info')
+        key = gtask._interface_cache_key('r.info')
+        self.assertIn(key, gtask._interface_cache)
+        self.assertEqual(desc, gtask.get_interface_description('r.info'))
+        os.environ['GRASS_INTERFACE_CACHE'] = '0'
+        try:
+            self.assertEqual(desc, gtask.get_interface_description('r.info'))
+        finally:
+            del os.environ['GRASS_INTERFACE_CACHE']
+
+    def test_parse_interface(self):
+        task = gtask.parse_interface('r.info')
+        self.assertEqual(task.get_name(), 'r.info')
+        self.assertEqual(task.get_param('map')['name'], 'map')
+
+    def test_lru_size(self):
+        size = gtask.INTERFACE_CACHE_SIZE
+        gtask.INTERFACE_CACHE_SIZE = 1
+        try:
+            gtask.get_interface_description('r.info')
+            gtask.get_interface_description('g.region')
+            self.assertEqual(len(gtask._interface_cache), 1)
+        finally:
+            gtask.INTERFACE_CACHE_SIZE = size
+
+
+if __name__ == '__main__':
+    test()
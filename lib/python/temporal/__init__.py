@@ -4,6 +4,7 @@ from spatial_extent import *
 from metadata import *
 from abstract_dataset import *
 from abstract_map_dataset import *
+from registered_map_array import *
 from abstract_space_time_dataset import *
 from space_time_datasets import *
 from datetime_math import *
@@ -19,6 +20,7 @@ from stds_export import *
 from stds_import import *
 from mapcalc import *
 from univar_statistics import *
+from pixel_timeseries import *
 from c_libraries_interface import *
 from spatio_temporal_relationships import *
 from spatial_topology_dataset_connector import *
@@ -373,13 +373,15 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
     def delete(self):
         """Delete dataset from database if it exists"""
 
-    def insert(self, dbif=None, execute=True):
+    def insert(self, dbif=None, execute=True, batch=None):
         """Insert dataset into database
 
            :param dbif: The database interface to be used
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are returned
                            and must be executed by the caller.
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
         """
@@ -391,6 +393,10 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
                               "mapset") % {"ds": self.get_id(),
                                            "type": self.get_type()})
 
+        if batch is not None:
+            batch.extend(self.get_insert_statements())
+            return ""
+
         dbif, connected = init_dbif(dbif)
 
         # Build the INSERT SQL statement
@@ -411,7 +417,57 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
             dbif.close()
         return statement
 
-    def update(self, dbif=None, execute=True, ident=None):
+    def get_insert_statements(self):
+        """Return the SQL insert statements of all tables of this dataset
+
+           In contrast to insert(execute=False) the statements are not
+           mogrified, so that the statements of many datasets can be
+           executed with executemany using a SQLStatementBatch.
+
+           :return: A list of (sql, args) tuples in database specific style
+        """
+        statements = [self.base.get_insert_statement(),
+                      self.temporal_extent.get_insert_statement(),
+                      self.spatial_extent.get_insert_statement(),
+                      self.metadata.get_insert_statement()]
+        if self.is_stds() is False:
+            statements.append(self.stds_register.get_insert_statement())
+
+        return statements
+
+    def get_update_statements(self, ident=None):
+        """Return the SQL update statements of all tables of this dataset
+           excluding None variables
+
+           :param ident: The identifier to be updated, useful for renaming
+           :return: A list of (sql, args) tuples in database specific style
+        """
+        statements = [self.base.get_update_statement(ident),
+                      self.temporal_extent.get_update_statement(ident),
+                      self.spatial_extent.get_update_statement(ident),
+                      self.metadata.get_update_statement(ident)]
+        if self.is_stds() is False:
+            statements.append(self.stds_register.get_update_statement(ident))
+
+        return statements
+
+    def get_update_all_statements(self, ident=None):
+        """Return the SQL update statements of all tables of this dataset
+           including None variables
+
+           :param ident: The identifier to be updated, useful for renaming
+           :return: A list of (sql, args) tuples in database specific style
+        """
+        statements = [self.base.get_update_all_statement(ident),
+                      self.temporal_extent.get_update_all_statement(ident),
+                      self.spatial_extent.get_update_all_statement(ident),
+                      self.metadata.get_update_all_statement(ident)]
+        if self.is_stds() is False:
+            statements.append(self.stds_register.get_update_all_statement(ident))
+
+        return statements
+
+    def update(self, dbif=None, execute=True, ident=None, batch=None):
         """Update the dataset entry in the database from the internal structure
            excluding None variables
 
@@ -420,6 +476,8 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
                            If False the prepared SQL statements are returned
                            and must be executed by the caller.
            :param ident: The identifier to be updated, useful for renaming
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL update statement in case execute=False, or an
                     empty string otherwise
         """
@@ -431,6 +489,10 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
                               "mapset") % {"ds": self.get_id(),
                                            "type": self.get_type()})
 
+        if batch is not None:
+            batch.extend(self.get_update_statements(ident))
+            return ""
+
         dbif, connected = init_dbif(dbif)
 
         # Build the UPDATE SQL statement
@@ -454,7 +516,7 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
             dbif.close()
         return statement
 
-    def update_all(self, dbif=None, execute=True, ident=None):
+    def update_all(self, dbif=None, execute=True, ident=None, batch=None):
         """Update the dataset entry in the database from the internal structure
            and include None variables.
 
@@ -463,6 +525,8 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
                            If False the prepared SQL statements are returned
                            and must be executed by the caller.
            :param ident: The identifier to be updated, useful for renaming
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL update statement in case execute=False, or an
                     empty string otherwise
         """
@@ -474,6 +538,10 @@ class AbstractDataset(SpatialTopologyDatasetConnector,
                               "mapset") % {"ds": self.get_id(),
                                            "type": self.get_type()})
 
+        if batch is not None:
+            batch.extend(self.get_update_all_statements(ident))
+            return ""
+
         dbif, connected = init_dbif(dbif)
 
         # Build the UPDATE SQL statement
@@ -667,6 +735,142 @@ class AbstractDatasetComparisonKeyEndTime(object):
 
 ###############################################################################
 
+
+def select_datasets(dataset, ids=None, where=None, mapset=None, dbif=None,
+                    chunk_size=500):
+    """Select datasets of the same type from the temporal database
+       with a single joined query
+
+       The base, absolute and relative time, spatial extent, metadata
+       and the stds register tables of the dataset type are joined like
+       in the <type>_view_abs_time and <type>_view_rel_time views, so
+       that all internal structures of a dataset are filled from a single
+       row. This replaces the separate queries of select() for each
+       dataset.
+
+       Example:
+
+       .. code-block:: python
+
+            map = RasterDataset(None)
+            maps = select_datasets(map, ids=["a@PERMANENT", "b@PERMANENT"])
+
+       :param dataset: A dataset object of the requested type, the selected
+                       datasets are created with its get_new_instance()
+                       method
+       :param ids: A list of dataset ids that should be selected
+       :param where: The SQL where statement without "WHERE" to select the
+                     datasets. The statement is evaluated in the view of
+                     the temporal type of the dataset object, or in both
+                     views in case its temporal type is not set.
+       :param mapset: The mapset of the temporal database in which the
+                      where statement is evaluated in case no ids are
+                      provided, the current mapset by default. The ids
+                      are always selected in the temporal database of
+                      their mapset.
+       :param dbif: The database interface to be used
+       :param chunk_size: The maximum number of ids in a single query
+       :return: The list of selected datasets, datasets that are not
+                registered in the temporal database are missing in the list
+    """
+    template = dataset.get_new_instance(None)
+    names = ["base", "absolute_time", "relative_time", "spatial_extent",
+             "metadata"]
+    if template.is_stds() is False:
+        names.append("stds_register")
+
+    keys = {}
+    columns = []
+    tables = ""
+    for index, name in enumerate(names):
+        keys[name] = list(getattr(template, name).D.keys())
+        columns.extend(["A%i.%s" % (index, key) for key in keys[name]])
+        table = getattr(template, name).get_table_name()
+        if index == 0:
+            tables = "%s A0" % table
+        elif name in ["absolute_time", "relative_time"]:
+            tables += " LEFT JOIN %s A%i ON A0.id = A%i.id" % (table, index,
+                                                               index)
+        else:
+            tables += " JOIN %s A%i ON A0.id = A%i.id" % (table, index, index)
+
+    sql = "SELECT %s FROM %s" % (",".join(columns), tables)
+
+    conditions = []
+    if where:
+        ttype = dataset.get_temporal_type()
+        if ttype == "absolute":
+            views = ["_view_abs_time"]
+        elif ttype == "relative":
+            views = ["_view_rel_time"]
+        else:
+            views = ["_view_abs_time", "_view_rel_time"]
+        conditions.append("A0.id IN (%s)" % " UNION ".join(
+            ["SELECT id FROM %s%s WHERE %s" % (template.get_type(), view,
+                                               where) for view in views]))
+
+    # The queries that must be executed for each mapset
+    queries = []
+    if ids:
+        mapset_ids = {}
+        for ident in ids:
+            mapset_ids.setdefault(ident.split("@")[-1], []).append(ident)
+        for id_mapset in mapset_ids:
+            for index in range(0, len(mapset_ids[id_mapset]), chunk_size):
+                queries.append((id_mapset, mapset_ids[id_mapset][
+                    index:index + chunk_size]))
+    else:
+        if mapset is None:
+            mapset = get_current_mapset()
+        queries.append((mapset, []))
+
+    dbif, connected = init_dbif(dbif)
+
+    datasets = []
+    for query_mapset, chunk in queries:
+        query_conditions = list(conditions)
+        if chunk:
+            if dbif.get_dbmi(query_mapset).paramstyle == "qmark":
+                place_holder = "?"
+            else:
+                place_holder = "%s"
+            query_conditions.append("A0.id IN (%s)" % ",".join(
+                [place_holder] * len(chunk)))
+
+        query_sql = sql
+        if query_conditions:
+            query_sql += " WHERE " + " AND ".join(query_conditions)
+
+        if chunk:
+            dbif.execute(query_sql, tuple(chunk), mapset=query_mapset)
+        else:
+            dbif.execute(query_sql, mapset=query_mapset)
+        rows = dbif.fetchall(mapset=query_mapset)
+
+        for row in rows:
+            values = {}
+            count = 0
+            for name in names:
+                values[name] = {}
+                for key in keys[name]:
+                    values[name][key] = row[count]
+                    count += 1
+
+            new_dataset = dataset.get_new_instance(values["base"]["id"])
+            for name in names:
+                # Only the time table of the temporal type has an entry
+                if values[name]["id"] is None:
+                    continue
+                getattr(new_dataset, name).deserialize(values[name])
+            datasets.append(new_dataset)
+
+    if connected:
+        dbif.close()
+
+    return datasets
+
+###############################################################################
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
@@ -91,6 +91,28 @@ class AbstractMapDataset(AbstractDataset):
            in the temporal database.
         """
 
+    def set_timestamp_from_grass(self, check, dates):
+        """Set the internal time stamp from a grass file based timestamp
+           that was read using the C-library interface
+
+           :param check: The return value of G_read_*_timestamp
+           :param dates: The timestamp tuple (start, end) in case of absolute
+                         time or (start, end, unit) in case of relative time
+           :return: True if success, False on error
+        """
+        if check < 1:
+            self.msgr.error(_("Unable to read timestamp file "
+                              "for %(t)s map <%(id)s>") % {
+                            't': self.get_type(), 'id': self.get_map_id()})
+            return False
+
+        if len(dates) == 2:
+            self.set_absolute_time(dates[0], dates[1])
+        else:
+            self.set_relative_time(dates[0], dates[1], dates[2])
+
+        return True
+
     @abstractmethod
     def remove_timestamp_from_grass(self):
         """Remove the timestamp from the grass file
@@ -109,6 +131,16 @@ class AbstractMapDataset(AbstractDataset):
         """Load the content of this object from the grass
            file system based database"""
 
+    @abstractmethod
+    def load_from_info(self, kvp):
+        """Load the content of this object from the map specific
+           metadata that was read from the grass file system based database
+
+           :param kvp: The key value pairs of the map specific metadata
+           :return: True if the metadata was filled successfully,
+                    False otherwise
+        """
+
     def _convert_timestamp(self):
         """Convert the valid time into a grass datetime library
            compatible timestamp string
@@ -252,7 +284,7 @@ class AbstractMapDataset(AbstractDataset):
         if self.is_topology_build():
             self.print_topology_shell_info()
 
-    def insert(self, dbif=None, execute=True):
+    def insert(self, dbif=None, execute=True, batch=None):
         """Insert the map content into the database from the internal
            structure
 
@@ -266,14 +298,17 @@ class AbstractMapDataset(AbstractDataset):
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
         """
         if get_enable_timestamp_write():
             self.write_timestamp_to_grass()
-        return AbstractDataset.insert(self, dbif=dbif, execute=execute)
+        return AbstractDataset.insert(self, dbif=dbif, execute=execute,
+                                      batch=batch)
 
-    def update(self, dbif=None, execute=True):
+    def update(self, dbif=None, execute=True, batch=None):
         """Update the map content in the database from the internal structure
            excluding None variables
 
@@ -285,14 +320,16 @@ class AbstractMapDataset(AbstractDataset):
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
         """
         if get_enable_timestamp_write():
             self.write_timestamp_to_grass()
-        return AbstractDataset.update(self, dbif, execute)
+        return AbstractDataset.update(self, dbif, execute, batch=batch)
 
-    def update_all(self, dbif=None, execute=True):
+    def update_all(self, dbif=None, execute=True, batch=None):
         """Update the map content in the database from the internal structure
            including None variables
 
@@ -304,13 +341,15 @@ class AbstractMapDataset(AbstractDataset):
            :param execute: If True the SQL statements will be executed.
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL insert statement in case execute=False, or an
                     empty string otherwise
 
         """
         if get_enable_timestamp_write():
             self.write_timestamp_to_grass()
-        return AbstractDataset.update_all(self, dbif, execute)
+        return AbstractDataset.update_all(self, dbif, execute, batch=batch)
 
     def set_time_to_absolute(self):
         """Set the temporal type to absolute"""
@@ -797,7 +836,7 @@ class AbstractMapDataset(AbstractDataset):
 
         return True
 
-    def delete(self, dbif=None, update=True, execute=True):
+    def delete(self, dbif=None, update=True, execute=True, batch=None):
         """Delete a map entry from database if it exists
 
             Remove dependent entries:
@@ -816,6 +855,8 @@ class AbstractMapDataset(AbstractDataset):
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
 
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL statements if execute=False, else an empty string,
                     None in case of a failure
         """
@@ -836,16 +877,19 @@ class AbstractMapDataset(AbstractDataset):
 
             # First we unregister from all dependent space time datasets
             statement += self.unregister(
-                dbif=dbif, update=update, execute=False)
+                dbif=dbif, update=update, execute=False, batch=batch)
 
             self.msgr.verbose(_("Delete %s dataset <%s> from temporal "
                                 "database") % (self.get_type(), self.get_id()))
 
             # Delete yourself from the database, trigger functions will
             # take care of dependencies
-            statement += self.base.get_delete_statement()
+            if batch is not None:
+                batch.add((self.base.get_delete_statement(), ()))
+            else:
+                statement += self.base.get_delete_statement()
 
-        if execute:
+        if execute and batch is None:
             dbif.execute_transaction(statement)
             statement = ""
 
@@ -859,7 +903,7 @@ class AbstractMapDataset(AbstractDataset):
 
         return statement
 
-    def unregister(self, dbif=None, update=True, execute=True):
+    def unregister(self, dbif=None, update=True, execute=True, batch=None):
         """ Remove the map entry in each space time dataset in which this map
            is registered
 
@@ -872,6 +916,8 @@ class AbstractMapDataset(AbstractDataset):
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
 
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
            :return: The SQL statements if execute=False, else an empty string
         """
 
@@ -907,13 +953,14 @@ class AbstractMapDataset(AbstractDataset):
                     # from its register
                     stds = self.get_new_stds_instance(dataset)
                     stds.metadata.select(dbif)
-                    statement += stds.unregister_map(self, dbif, False)
+                    statement += stds.unregister_map(self, dbif, False,
+                                                     batch=batch)
                     # Take care to update the space time dataset after
                     # the map has been unregistered
-                    if update is True and execute is True:
+                    if update is True and execute is True and batch is None:
                         stds.update_from_registered_maps(dbif)
 
-        if execute:
+        if execute and batch is None:
             dbif.execute_transaction(statement)
             statement = ""
 
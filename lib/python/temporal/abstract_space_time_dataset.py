@@ -12,9 +12,11 @@ for details.
 """
 import sys
 import uuid
+import numpy
 from abstract_dataset import *
 from temporal_granularity import *
 from spatio_temporal_relationships import *
+from registered_map_array import *
 
 ###############################################################################
 
@@ -40,6 +42,12 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         AbstractDataset.__init__(self)
         self.reset(ident)
         self.map_counter = 0
+        # The earliest start time of the maps registered since the last
+        # update, used to update the granularity incrementally. The
+        # incremental update is not possible if maps were unregistered
+        # or the time stamps of registered maps were modified.
+        self._registered_start_time = None
+        self._has_modified_maps = False
 
     def create_map_register_name(self):
         """Create the name of the map register table of this space time
@@ -392,18 +400,28 @@ class AbstractSpaceTimeDataset(AbstractDataset):
            - invalid  -> No valid time point or interval found
 
            :param maps: A sorted (start_time) list of AbstractDataset objects
+                        or a RegisteredMapArray
            :param dbif: The database interface to be used
         """
 
         if maps is None:
-            maps = get_registered_maps_as_objects(
+            maps = self.get_registered_maps_as_array(
                 where=None, order="start_time", dbif=dbif)
 
+        tcount = {}
+        if isinstance(maps, RegisteredMapArray):
+            has_start = ~numpy.ma.getmaskarray(maps.start_time)
+            has_end = ~numpy.ma.getmaskarray(maps.end_time)
+            tcount["point"] = int(numpy.sum(has_start & ~has_end))
+            tcount["interval"] = int(numpy.sum(has_start & has_end))
+            tcount["invalid"] = len(maps) - tcount["point"] - \
+                tcount["interval"]
+            return tcount
+
         time_invalid = 0
         time_point = 0
         time_interval = 0
 
-        tcount = {}
         for i in range(len(maps)):
             # Check for point and interval data
             if maps[i].is_time_absolute():
@@ -943,18 +961,22 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         sample_maps = stds.get_registered_maps_as_objects_with_gaps(
             where=None, dbif=dbif)
 
+        # Select the registered maps once and sample them in memory
+        registered_maps = self.get_registered_maps_as_array(
+            None, "start_time", dbif)
+
         for granule in sample_maps:
             # Read the spatial extent
             if spatial:
                 granule.spatial_extent.select(dbif)
             start, end = granule.get_temporal_extent_as_tuple()
 
-            where = create_temporal_relation_sql_where_statement(
-                    start, end, use_start, use_during, use_overlap,
-                    use_contain, use_equal, use_follows, use_precedes)
-
-            maps = self.get_registered_maps_as_objects(
-                where, "start_time", dbif)
+            maps = None
+            if registered_maps is not None:
+                maps = registered_maps.take(
+                    registered_maps.temporal_relation_mask(
+                        start, end, use_start, use_during, use_overlap,
+                        use_contain, use_equal, use_follows, use_precedes))
 
             result = {}
             result["granule"] = granule
@@ -1386,55 +1408,81 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         dbif, connected = init_dbif(dbif)
 
-        obj_list = []
+        obj_list = None
 
-        # Older temporal databases have no bottom and top columns
-        # in their views so we need a work around to set the full
-        # spatial extent as well
+        maps = self.get_registered_maps_as_array(where, order, dbif)
 
-        rows = get_tgis_metadata(dbif)
-        db_version = 0
+        if maps is not None:
+            obj_list = maps.to_list()
+            # The slow work around for older temporal databases
+            if not self._has_bottom_top_columns(dbif):
+                for map in obj_list:
+                    map.spatial_extent.select(dbif)
 
-        if rows:
-            for row in rows:
-                if row["key"] == "tgis_db_version":
-                    db_version = int(float(row["value"]))
+        if connected:
+            dbif.close()
+
+        return obj_list
+
+    def get_registered_maps_as_array(self, where=None, order="start_time",
+                                     dbif=None):
+        """Return all or a subset of the registered maps as compact
+           RegisteredMapArray
+
+           The ids, the start and end times and the spatial extents (west,
+           east, south, north, bottom and top) of the maps are stored in
+           numpy arrays, the map objects are created only on access. Use this
+           method instead of get_registered_maps_as_objects() for space time
+           datasets with a large number of maps.
 
-        if db_version >= 1:
-            has_bt_columns = True
+           :param where: The SQL where statement to select a subset of
+                         the registered maps without "WHERE"
+           :param order: The SQL order statement to be used to order the
+                         maps without "ORDER BY"
+           :param dbif: The database interface to be used
+           :return: The ordered RegisteredMapArray,
+                   In case nothing found None is returned
+        """
+
+        dbif, connected = init_dbif(dbif)
+
+        maps = None
+
+        # Older temporal databases have no bottom and top columns
+        # in their views
+        if self._has_bottom_top_columns(dbif):
             columns = "id,start_time,end_time, west,east,south,north,bottom,top"
         else:
-            has_bt_columns = False
             columns = "id,start_time,end_time, west,east,south,north"
 
         rows = self.get_registered_maps(columns, where, order, dbif)
 
         if rows is not None:
-            for row in rows:
-                map = self.get_new_map_instance(row["id"])
-                if self.is_time_absolute():
-                    map.set_absolute_time(row["start_time"], row["end_time"])
-                elif self.is_time_relative():
-                    map.set_relative_time(row["start_time"], row["end_time"],
-                                          self.get_relative_time_unit())
-                # The fast way
-                if has_bt_columns:
-                    map.set_spatial_extent_from_values(west=row["west"],
-                                                       east=row["east"],
-                                                       south=row["south"],
-                                                       top=row["top"],
-                                                       north=row["north"],
-                                                       bottom=row["bottom"])
-                # The slow work around
-                else:
-                    map.spatial_extent.select(dbif)
-
-                obj_list.append(copy.copy(map))
+            maps = RegisteredMapArray.from_rows(
+                rows, self.get_new_map_instance, self.get_temporal_type(),
+                self.get_relative_time_unit())
 
         if connected:
             dbif.close()
 
-        return obj_list
+        return maps
+
+    def _has_bottom_top_columns(self, dbif):
+        """Check if the map views of the temporal database have bottom
+           and top columns, which is the case since version 1
+
+           :param dbif: The database interface to be used
+           :return: True if bottom and top columns are available
+        """
+        rows = get_tgis_metadata(dbif)
+        db_version = 0
+
+        if rows:
+            for row in rows:
+                if row["key"] == "tgis_db_version":
+                    db_version = int(float(row["value"]))
+
+        return db_version >= 1
 
     def get_registered_maps(self, columns=None, where=None, order=None,
                             dbif=None):
@@ -1821,12 +1869,20 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         """
 
         datatsets_to_modify = {}
+        # Select all maps with a single query for each chunk of maps
+        selected_maps = {}
+        if maps:
+            for map in select_datasets(maps[0], ids=[map.get_id()
+                                                     for map in maps],
+                                       dbif=dbif):
+                selected_maps[map.get_id()] = map
+
         # Now update the maps
         count = 0
         for map in maps:
             start = date_list[count][0]
             end = date_list[count][1]
-            map.select(dbif)
+            map = selected_maps[map.get_id()]
             count += 1
 
             if self.is_time_absolute():
@@ -1843,6 +1899,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
                 for dataset in datasets:
                     datatsets_to_modify[dataset] = dataset
 
+        self._has_modified_maps = True
         self.update_from_registered_maps(dbif)
 
         # Update affected datasets
@@ -2144,6 +2201,8 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         # Check if map is already registered
         if self.is_map_registered(map_id, dbif=dbif):
+            # The time stamps of the map may have been overwritten
+            self._has_modified_maps = True
             if map.get_layer() is not None:
                 self.msgr.warning(_("Map <%(map)s> with layer %(l)s is already"
                                     " registered.") % {'map': map.get_map_id(),
@@ -2176,9 +2235,14 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         # increase the counter
         self.map_counter += 1
 
+        start_time = map.get_temporal_extent_as_tuple()[0]
+        if self._registered_start_time is None or \
+           start_time < self._registered_start_time:
+            self._registered_start_time = start_time
+
         return True
 
-    def unregister_map(self, map, dbif=None, execute=True):
+    def unregister_map(self, map, dbif=None, execute=True, batch=None):
         """Unregister a map from the space time dataset.
 
            This method takes care of the un-registration of a map
@@ -2190,6 +2254,8 @@ class AbstractSpaceTimeDataset(AbstractDataset):
                            statements will be executed.
                            If False the prepared SQL statements are
                            returned and must be executed by the caller.
+           :param batch: A SQLStatementBatch to which the SQL statements are
+                         added instead of executing or returning them
 
            :return: The SQL statements if execute == False, else an empty
                    string, None in case of a failure
@@ -2239,9 +2305,12 @@ class AbstractSpaceTimeDataset(AbstractDataset):
                 sql = "DELETE FROM " + \
                     stds_register_table + " WHERE id = %s;\n"
 
-            statement += dbif.mogrify_sql_statement((sql, (map.get_id(), )))
+            if batch is not None:
+                batch.add((sql, (map.get_id(), )))
+            else:
+                statement += dbif.mogrify_sql_statement((sql, (map.get_id(), )))
 
-        if execute:
+        if execute and batch is None:
             dbif.execute_transaction(statement)
             statement = ""
 
@@ -2250,6 +2319,7 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         # decrease the counter
         self.map_counter -= 1
+        self._has_modified_maps = True
 
         return statement
 
@@ -2266,6 +2336,12 @@ class AbstractSpaceTimeDataset(AbstractDataset):
            will be used. If the end time is earlier than the maximum start
            time, it will be replaced by the maximum start time.
 
+           The map time and the granularity are stored in the temporal
+           database. In case maps were only registered after the end time
+           of the space time dataset with register_map() since the last
+           update, they are updated with the new maps only. Otherwise they
+           are computed from all registered maps.
+
            :param dbif: The database interface to be used
         """
 
@@ -2290,6 +2366,9 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
         use_start_time = False
 
+        # Must be called before the extent and the metadata are updated
+        previous = self._get_previous_temporal_state(dbif)
+
         # Get basic info
         stds_name = self.base.get_name()
         stds_mapset = self.base.get_mapset()
@@ -2410,9 +2489,26 @@ class AbstractSpaceTimeDataset(AbstractDataset):
 
             dbif.execute_transaction(sql)
 
+        maps = None
+        if previous is not None:
+            # Only the maps from the previous end time on are needed
+            end_time, previous_map_time, previous_gran = previous
+            if self.is_time_absolute():
+                where = "start_time >= '%s'" % (end_time)
+            else:
+                where = "start_time >= %i" % (end_time)
+            maps = self.get_registered_maps_as_array(where=where, dbif=dbif)
+        if maps is None:
+            previous = None
+            maps = self.get_registered_maps_as_array(dbif=dbif)
+
         # Count the temporal map types
-        maps = self.get_registered_maps_as_objects(dbif=dbif)
         tlist = self.count_temporal_types(maps)
+        if previous is not None:
+            if previous_map_time in ["interval", "mixed"]:
+                tlist["interval"] += 1
+            if previous_map_time in ["point", "mixed"]:
+                tlist["point"] += 1
 
         if tlist["interval"] > 0 and tlist["point"] == 0 and \
            tlist["invalid"] == 0:
@@ -2431,9 +2527,20 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         if map_time != "invalid":
             # Smallest supported temporal resolution
             if self.is_time_absolute():
-                gran = compute_absolute_time_granularity(maps)
+                gran = None
+                if previous is not None:
+                    gran = compute_absolute_time_granularity_from_array(
+                        maps, previous_gran, end_time)
+                    if gran is None:
+                        maps = self.get_registered_maps_as_array(dbif=dbif)
+                if gran is None:
+                    gran = compute_absolute_time_granularity(maps)
             elif self.is_time_relative():
-                gran = compute_relative_time_granularity(maps)
+                if previous is not None:
+                    gran = compute_relative_time_granularity_from_array(
+                        maps, previous_gran, end_time)
+                else:
+                    gran = compute_relative_time_granularity(maps)
         else:
             gran = None
 
@@ -2452,9 +2559,44 @@ class AbstractSpaceTimeDataset(AbstractDataset):
         self.base.set_mtime(datetime.now())
         self.base.update(dbif)
 
+        self._registered_start_time = None
+        self._has_modified_maps = False
+
         if connected:
             dbif.close()
 
+    def _get_previous_temporal_state(self, dbif):
+        """Return the end time, the map time and the granularity of the
+           space time dataset as stored in the temporal database, in case
+           the granularity can be updated with the maps registered since
+           the last update
+
+           This is the case if maps were only registered, no registered
+           map was modified and all new maps start at or after the stored
+           end time.
+
+           :param dbif: The database interface to be used
+           :return: A tuple (end_time, map_time, granularity) or None
+        """
+        if self._has_modified_maps or \
+           self._registered_start_time is None:
+            return None
+
+        self.temporal_extent.select(dbif)
+        self.metadata.select(dbif)
+
+        end_time = self.get_temporal_extent_as_tuple()[1]
+        map_time = self.get_map_time()
+        gran = self.get_granularity()
+
+        if not self.metadata.get_number_of_maps() or end_time is None or \
+           gran is None or map_time not in ["interval", "point", "mixed"]:
+            return None
+        if self._registered_start_time < end_time:
+            return None
+
+        return end_time, map_time, gran
+
 ###############################################################################
 
 if __name__ == "__main__":
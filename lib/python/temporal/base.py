@@ -228,11 +228,11 @@ class SQLDatabaseInterface(DictSQLSerializer):
             >>> t.get_insert_statement_mogrified()
             "INSERT INTO raster ( creation_time  ,mapset  ,name  ,creator ) VALUES ('2001-01-01 00:00:00' ,'PERMANENT' ,'soil' ,'soeren') ;\\n"
             >>> t.get_update_statement()
-            ("UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = 'soil@PERMANENT';\\n", (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren'))
+            ('UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = ?;\\n', (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren', 'soil@PERMANENT'))
             >>> t.get_update_statement_mogrified()
             "UPDATE raster SET  creation_time = '2001-01-01 00:00:00'  ,mapset = 'PERMANENT'  ,name = 'soil'  ,creator = 'soeren' WHERE id = 'soil@PERMANENT';\\n"
             >>> t.get_update_all_statement()
-            ("UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = 'soil@PERMANENT';\\n", (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren'))
+            ('UPDATE raster SET  creation_time = ?  ,mapset = ?  ,name = ?  ,creator = ? WHERE id = ?;\\n', (datetime.datetime(2001, 1, 1, 0, 0), 'PERMANENT', 'soil', 'soeren', 'soil@PERMANENT'))
             >>> t.get_update_all_statement_mogrified()
             "UPDATE raster SET  creation_time = '2001-01-01 00:00:00'  ,mapset = 'PERMANENT'  ,name = 'soil'  ,creator = 'soeren' WHERE id = 'soil@PERMANENT';\\n"
 
@@ -419,6 +419,18 @@ class SQLDatabaseInterface(DictSQLSerializer):
             dbif.execute(sql, args, mapset=self.mapset)
             dbif.close()
 
+    def _get_id_where_clause(self):
+        """Return the WHERE clause that selects the identifier with a
+           database specific place holder
+
+           The identifier is passed as argument, so that the update
+           statements of different objects of the same table are identical
+           and can be executed together with executemany.
+        """
+        if self.dbmi_paramstyle == "qmark":
+            return "WHERE id = ?"
+        return "WHERE id = %s"
+
     def get_update_statement(self, ident=None):
         """Return the sql statement and the argument list
            in database specific style
@@ -427,12 +439,11 @@ class SQLDatabaseInterface(DictSQLSerializer):
            :return: The UPDATE string
 
            """
-        if ident:
-            return self.serialize("UPDATE", self.get_table_name(),
-                                  "WHERE id = \'" + str(ident) + "\'")
-        else:
-            return self.serialize("UPDATE", self.get_table_name(),
-                                  "WHERE id = \'" + str(self.ident) + "\'")
+        if not ident:
+            ident = self.ident
+        sql, args = self.serialize("UPDATE", self.get_table_name(),
+                                   self._get_id_where_clause())
+        return sql, args + (str(ident),)
 
     def get_update_statement_mogrified(self, dbif=None, ident=None):
         """Return the update statement as mogrified string
@@ -480,12 +491,11 @@ class SQLDatabaseInterface(DictSQLSerializer):
            :param ident: The identifier to be updated, useful for renaming
            :return: The UPDATE string
            """
-        if ident:
-            return self.serialize("UPDATE ALL", self.get_table_name(),
-                                  "WHERE id = \'" + str(ident) + "\'")
-        else:
-            return self.serialize("UPDATE ALL", self.get_table_name(),
-                                  "WHERE id = \'" + str(self.ident) + "\'")
+        if not ident:
+            ident = self.ident
+        sql, args = self.serialize("UPDATE ALL", self.get_table_name(),
+                                   self._get_id_where_clause())
+        return sql, args + (str(ident),)
 
     def get_update_all_statement_mogrified(self, dbif=None, ident=None):
         """Return the update all statement as mogrified string
@@ -49,6 +49,7 @@ class RPCDefs(object):
     G_LOCATION = 12
     G_GISDBASE = 13
     READ_MAP_FULL_INFO = 14
+    READ_MAP_INFO_LIST = 15
     G_FATAL_ERROR = 49
 
     TYPE_RASTER = 0
@@ -548,6 +549,83 @@ def _read_map_info(lock, conn, data):
 ###############################################################################
 
 
+def _read_map_info_list(lock, conn, data):
+    """Check the existence, read the map specific metadata and the file based
+       GRASS timestamp of a list of maps of the same type in a single call
+
+       The value to be send via pipe is a list with a tuple for each map:
+       (exists, kvp, timestamp). The entry kvp is the dictionary of the map
+       specific metadata as returned by _read_map_info(), timestamp is the
+       tuple (return value of G_read_*_timestamp, timestamps) as send by
+       _read_timestamp(). kvp and timestamp are None in case the map does
+       not exist, timestamp is None in case the map has no timestamp.
+
+       :param lock: A multiprocessing.Lock instance
+       :param conn: A multiprocessing.Pipe instance used to send the result
+       :param data: The list of data entries [function_id, maptype, maps],
+                    maps is a list of (name, mapset, layer) tuples
+    """
+    result = []
+    try:
+        maptype = data[1]
+        for name, mapset, layer in data[2]:
+            result.append(_read_map_state(maptype, name, mapset, layer))
+    except:
+        raise
+    finally:
+        conn.send(result)
+
+###############################################################################
+
+
+def _read_map_state(maptype, name, mapset, layer):
+    """Check the existence and read the metadata and the timestamp of a map
+
+       :param maptype: The type of the map (RPCDefs.TYPE_*)
+       :param name: The name of the map
+       :param mapset: The mapset of the map
+       :param layer: The layer of a vector map, None otherwise
+       :returns: The tuple (exists, kvp, timestamp)
+    """
+    found = None
+    if maptype == RPCDefs.TYPE_RASTER:
+        found = libgis.G_find_raster(name, mapset)
+    elif maptype == RPCDefs.TYPE_VECTOR:
+        found = libgis.G_find_vector(name, mapset)
+    elif maptype == RPCDefs.TYPE_RASTER3D:
+        found = libgis.G_find_raster3d(name, mapset)
+
+    if not found:
+        return (False, None, None)
+
+    has_timestamp = False
+    ts = libgis.TimeStamp()
+    if maptype == RPCDefs.TYPE_RASTER:
+        kvp = _read_raster_info(name, mapset)
+        if libgis.G_has_raster_timestamp(name, mapset) == 1:
+            has_timestamp = True
+            check = libgis.G_read_raster_timestamp(name, mapset, byref(ts))
+    elif maptype == RPCDefs.TYPE_VECTOR:
+        kvp = _read_vector_info(name, mapset)
+        if libgis.G_has_vector_timestamp(name, layer, mapset) == 1:
+            has_timestamp = True
+            check = libgis.G_read_vector_timestamp(name, layer, mapset,
+                                                   byref(ts))
+    else:
+        kvp = _read_raster3d_info(name, mapset)
+        if libgis.G_has_raster3d_timestamp(name, mapset) == 1:
+            has_timestamp = True
+            check = libgis.G_read_raster3d_timestamp(name, mapset, byref(ts))
+
+    timestamp = None
+    if has_timestamp:
+        timestamp = (check, _convert_timestamp_from_grass(ts))
+
+    return (True, kvp, timestamp)
+
+###############################################################################
+
+
 def _read_raster_info(name, mapset):
     """Read the raster map info from the file system and store the content
        into a dictionary
@@ -944,6 +1022,7 @@ def c_library_server(lock, conn):
     functions[RPCDefs.G_LOCATION] = _get_location
     functions[RPCDefs.G_GISDBASE] = _get_gisdbase
     functions[RPCDefs.READ_MAP_FULL_INFO] = _read_map_full_info
+    functions[RPCDefs.READ_MAP_INFO_LIST] = _read_map_info_list
     functions[RPCDefs.G_FATAL_ERROR] = _fatal_error
 
     libgis.G_gisinit("c_library_server")
@@ -1018,6 +1097,14 @@ class CLibrariesInterface(RPCServerBase):
            datetime.datetime(1995, 3, 12, 10, 34, 40)
            >>> info["end_time"]
 
+           >>> maps = [("test", tgis.get_current_mapset()),
+           ...         ("test_missing", tgis.get_current_mapset())]
+           >>> state = ciface.read_raster_info_list(maps)
+           >>> state[0][0], state[0][2]
+           (True, (1, (datetime.datetime(1995, 3, 12, 10, 34, 40), None)))
+           >>> state[1]
+           (False, None, None)
+
            >>> check = ciface.has_raster_timestamp("test", tgis.get_current_mapset())
            >>> print check
            True
@@ -1189,6 +1276,22 @@ class CLibrariesInterface(RPCServerBase):
                                name, mapset, None])
         return self.safe_receive("read_raster_full_info")
 
+    def read_raster_info_list(self, maps):
+        """Check the existence, read the map info and the timestamps of a
+           list of raster maps in a single call
+
+           :param maps: A list of (name, mapset) tuples
+           :returns: A list with a (exists, kvp, timestamp) tuple for each map,
+                     kvp is the dictionary of the map specific metadata and
+                     timestamp the tuple (check, dates) of the timestamp,
+                     both are None in case they are not available
+        """
+        self.check_server()
+        self.client_conn.send([RPCDefs.READ_MAP_INFO_LIST,
+                               RPCDefs.TYPE_RASTER,
+                               [(name, mapset, None) for name, mapset in maps]])
+        return self.safe_receive("read_raster_info_list")
+
     def has_raster_timestamp(self, name, mapset):
         """Check if a file based raster timetamp exists
 
@@ -1283,6 +1386,22 @@ class CLibrariesInterface(RPCServerBase):
                                name, mapset, None])
         return self.safe_receive("read_raster3d_info")
 
+    def read_raster3d_info_list(self, maps):
+        """Check the existence, read the map info and the timestamps of a
+           list of 3D raster maps in a single call
+
+           :param maps: A list of (name, mapset) tuples
+           :returns: A list with a (exists, kvp, timestamp) tuple for each map,
+                     kvp is the dictionary of the map specific metadata and
+                     timestamp the tuple (check, dates) of the timestamp,
+                     both are None in case they are not available
+        """
+        self.check_server()
+        self.client_conn.send([RPCDefs.READ_MAP_INFO_LIST,
+                               RPCDefs.TYPE_RASTER3D,
+                               [(name, mapset, None) for name, mapset in maps]])
+        return self.safe_receive("read_raster3d_info_list")
+
     def has_raster3d_timestamp(self, name, mapset):
         """Check if a file based 3D raster timetamp exists
 
@@ -1392,6 +1511,21 @@ class CLibrariesInterface(RPCServerBase):
                                name, mapset, None])
         return self.safe_receive("read_vector_full_info")
 
+    def read_vector_info_list(self, maps):
+        """Check the existence, read the map info and the timestamps of a
+           list of vector maps in a single call
+
+           :param maps: A list of (name, mapset, layer) tuples
+           :returns: A list with a (exists, kvp, timestamp) tuple for each map,
+                     kvp is the dictionary of the map specific metadata and
+                     timestamp the tuple (check, dates) of the timestamp,
+                     both are None in case they are not available
+        """
+        self.check_server()
+        self.client_conn.send([RPCDefs.READ_MAP_INFO_LIST,
+                               RPCDefs.TYPE_VECTOR, list(maps)])
+        return self.safe_receive("read_vector_info_list")
+
     def has_vector_timestamp(self, name, mapset, layer=None):
         """Check if a file based vector timetamp exists
 
@@ -1010,6 +1010,39 @@ class SQLDatabaseInterfaceConnection(object):
 
         return self.connections[mapset].execute_transaction(statement)
 
+    def execute_batch(self, batch, mapset=None):
+        """Execute the statements of a SQLStatementBatch in a single
+           transaction
+
+           :param batch: The SQLStatementBatch to execute
+           :param mapset: The mapset of the abstract dataset or temporal
+                          database location, if None the current mapset
+                          will be used
+        """
+        if len(batch) > 0:
+            self.executemany_transaction(batch, mapset)
+
+    def executemany_transaction(self, statements, mapset=None):
+        """Execute a list of parameterized SQL statements in a single
+           transaction using executemany
+
+           :param statements: A SQLStatementBatch or a list of
+                              (sql, args_list) tuples, the SQL statement with
+                              DBMI specific place holders and the list of
+                              argument tuples it should be executed with
+           :param mapset: The mapset of the abstract dataset or temporal
+                          database location, if None the current mapset
+                          will be used
+        """
+        if mapset is None:
+            mapset = self.current_mapset
+
+        if mapset not in self.tgis_mapsets.keys():
+            self.msgr.fatal(_("Unable to execute transaction. " +
+                              self._create_mapset_error_message(mapset)))
+
+        return self.connections[mapset].executemany_transaction(statements)
+
     def _create_mapset_error_message(self, mapset):
 
           return("You have no permission to "
@@ -1180,34 +1213,24 @@ class DBConnection(object):
                 # and do it by ourself. :(
                 # Doors are open for SQL injection because of the
                 # limited python sqlite3 implementation!!!
-                pos = 0
-                count = 0
-                maxcount = 100
-                statement = sql
-
-                while count < maxcount:
-                    pos = statement.find("?", pos + 1)
-                    if pos == -1:
-                        break
+                # Use a SQLStatementBatch to avoid the mogrification.
+                parts = sql.split("?")
+                statement = [parts[0]]
 
+                for count in range(len(parts) - 1):
                     if args[count] is None:
-                        statement = "%sNULL%s" % (statement[0:pos],
-                                                  statement[pos + 1:])
+                        statement.append("NULL")
                     elif isinstance(args[count], (int, long)):
-                        statement = "%s%d%s" % (statement[0:pos], args[count],
-                                                statement[pos + 1:])
+                        statement.append("%d" % args[count])
                     elif isinstance(args[count], float):
-                        statement = "%s%f%s" % (statement[0:pos], args[count],
-                                                statement[pos + 1:])
+                        statement.append("%f" % args[count])
                     else:
                         # Default is a string, this works for datetime
                         # objects too
-                        statement = "%s\'%s\'%s" % (statement[0:pos],
-                                                    str(args[count]),
-                                                    statement[pos + 1:])
-                    count += 1
+                        statement.append("\'%s\'" % str(args[count]))
+                    statement.append(parts[count + 1])
 
-                return statement
+                return "".join(statement)
 
     def check_table(self, table_name):
         """Check if a table exists in the temporal database
@@ -1316,6 +1339,133 @@ class DBConnection(object):
         if connected:
             self.close()
 
+    def executemany_transaction(self, statements, mapset=None):
+        """Execute a list of parameterized SQL statements in a single
+           transaction
+
+           Each SQL statement is executed with executemany for all its
+           argument tuples, hence it is parsed only once by the backend
+           and no mogrification is required.
+
+           :param statements: A SQLStatementBatch or a list of
+                              (sql, args_list) tuples, the SQL statement with
+                              DBMI specific place holders and the list of
+                              argument tuples it should be executed with
+        """
+        connected = False
+        if not self.connected:
+            self.connect()
+            connected = True
+
+        sql = ""
+        try:
+            if self.dbmi.__name__ == "sqlite3":
+                # The connection is in autocommit mode
+                self.cursor.execute("BEGIN TRANSACTION")
+            for sql, args_list in statements:
+                self.cursor.executemany(sql, args_list)
+            if self.dbmi.__name__ == "sqlite3":
+                self.cursor.execute("COMMIT")
+            else:
+                self.connection.commit()
+        except:
+            if self.dbmi.__name__ == "sqlite3":
+                self.cursor.execute("ROLLBACK")
+            else:
+                self.connection.rollback()
+            if connected:
+                self.close()
+            self.msgr.error(_("Unable to execute transaction:\n %(sql)s" %
+                            {"sql": sql}))
+            raise
+
+        if connected:
+            self.close()
+
+###############################################################################
+
+
+class SQLStatementBatch(object):
+    """A batch of SQL statements with separate argument lists that are
+       executed in a single transaction
+
+       The SQL statements are not mogrified. Statements with identical SQL
+       are grouped, so that each group is executed with executemany and
+       the SQL statement is parsed only once by the database backend.
+
+       By default only consecutive statements with identical SQL are
+       grouped, hence the order of execution is preserved. In case the
+       order of the statements is irrelevant, as for the insertion or
+       update of many datasets, all statements with identical SQL are
+       grouped in the order of their first appearance if ordered is False.
+
+       Usage:
+
+       .. code-block:: python
+
+           >>> batch = SQLStatementBatch(ordered=False)
+           >>> batch.add(("INSERT INTO a (id) VALUES (?);\\n", ("1",)))
+           >>> batch.add(("INSERT INTO b (id) VALUES (?);\\n", ("1",)))
+           >>> batch.add(("INSERT INTO a (id) VALUES (?);\\n", ("2",)))
+           >>> len(batch)
+           3
+           >>> for sql, args_list in batch:
+           ...     print sql.strip(), args_list
+           INSERT INTO a (id) VALUES (?); [('1',), ('2',)]
+           INSERT INTO b (id) VALUES (?); [('1',)]
+
+    """
+    def __init__(self, ordered=True):
+        """Constructor
+
+           :param ordered: If True only consecutive statements with identical
+                           SQL are grouped
+        """
+        self.ordered = ordered
+        self.clear()
+
+    def clear(self):
+        """Remove all statements from the batch"""
+        self.groups = []
+        self.group_index = {}
+        self.num_statements = 0
+
+    def add(self, content):
+        """Add a SQL statement to the batch
+
+           :param content: The content as tuple with two entries, the first
+                           entry is the SQL statement with DBMI specific
+                           place holder, the second entry is the argument
+                           list that should substitute the place holder.
+        """
+        sql, args = content
+        if self.ordered:
+            if self.groups and self.groups[-1][0] == sql:
+                self.groups[-1][1].append(args)
+            else:
+                self.groups.append((sql, [args]))
+        else:
+            if sql in self.group_index:
+                self.groups[self.group_index[sql]][1].append(args)
+            else:
+                self.group_index[sql] = len(self.groups)
+                self.groups.append((sql, [args]))
+        self.num_statements += 1
+
+    def extend(self, contents):
+        """Add a list of SQL statements to the batch
+
+           :param contents: A list of (sql, args) tuples
+        """
+        for content in contents:
+            self.add(content)
+
+    def __len__(self):
+        return self.num_statements
+
+    def __iter__(self):
+        return iter(self.groups)
+
 ###############################################################################
 
 
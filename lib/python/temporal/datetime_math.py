@@ -11,6 +11,7 @@ for details.
 from datetime import datetime, timedelta
 from core import *
 import copy
+import numpy
 
 try:
     import dateutil.parser as parser
@@ -704,6 +705,114 @@ def compute_datetime_delta(start, end):
 ###############################################################################
 
 
+def _get_datetime64_components(times):
+    """Return the year, month, day, hour, minute and second of a datetime64
+       array as dictionary of integer arrays
+    """
+    years = times.astype("datetime64[Y]")
+    months = times.astype("datetime64[M]")
+    days = times.astype("datetime64[D]")
+    microseconds = (times - days.astype("datetime64[us]")).astype(numpy.int64)
+
+    comp = {}
+    comp["year"] = years.astype(numpy.int64) + 1970
+    comp["month"] = months.astype(numpy.int64) % 12 + 1
+    comp["day"] = (days - months.astype("datetime64[D]")).astype(
+        numpy.int64) + 1
+    comp["hour"] = microseconds // 3600000000
+    comp["minute"] = microseconds // 60000000 % 60
+    comp["second"] = microseconds // 1000000 % 60
+    return comp
+
+
+def compute_datetime_delta_array(start, end):
+    """Return a dictionary with the accumulated delta in year, month, day,
+       hour, minute and second of arrays of start and end times
+
+       This is the array version of compute_datetime_delta(). The month
+       delta is only valid where the "has_month" array is True, these are
+       the cases in which compute_datetime_delta() sets the "month" key.
+
+        .. code-block:: python
+
+            >>> pairs = [(datetime(2001, 1, 1), datetime(2001, 1, 1, 0, 0, 30)),
+            ...          (datetime(2001, 1, 1, 12), datetime(2001, 1, 2, 13, 30)),
+            ...          (datetime(2001, 1, 14), datetime(2001, 2, 14)),
+            ...          (datetime(2001, 3, 1), datetime(2002, 9, 1)),
+            ...          (datetime(2001, 5, 1), datetime(2002, 2, 1)),
+            ...          (datetime(2000, 12, 31, 23, 59, 50),
+            ...           datetime(2001, 1, 1, 0, 0, 10))]
+            >>> start = numpy.array([s for s, e in pairs], dtype="datetime64[us]")
+            >>> end = numpy.array([e for s, e in pairs], dtype="datetime64[us]")
+            >>> delta = compute_datetime_delta_array(start, end)
+            >>> def get_delta(i):
+            ...     d = {}
+            ...     for key in ["year", "day", "hour", "minute", "second",
+            ...                 "max_days"]:
+            ...         d[key] = int(delta[key][i])
+            ...     if delta["has_month"][i]:
+            ...         d["month"] = int(delta["month"][i])
+            ...     return d
+            >>> [get_delta(i) == compute_datetime_delta(s, e)
+            ...  for i, (s, e) in enumerate(pairs)]
+            [True, True, True, True, True, True]
+
+       :param start: A datetime64 array of start times
+       :param end: A datetime64 array of end times
+       :return: A dictionary with year, month, has_month, day, hour, minute,
+                second and max_days as keys and numpy arrays as values
+    """
+    start = numpy.asarray(start, dtype="datetime64[us]")
+    end = numpy.asarray(end, dtype="datetime64[us]")
+    s = _get_datetime64_components(start)
+    e = _get_datetime64_components(end)
+
+    comp = {}
+
+    day_diff = (end - start).astype(numpy.int64) // 86400000000
+    comp["max_days"] = day_diff
+
+    # Date
+    # Count full years
+    comp["year"] = e["year"] - s["year"]
+
+    # Count full months
+    first_month = (s["month"] == 1) & (e["month"] == 1)
+    first_day = (s["day"] == 1) & (e["day"] == 1)
+    d = e["month"] - s["month"]
+    d = numpy.where(d < 0, d + 12 * comp["year"],
+                    numpy.where(d == 0, 12 * comp["year"], d))
+    comp["has_month"] = first_month | first_day
+    comp["month"] = numpy.where(first_month | ~first_day, 0, d)
+
+    # Count full days
+    comp["day"] = numpy.where(first_day, 0, day_diff)
+
+    # Time
+    # Hours
+    d = e["hour"] - s["hour"]
+    d = numpy.where(d < 0, d + 24 + 24 * day_diff, d + 24 * day_diff)
+    comp["hour"] = numpy.where((s["hour"] == 0) & (e["hour"] == 0), 0, d)
+
+    # Minutes
+    d = e["minute"] - s["minute"] + \
+        numpy.where(comp["hour"] != 0, 60 * comp["hour"], 24 * 60 * day_diff)
+    comp["minute"] = numpy.where((s["minute"] == 0) & (e["minute"] == 0), 0,
+                                 d)
+
+    # Seconds
+    d = e["second"] - s["second"] + \
+        numpy.where(comp["minute"] != 0, 60 * comp["minute"],
+                    numpy.where(comp["hour"] != 0, 3600 * comp["hour"],
+                                24 * 60 * 60 * day_diff))
+    comp["second"] = numpy.where((s["second"] == 0) & (e["second"] == 0), 0,
+                                 d)
+
+    return comp
+
+###############################################################################
+
+
 def check_datetime_string(time_string):
     """Check if  a string can be converted into a datetime object
 
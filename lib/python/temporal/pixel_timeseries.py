@@ -0,0 +1,133 @@
+"""
+Extraction of pixel time series from space time raster datasets
+
+Usage:
+
+.. code-block:: python
+
+    import grass.temporal as tgis
+
+    tgis.init()
+    points = [(630000, 215000), (640000, 220000)]
+    maps, values = tgis.get_strds_values_at_points("precip_abs1", points,
+                                                   nprocs=4)
+    # values[i, j] is the value of point i in the map maps[j]
+
+(C) 2015 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+"""
+
+from multiprocessing import Pool
+import numpy
+from open_stds import *
+from grass.pygrass.raster import RasterRow
+
+# The points and the interpolation method used by the worker processes
+_worker_args = None
+
+###############################################################################
+
+
+def _read_map_values(id, points, method):
+    """Read the values of a raster map at the points
+
+       :param id: The name or the id of the raster map
+       :param points: A numpy array with the coordinates of the points
+       :param method: The interpolation method
+       :return: A numpy array with the values of the points
+    """
+    if "@" in id:
+        name, mapset = id.split("@")
+    else:
+        name, mapset = id, ""
+    with RasterRow(name, mapset, data_only=True) as rast:
+        return rast.get_values(points, method=method)
+
+
+def _init_worker(points, method):
+    """Store the points and the method in the worker process"""
+    global _worker_args
+    _worker_args = (points, method)
+
+
+def _read_map_values_worker(id):
+    """Read the values of a raster map in a worker process"""
+    return _read_map_values(id, *_worker_args)
+
+###############################################################################
+
+
+def get_raster_values_at_points(maps, points, nprocs=1, method="nearest"):
+    """Read the values of raster maps at a set of points
+
+       Each raster map is opened only once and sampled at all points,
+       the rows of the map are decoded only once. The maps can be read
+       by a pool of worker processes. The current region is used to
+       convert the coordinates into rows and columns.
+
+       :param maps: A list of raster map names or ids
+       :param points: A sequence of pairs of coordinates (east, north)
+                      or a numpy array with two columns
+       :param nprocs: The number of processes used to read the maps
+       :param method: The interpolation method: nearest, bilinear or bicubic
+       :return: A numpy array with shape (number of points, number of maps),
+                the values of the points outside the region and of the
+                null cells are NaN
+    """
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 2)
+    values = numpy.empty((len(points), len(maps)), dtype=numpy.float64)
+
+    if nprocs > 1 and len(maps) > 1:
+        pool = Pool(processes=min(nprocs, len(maps)),
+                    initializer=_init_worker, initargs=(points, method))
+        try:
+            for i, column in enumerate(pool.imap(_read_map_values_worker,
+                                                 maps)):
+                values[:, i] = column
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        for i, id in enumerate(maps):
+            values[:, i] = _read_map_values(id, points, method)
+
+    return values
+
+###############################################################################
+
+
+def get_strds_values_at_points(input, points, where=None, nprocs=1,
+                               method="nearest", dbif=None):
+    """Extract the time series of a space time raster dataset at a set
+       of points
+
+       :param input: The name of the space time raster dataset
+       :param points: A sequence of pairs of coordinates (east, north)
+                      or a numpy array with two columns
+       :param where: A temporal database where statement to select
+                     a subset of the registered maps
+       :param nprocs: The number of processes used to read the maps
+       :param method: The interpolation method: nearest, bilinear or bicubic
+       :param dbif: The database interface to be used
+       :return: A tuple with the list of the registered maps as rows with
+                the columns id, start_time and end_time ordered by start
+                time, and a numpy array with shape (number of points,
+                number of maps) with the values of the points
+    """
+    dbif, connected = init_dbif(dbif)
+
+    sp = open_old_stds(input, "strds", dbif)
+    rows = sp.get_registered_maps("id,start_time,end_time", where,
+                                  "start_time", dbif)
+
+    if connected:
+        dbif.close()
+
+    if not rows:
+        rows = []
+
+    values = get_raster_values_at_points([row["id"] for row in rows],
+                                         points, nprocs, method)
+    return rows, values
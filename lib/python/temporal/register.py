@@ -174,20 +174,33 @@ def register_maps_in_space_time_dataset(
 
     num_maps = len(maplist)
     map_object_list = []
-    statement = ""
+    # The gathered SQL statements, statements of different maps with
+    # identical SQL are executed together
+    batch = SQLStatementBatch(ordered=False)
     # Store the ids of datasets that must be updated
     datatsets_to_modify = {}
 
     msgr.message(_("Gathering map information..."))
 
-    for count in range(len(maplist)):
-        if count % 50 == 0:
-            msgr.percent(count, num_maps, 1)
+    # Get new instances of the map type and read the map information
+    # of all maps in bulk
+    map_list = [dataset_factory(type, row["id"]) for row in maplist]
+    map_states = _read_map_states(map_list, msgr)
+    registered_ids = _get_registered_map_ids(map_list, dbif)
+    # Select the registered maps that will be updated with a single
+    # query for each chunk of maps
+    registered_maps = {}
+    if registered_ids and gscript.overwrite():
+        for registered_map in select_datasets(map_list[0],
+                                              ids=list(registered_ids),
+                                              dbif=dbif):
+            registered_maps[registered_map.get_id()] = registered_map
 
-        # Get a new instance of the map type
-        map = dataset_factory(type, maplist[count]["id"])
+    for count in range(len(maplist)):
+        map = map_list[count]
+        exists, kvp, timestamp = map_states[count]
 
-        if map.map_exists() is not True:
+        if exists is not True:
             msgr.fatal(_("Unable to update %(t)s map <%(id)s>. "
                          "The map does not exist.") % {'t': map.get_type(),
                                                        'id': map.get_map_id()})
@@ -201,9 +214,9 @@ def register_maps_in_space_time_dataset(
         is_in_db = False
 
         # Put the map into the database
-        if not map.is_in_db(dbif):
+        if map.get_id() not in registered_ids:
             # Break in case no valid time is provided
-            if (start == "" or start is None) and not map.has_grass_timestamp():
+            if (start == "" or start is None) and timestamp is None:
                 dbif.close()
                 if map.get_layer():
                     msgr.fatal(_("Unable to register %(t)s map <%(id)s> with "
@@ -254,8 +267,8 @@ def register_maps_in_space_time_dataset(
                 # Jump to next map
                 continue
 
-            # Select information from temporal database
-            map.select(dbif)
+            # Use the information selected from the temporal database
+            map = registered_maps[map.get_id()]
 
             # Save the datasets that must be updated
             datasets = map.get_registered_stds(dbif)
@@ -279,12 +292,12 @@ def register_maps_in_space_time_dataset(
                                     'id': map.get_map_id()})
 
         # Load the data from the grass file database
-        map.load()
+        map.load_from_info(kvp)
 
-        # Try to read an existing time stamp from the grass spatial database
+        # Use an existing time stamp from the grass spatial database
         # in case this map wasn't already registered in the temporal database
-        if not is_in_db:
-            map.read_timestamp_from_grass()
+        if not is_in_db and timestamp is not None:
+            map.set_timestamp_from_grass(*timestamp)
 
         # Set the valid time
         if start:
@@ -298,29 +311,19 @@ def register_maps_in_space_time_dataset(
                                      interval=interval)
 
         if is_in_db:
-            #  Gather the SQL update statement
-            statement += map.update_all(dbif=dbif, execute=False)
+            #  Gather the SQL update statements
+            map.update_all(dbif=dbif, batch=batch)
         else:
-            #  Gather the SQL insert statement
-            statement += map.insert(dbif=dbif, execute=False)
-
-        # Sqlite3 performance is better for huge datasets when committing in
-        # small chunks
-        if dbif.get_dbmi().__name__ == "sqlite3":
-            if count % 100 == 0:
-                if statement is not None and statement != "":
-                    dbif.execute_transaction(statement)
-                    statement = ""
+            #  Gather the SQL insert statements
+            map.insert(dbif=dbif, batch=batch)
 
         # Store the maps in a list to register in a space time dataset
         if name:
             map_object_list.append(map)
 
-    msgr.percent(num_maps, num_maps, 1)
-
-    if statement is not None and statement != "":
+    if len(batch) > 0:
         msgr.message(_("Registering maps in the temporal database..."))
-        dbif.execute_transaction(statement)
+        dbif.execute_batch(batch)
 
     # Finally Register the maps in the space time dataset
     if name and map_object_list:
@@ -360,6 +363,82 @@ def register_maps_in_space_time_dataset(
 
 ###############################################################################
 
+
+def _read_map_states(maps, msgr, chunk_size=1000):
+    """Check the existence and read the metadata and the timestamps of
+       a list of maps of the same type
+
+       The information of a chunk of maps is read with a single call of
+       the C-library interface.
+
+       :param maps: A list of map objects derived from abstract_map_dataset
+       :param msgr: The message interface used to report the progress
+       :param chunk_size: The number of maps that are read in a single call
+       :return: A list with an (exists, kvp, timestamp) tuple for each map
+    """
+    ciface = get_tgis_c_library_interface()
+    num_maps = len(maps)
+    states = []
+
+    for index in range(0, num_maps, chunk_size):
+        msgr.percent(index, num_maps, 1)
+        chunk = maps[index:index + chunk_size]
+        if chunk[0].get_type() == "vector":
+            states.extend(ciface.read_vector_info_list(
+                [(map.get_name(), map.get_mapset(), map.get_layer())
+                 for map in chunk]))
+        elif chunk[0].get_type() == "raster3d":
+            states.extend(ciface.read_raster3d_info_list(
+                [(map.get_name(), map.get_mapset()) for map in chunk]))
+        else:
+            states.extend(ciface.read_raster_info_list(
+                [(map.get_name(), map.get_mapset()) for map in chunk]))
+
+    msgr.percent(num_maps, num_maps, 1)
+
+    return states
+
+###############################################################################
+
+
+def _get_registered_map_ids(maps, dbif, chunk_size=500):
+    """Return the ids of the maps that are registered in the temporal database
+
+       The ids are checked with a single SELECT ... WHERE id IN (...) query
+       for each chunk of maps of a mapset.
+
+       :param maps: A list of map objects of the same type
+       :param dbif: The database interface to be used
+       :param chunk_size: The maximum number of ids in a single query
+       :return: A set of map ids
+    """
+    registered_ids = set()
+    if not maps:
+        return registered_ids
+
+    table = maps[0].base.get_table_name()
+    ids = {}
+    for map in maps:
+        ids.setdefault(map.get_mapset(), []).append(map.get_id())
+
+    for mapset in ids:
+        if dbif.get_dbmi(mapset).paramstyle == "qmark":
+            place_holder = "?"
+        else:
+            place_holder = "%s"
+        mapset_ids = ids[mapset]
+        for index in range(0, len(mapset_ids), chunk_size):
+            chunk = mapset_ids[index:index + chunk_size]
+            sql = "SELECT id FROM %s WHERE id IN (%s)" % (
+                table, ",".join([place_holder] * len(chunk)))
+            dbif.execute(sql, tuple(chunk), mapset=mapset)
+            rows = dbif.fetchall(mapset=mapset)
+            registered_ids.update([row[0] for row in rows])
+
+    return registered_ids
+
+###############################################################################
+
 def assign_valid_time_to_map(ttype, map, start, end, unit, increment=None,
                              mult=1, interval=False):
     """Assign the valid time to a map dataset
@@ -0,0 +1,376 @@
+"""
+Compact array based list of the maps registered in a space time dataset
+
+Usage:
+
+.. code-block:: python
+
+    import grass.temporal as tgis
+
+    tgis.init()
+    strds = tgis.open_old_stds("precip_abs1", "strds")
+    maps = strds.get_registered_maps_as_array()
+    # The ids, time stamps and extents are numpy arrays
+    print maps.ids[0], maps.north.max()
+    # The map objects are created on access
+    map = maps[0]
+
+(C) 2015 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+"""
+from datetime import datetime, timedelta
+import numpy
+
+###############################################################################
+
+
+class RegisteredMapArray(object):
+    """A column oriented list of registered maps
+
+       The ids, the start and end times and the spatial extents of the maps
+       are stored in numpy arrays. The map objects are only created when
+       they are accessed by index or iteration, a created map object is
+       stored so that repeated access returns the same object.
+
+       Absolute time stamps are stored as integer microseconds since
+       0001-01-01 00:00:00, relative time stamps as integer values.
+       The time arrays are masked arrays, missing time stamps are masked.
+       Missing extent values are NaN.
+
+       .. code-block:: python
+
+            >>> maps = RegisteredMapArray(None, "relative", "days",
+            ...                           ["a@P", "b@P", "c@P"],
+            ...                           [0, 5, 10], [5, 10, None])
+            >>> len(maps)
+            3
+            >>> maps.get_temporal_extent_as_tuple(2)
+            (10, None)
+            >>> maps.temporal_relation_mask(4, 10).tolist()
+            [False, True, False]
+            >>> maps.temporal_relation_mask(4, 10, use_start=False,
+            ...                             use_overlap=True).tolist()
+            [True, False, False]
+            >>> sub = maps.take([2, 0])
+            >>> list(sub.ids)
+            ['c@P', 'a@P']
+
+            >>> start = datetime(2001, 1, 1, 12, 30, 0, 1)
+            >>> maps = RegisteredMapArray(None, "absolute", None, ["a@P"],
+            ...                           [start], [None])
+            >>> maps.get_temporal_extent_as_tuple(0)
+            (datetime.datetime(2001, 1, 1, 12, 30, 0, 1), None)
+            >>> maps.temporal_relation_mask(datetime(2001, 1, 1),
+            ...                             datetime(2001, 1, 2)).tolist()
+            [True]
+    """
+
+    # The reference of the integer representation of absolute time
+    timeref = datetime(1, 1, 1)
+
+    def __init__(self, map_factory, temporal_type, unit, ids, start_time,
+                 end_time, north=None, south=None, east=None, west=None,
+                 top=None, bottom=None):
+        """Constructor
+
+           :param map_factory: A function that returns a new map object for
+                               a map id, usually the get_new_map_instance()
+                               method of a space time dataset
+           :param temporal_type: The temporal type "absolute" or "relative"
+           :param unit: The relative time unit
+           :param ids: A sequence of map ids
+           :param start_time: A sequence of start times
+           :param end_time: A sequence of end times, None for time instances
+           :param north: A sequence of northern edges or None
+           :param south: A sequence of southern edges or None
+           :param east: A sequence of eastern edges or None
+           :param west: A sequence of western edges or None
+           :param top: A sequence of top edges or None
+           :param bottom: A sequence of bottom edges or None
+        """
+        self.map_factory = map_factory
+        self.temporal_type = temporal_type
+        self.unit = unit
+        self.ids = numpy.array(ids, dtype=object)
+        self.start_time = self._times_to_array(start_time)
+        self.end_time = self._times_to_array(end_time)
+        self.north = self._extent_to_array(north)
+        self.south = self._extent_to_array(south)
+        self.east = self._extent_to_array(east)
+        self.west = self._extent_to_array(west)
+        self.top = self._extent_to_array(top)
+        self.bottom = self._extent_to_array(bottom)
+        # The created map objects by index
+        self._maps = {}
+
+    @classmethod
+    def from_rows(cls, rows, map_factory, temporal_type, unit=None):
+        """Create the map array from rows of the map views
+
+           :param rows: The rows with the columns id, start_time, end_time
+                        and optionally north, south, east, west, top and
+                        bottom
+           :param map_factory: A function that returns a new map object for
+                               a map id
+           :param temporal_type: The temporal type "absolute" or "relative"
+           :param unit: The relative time unit
+           :return: A RegisteredMapArray object
+        """
+        columns = {}
+        names = ["id", "start_time", "end_time", "north", "south", "east",
+                 "west", "top", "bottom"]
+        if rows:
+            names = [name for name in names if name in rows[0].keys()]
+        for name in names:
+            columns[name] = [row[name] for row in rows]
+
+        return cls(map_factory, temporal_type, unit, columns.get("id", []),
+                   columns.get("start_time", []), columns.get("end_time", []),
+                   columns.get("north"), columns.get("south"),
+                   columns.get("east"), columns.get("west"),
+                   columns.get("top"), columns.get("bottom"))
+
+    def time_to_number(self, value):
+        """Convert a time stamp into its integer representation"""
+        if self.temporal_type == "absolute":
+            delta = value - self.timeref
+            return (delta.days * 86400 + delta.seconds) * 1000000 + \
+                delta.microseconds
+        return value
+
+    def number_to_time(self, value):
+        """Convert the integer representation into a time stamp"""
+        if self.temporal_type == "absolute":
+            return self.timeref + timedelta(microseconds=int(value))
+        return int(value)
+
+    def to_datetime64(self, values):
+        """Convert an array with the integer representation of absolute
+           time stamps into a numpy datetime64 array
+
+           .. code-block:: python
+
+                >>> maps = RegisteredMapArray(None, "absolute", None, ["a@P"],
+                ...                           [datetime(2001, 2, 3, 4)], [None])
+                >>> maps.to_datetime64(maps.start_time.data).tolist()
+                [datetime.datetime(2001, 2, 3, 4, 0)]
+
+           :param values: An integer array
+           :return: A datetime64 array with microsecond resolution
+        """
+        return numpy.datetime64(self.timeref, "us") + \
+            numpy.asarray(values, dtype=numpy.int64).astype("timedelta64[us]")
+
+    def _times_to_array(self, values):
+        """Create a masked integer array from a sequence of time stamps"""
+        mask = [value is None for value in values]
+        data = [0 if value is None else self.time_to_number(value)
+                for value in values]
+        return numpy.ma.array(numpy.array(data, dtype=numpy.int64),
+                              mask=numpy.array(mask, dtype=bool))
+
+    def _extent_to_array(self, values):
+        """Create a float array from a sequence of extent values"""
+        if values is None:
+            return numpy.ones(len(self.ids), dtype=numpy.float64) * numpy.nan
+        return numpy.array([numpy.nan if value is None else value
+                            for value in values], dtype=numpy.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for index in xrange(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Index out of range")
+        if index not in self._maps:
+            self._maps[index] = self.create_map(index)
+        return self._maps[index]
+
+    def get_temporal_type(self):
+        """Return the temporal type of the maps"""
+        return self.temporal_type
+
+    def get_temporal_extent_as_tuple(self, index):
+        """Return the start and end time of a map without creating
+           the map object
+
+           :param index: The index of the map
+           :return: A tuple (start_time, end_time)
+        """
+        start = None
+        end = None
+        if not self.start_time.mask[index]:
+            start = self.number_to_time(self.start_time.data[index])
+        if not self.end_time.mask[index]:
+            end = self.number_to_time(self.end_time.data[index])
+        return start, end
+
+    def create_map(self, index):
+        """Create a new map object with the id, the temporal and the
+           spatial extent of a map
+
+           :param index: The index of the map
+           :return: The map object
+        """
+        map = self.map_factory(self.ids[index])
+        start, end = self.get_temporal_extent_as_tuple(index)
+        if self.temporal_type == "absolute":
+            map.set_absolute_time(start, end)
+        elif self.temporal_type == "relative":
+            map.set_relative_time(start, end, self.unit)
+        if not numpy.isnan(self.north[index]):
+            top = self.top[index]
+            bottom = self.bottom[index]
+            map.set_spatial_extent_from_values(
+                north=self.north[index], south=self.south[index],
+                east=self.east[index], west=self.west[index],
+                top=0 if numpy.isnan(top) else top,
+                bottom=0 if numpy.isnan(bottom) else bottom)
+        return map
+
+    def to_list(self):
+        """Return a list of all map objects"""
+        return [self[index] for index in xrange(len(self))]
+
+    def take(self, indices):
+        """Return a new map array with the maps of the indices
+
+           :param indices: A sequence of indices or a boolean mask
+           :return: A RegisteredMapArray object
+        """
+        indices = numpy.asarray(indices)
+        if indices.dtype == bool:
+            indices = numpy.nonzero(indices)[0]
+        else:
+            indices = indices.astype(numpy.intp)
+        result = RegisteredMapArray(self.map_factory, self.temporal_type,
+                                    self.unit, [], [], [])
+        result.ids = self.ids[indices]
+        result.start_time = self.start_time[indices]
+        result.end_time = self.end_time[indices]
+        for name in ["north", "south", "east", "west", "top", "bottom"]:
+            setattr(result, name, getattr(self, name)[indices])
+        return result
+
+    def temporal_relation_mask(self, start, end, use_start=True,
+                               use_during=False, use_overlap=False,
+                               use_contain=False, use_equal=False,
+                               use_follows=False, use_precedes=False):
+        """Return a boolean array that marks the maps with a temporal
+           relation to the granule
+
+           The selection is identical to the SQL where statement created
+           by create_temporal_relation_sql_where_statement(), comparisons
+           with missing time stamps are False.
+
+           :param start: The start time of the granule
+           :param end: The end time of the granule
+           :return: A boolean numpy array
+        """
+        if not (use_start or use_during or use_overlap or use_contain or
+                use_equal or use_follows or use_precedes):
+            # No where statement, all maps are selected
+            return numpy.ones(len(self), dtype=bool)
+
+        s = self.time_to_number(start)
+        e = self.time_to_number(end)
+        map_start = self.start_time
+        map_end = self.end_time
+
+        mask = numpy.zeros(len(self), dtype=bool)
+        if use_start:
+            mask |= ((map_start >= s) & (map_start < e)).filled(False)
+        if use_during:
+            mask |= (((map_start > s) & (map_end < e)) |
+                     ((map_start >= s) & (map_end < e)) |
+                     ((map_start > s) & (map_end <= e))).filled(False)
+        if use_overlap:
+            mask |= (((map_start < s) & (map_end > s) & (map_end < e)) |
+                     ((map_start < e) & (map_start > s) &
+                      (map_end > e))).filled(False)
+        if use_contain:
+            mask |= (((map_start < s) & (map_end > e)) |
+                     ((map_start <= s) & (map_end > e)) |
+                     ((map_start < s) & (map_end >= e))).filled(False)
+        if use_equal:
+            mask |= ((map_start == s) & (map_end == e)).filled(False)
+        if use_follows:
+            mask |= (map_start == e).filled(False)
+        if use_precedes:
+            mask |= (map_end == s).filled(False)
+        return mask
+
+###############################################################################
+
+
+def create_registered_map_array(maps):
+    """Return the time stamps and the spatial extents of a map list as
+       RegisteredMapArray
+
+       The map objects of the list are returned by index access of the
+       RegisteredMapArray.
+
+       :param maps: A list of abstract_dataset objects
+                    or a RegisteredMapArray
+       :return: A RegisteredMapArray or None in case the maps have different
+                temporal types, relative time units or relative time stamps
+                that are not integer values
+    """
+    if isinstance(maps, RegisteredMapArray):
+        return maps
+
+    temporal_types = set()
+    units = set()
+    ids = []
+    start_times = []
+    end_times = []
+    extents = []
+
+    for map_ in maps:
+        start, end = map_.get_temporal_extent_as_tuple()
+        if map_.is_time_absolute():
+            temporal_types.add("absolute")
+        elif map_.is_time_relative():
+            temporal_types.add("relative")
+            units.add(map_.get_relative_time_unit())
+            for value in (start, end):
+                if value is not None and value != int(value):
+                    return None
+        else:
+            return None
+        ids.append(map_.get_id())
+        start_times.append(start)
+        end_times.append(end)
+        extents.append(map_.get_spatial_extent_as_tuple())
+
+    if len(temporal_types) > 1 or len(units) > 1:
+        return None
+
+    temporal_type = temporal_types.pop() if temporal_types else None
+    unit = units.pop() if units else None
+    if extents:
+        north, south, east, west, top, bottom = zip(*extents)
+    else:
+        north = south = east = west = top = bottom = []
+
+    map_array = RegisteredMapArray(None, temporal_type, unit, ids,
+                                   start_times, end_times, north, south, east,
+                                   west, top, bottom)
+    map_array._maps = dict(enumerate(maps))
+    return map_array
+
+###############################################################################
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -227,17 +227,7 @@ class RasterDataset(AbstractMapDataset):
         check, dates = self.ciface.read_raster_timestamp(self.get_name(),
                                                          self.get_mapset(),)
 
-        if check < 1:
-            self.msgr.error(_("Unable to read timestamp file "
-                              "for raster map <%s>" % (self.get_map_id())))
-            return False
-
-        if len(dates) == 2:
-            self.set_absolute_time(dates[0], dates[1])
-        else:
-            self.set_relative_time(dates[0], dates[1], dates[2])
-
-        return True
+        return self.set_timestamp_from_grass(check, dates)
 
     def write_timestamp_to_grass(self):
         """Write the timestamp of this map into the map metadata in
@@ -307,12 +297,22 @@ class RasterDataset(AbstractMapDataset):
         if self.map_exists() is not True:
             return False
 
-        # Fill base information
-        self.base.set_creator(str(getpass.getuser()))
-
         kvp = self.ciface.read_raster_info(self.get_name(),
                                            self.get_mapset())
 
+        return self.load_from_info(kvp)
+
+    def load_from_info(self, kvp):
+        """Load the info of an existing raster map into the internal structure
+
+           :param kvp: The key value pairs of the map specific metadata as
+                       returned by CLibrariesInterface.read_raster_info()
+           :return: True if the metadata was filled successfully,
+                    False otherwise
+        """
+        # Fill base information
+        self.base.set_creator(str(getpass.getuser()))
+
         if kvp:
             # Fill spatial extent
             self.set_spatial_extent_from_values(north=kvp["north"],
@@ -571,17 +571,7 @@ class Raster3DDataset(AbstractMapDataset):
         check, dates = self.ciface.read_raster3d_timestamp(self.get_name(),
                                                            self.get_mapset(),)
 
-        if check < 1:
-            self.msgr.error(_("Unable to read timestamp file "
-                              "for 3D raster map <%s>" % (self.get_map_id())))
-            return False
-
-        if len(dates) == 2:
-            self.set_absolute_time(dates[0], dates[1])
-        else:
-            self.set_relative_time(dates[0], dates[1], dates[2])
-
-        return True
+        return self.set_timestamp_from_grass(check, dates)
 
     def write_timestamp_to_grass(self):
         """Write the timestamp of this map into the map metadata
@@ -648,14 +638,24 @@ class Raster3DDataset(AbstractMapDataset):
         if self.map_exists() is not True:
             return False
 
-        # Fill base information
-        self.base.set_creator(str(getpass.getuser()))
-
-        # Fill spatial extent
         kvp = self.ciface.read_raster3d_info(self.get_name(),
                                              self.get_mapset())
 
+        return self.load_from_info(kvp)
+
+    def load_from_info(self, kvp):
+        """Load the info of an existing 3D raster map into the internal structure
+
+           :param kvp: The key value pairs of the map specific metadata as
+                       returned by CLibrariesInterface.read_raster3d_info()
+           :return: True if the metadata was filled successfully,
+                    False otherwise
+        """
+        # Fill base information
+        self.base.set_creator(str(getpass.getuser()))
+
         if kvp:
+            # Fill spatial extent
             self.set_spatial_extent_from_values(north=kvp["north"],
                                                 south=kvp["south"],
                                                 east=kvp["east"],
@@ -875,17 +875,7 @@ class VectorDataset(AbstractMapDataset):
         check, dates = self.ciface.read_vector_timestamp(self.get_name(),
                                                          self.get_mapset(),)
 
-        if check < 1:
-            self.msgr.error(_("Unable to read timestamp file "
-                              "for vector map <%s>" % (self.get_map_id())))
-            return False
-
-        if len(dates) == 2:
-            self.set_absolute_time(dates[0], dates[1])
-        else:
-            self.set_relative_time(dates[0], dates[1], dates[2])
-
-        return True
+        return self.set_timestamp_from_grass(check, dates)
 
     def write_timestamp_to_grass(self):
         """Write the timestamp of this map into the map metadata in
@@ -949,14 +939,22 @@ class VectorDataset(AbstractMapDataset):
         if self.map_exists() is not True:
             return False
 
-        # Fill base information
-        self.base.set_creator(str(getpass.getuser()))
-
-        # Get the data from an existing vector map
-
         kvp = self.ciface.read_vector_info(self.get_name(),
                                            self.get_mapset())
 
+        return self.load_from_info(kvp)
+
+    def load_from_info(self, kvp):
+        """Load the info of an existing vector map into the internal structure
+
+           :param kvp: The key value pairs of the map specific metadata as
+                       returned by CLibrariesInterface.read_vector_info()
+           :return: True if the metadata was filled successfully,
+                    False otherwise
+        """
+        # Fill base information
+        self.base.set_creator(str(getpass.getuser()))
+
         if kvp:
             # Fill spatial extent
             self.set_spatial_extent_from_values(north=kvp["north"],
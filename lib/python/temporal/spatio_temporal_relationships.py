@@ -19,6 +19,8 @@ for details.
 """
 from abstract_dataset import *
 from datetime_math import *
+from registered_map_array import *
+import numpy
 import grass.lib.vector as vector
 import grass.lib.rtree as rtree
 import grass.lib.gis as gis
@@ -354,11 +356,59 @@ class SpatioTemporalTopologyBuilder(object):
             ('FOLLOWS', (datetime.datetime(2000, 1, 1, 0, 0, 1), datetime.datetime(2000, 1, 1, 0, 0, 3)))
             ('OVERLAPPED', (datetime.datetime(2000, 1, 1, 0, 0, 2), datetime.datetime(2000, 1, 1, 0, 0, 4)))
 
+            >>> # The vectorized and the R-tree based build create the
+            >>> # same topology
+            >>> def get_topology(maps):
+            ...     result = []
+            ...     for map in maps:
+            ...         m = map.get_temporal_relations()
+            ...         for key in sorted(m.keys()):
+            ...             if key not in ["NEXT", "PREV"]:
+            ...                 result.append((map.get_id(), key,
+            ...                                sorted([r.get_id() for r in m[key]])))
+            ...     return result
+            >>> mapsA = []
+            >>> mapsB = []
+            >>> for i in range(10):
+            ...     mapA = tgis.RasterDataset("a%i@B"%(i))
+            ...     check = mapA.set_relative_time(i, i + 1 + i % 3, "days")
+            ...     mapsA.append(mapA)
+            ...     mapB = tgis.RasterDataset("b%i@B"%(i))
+            ...     if i % 4 == 0:
+            ...         check = mapB.set_relative_time(i + 1, None, "days")
+            ...     else:
+            ...         check = mapB.set_relative_time(i - 1, i + i % 2, "days")
+            ...     mapsB.append(mapB)
+            >>> # A long map does not change the result
+            >>> mapA = tgis.RasterDataset("along@B")
+            >>> check = mapA.set_relative_time(0, 100, "days")
+            >>> mapsA.append(mapA)
+            >>> SpatioTemporalTopologyBuilder(vectorized=False).build(mapsA, mapsB)
+            >>> rtree_topology = get_topology(mapsA + mapsB)
+            >>> SpatioTemporalTopologyBuilder(vectorized=True).build(mapsA, mapsB)
+            >>> get_topology(mapsA + mapsB) == rtree_topology
+            True
+            >>> SpatioTemporalTopologyBuilder(vectorized=False).build(mapsB)
+            >>> rtree_topology = get_topology(mapsB)
+            >>> SpatioTemporalTopologyBuilder(vectorized=True).build(mapsB)
+            >>> get_topology(mapsB) == rtree_topology
+            True
+
     """
-    def __init__(self):
+    def __init__(self, vectorized=True):
+        """Constructor
+
+           :param vectorized: If True the relations are computed with numpy
+                              on arrays of the time stamps and extents of
+                              the maps, otherwise a R*-Tree is used to find
+                              the related maps. The R*-Tree is used as well
+                              in case the maps have different temporal types
+                              or relative time units.
+        """
         self._reset()
         # 0001-01-01 00:00:00
         self._timeref = datetime(1, 1, 1)
+        self._vectorized = vectorized
 
     def _reset(self):
         self._store = {}
@@ -386,7 +436,7 @@ class SpatioTemporalTopologyBuilder(object):
         """
         return self._first
 
-    def _build_internal_iteratable(self, maps, spatial):
+    def _build_internal_iteratable(self, maps, spatial, order=None):
         """Build an iteratable temporal topology structure for all maps in
            the list and store the maps internally
 
@@ -397,8 +447,10 @@ class SpatioTemporalTopologyBuilder(object):
 
            :param maps: A sorted (by start_time)list of abstract_dataset
                         objects with initiated temporal extent
+           :param order: The indices of the maps sorted by start time,
+                         the maps are sorted if None
         """
-        self._build_iteratable(maps, spatial)
+        self._build_iteratable(maps, spatial, order)
 
         for _map in maps:
             self._insert(_map)
@@ -406,7 +458,7 @@ class SpatioTemporalTopologyBuilder(object):
         # Detect the first map
         self._detect_first()
 
-    def _build_iteratable(self, maps, spatial):
+    def _build_iteratable(self, maps, spatial, order=None):
         """Build an iteratable temporal topology structure for
            all maps in the list
 
@@ -415,6 +467,8 @@ class SpatioTemporalTopologyBuilder(object):
 
            :param maps: A sorted (by start_time)list of abstract_dataset
                         objects with initiated temporal extent
+           :param order: The indices of the maps sorted by start time,
+                         the maps are sorted if None
         """
 #        for i in xrange(len(maps)):
 #            offset = i + 1
@@ -428,8 +482,11 @@ class SpatioTemporalTopologyBuilder(object):
 #                    break
 
         # First we need to order the map list chronologically
-        sorted_maps = sorted(
-            maps, key=AbstractDatasetComparisonKeyStartTime)
+        if order is None:
+            sorted_maps = sorted(
+                maps, key=AbstractDatasetComparisonKeyStartTime)
+        else:
+            sorted_maps = [maps[i] for i in order]
 
         for i in xrange(len(sorted_maps) - 1):
             sorted_maps[i].set_next(sorted_maps[i + 1])
@@ -515,8 +572,10 @@ class SpatioTemporalTopologyBuilder(object):
 
            :param mapsA: A list of abstract_dataset
                          objects with initiated spatio-temporal extent
+                         or a RegisteredMapArray
            :param mapsB: An optional list of abstract_dataset
                          objects with initiated spatio-temporal extent
+                         or a RegisteredMapArray
            :param spatial: This indicates if the spatial topology is created
                            as well: spatial can be None (no spatial topology),
                            "2D" using west, east, south, north or "3D" using
@@ -538,6 +597,10 @@ class SpatioTemporalTopologyBuilder(object):
             for map_ in mapsB:
                 map_.reset_topology()
 
+        if self._vectorized and \
+           self._build_vectorized(mapsA, mapsB, identical, spatial):
+            return
+
         tree = self. _build_rtree(mapsA, spatial)
 
         list_ = gis.G_new_ilist()
@@ -570,6 +633,88 @@ class SpatioTemporalTopologyBuilder(object):
 
         rtree.RTreeDestroyTree(tree)
 
+    def _build_vectorized(self, mapsA, mapsB, identical, spatial=None):
+        """Build the spatio-temporal topology structure with numpy
+
+           The start and end times and the spatial extents of both map
+           lists are converted into arrays. The related map pairs are
+           searched with a sweep over the start times of mapsA sorted
+           in ascending order, the temporal relations of all pairs are
+           computed at once with compute_temporal_relations() and set in
+           the topology structure of the maps.
+
+           The map pairs are processed ordered by the index of the map
+           in mapsB and then by the index of the map in mapsA.
+
+           :param mapsA: A list of abstract_dataset objects
+                         or a RegisteredMapArray
+           :param mapsB: A list of abstract_dataset objects
+                         or a RegisteredMapArray
+           :param identical: True if mapsA and mapsB are the same list
+           :param spatial: None, "2D" or "3D", see build()
+           :return: False if the maps have different temporal types or
+                    relative time units, the topology was not build in
+                    this case, True otherwise
+        """
+        arrayA = create_registered_map_array(mapsA)
+        if identical:
+            arrayB = arrayA
+        else:
+            arrayB = create_registered_map_array(mapsB)
+
+        if arrayA is None or arrayB is None:
+            return False
+        if len(arrayA) > 0 and len(arrayB) > 0 and \
+           (arrayA.temporal_type != arrayB.temporal_type or
+                arrayA.unit != arrayB.unit):
+            return False
+
+        # The key of each set relation to avoid duplicates
+        relations = set()
+
+        for a_indices, b_indices in _get_topology_candidates(arrayA, arrayB,
+                                                             spatial):
+            codes = compute_temporal_relations(
+                arrayA.start_time.data[a_indices],
+                arrayA.end_time.data[a_indices],
+                ~numpy.ma.getmaskarray(arrayA.end_time)[a_indices],
+                arrayB.start_time.data[b_indices],
+                arrayB.end_time.data[b_indices],
+                ~numpy.ma.getmaskarray(arrayB.end_time)[b_indices])
+
+            for i, j, code in zip(a_indices.tolist(), b_indices.tolist(),
+                                  codes.tolist()):
+                if code < 0:
+                    continue
+                A = mapsA[i]
+                B = mapsB[j]
+                for owner, name, target in \
+                        _TEMPORAL_RELATION_ENTRIES[TEMPORAL_RELATIONS[code]]:
+                    if owner == "A":
+                        owner, target = A, B
+                    else:
+                        owner, target = B, A
+                    if name == "equal" and A is B:
+                        continue
+                    key = (id(owner), name, id(target))
+                    if key not in relations:
+                        relations.add(key)
+                        getattr(owner, "append_" + name)(target)
+
+            if spatial is not None:
+                for i, j in zip(a_indices.tolist(), b_indices.tolist()):
+                    A = mapsA[i]
+                    B = mapsB[j]
+                    set_spatial_relationship(A, B, B.spatial_relation(A))
+
+        self._build_internal_iteratable(mapsA, spatial,
+                                        _get_start_time_order(arrayA))
+        if not identical:
+            self._build_iteratable(mapsB, spatial,
+                                   _get_start_time_order(arrayB))
+
+        return True
+
     def __iter__(self):
         start_ = self._first
         while start_ is not None:
@@ -587,6 +732,241 @@ class SpatioTemporalTopologyBuilder(object):
 
 ###############################################################################
 
+# The temporal relations in the order in which they are checked by
+# TemporalExtent.temporal_relation(), the index of a relation is the
+# code returned by compute_temporal_relations()
+TEMPORAL_RELATIONS = ("equal", "during", "contains", "overlaps",
+                      "overlapped", "after", "before", "starts", "finishes",
+                      "started", "finished", "follows", "precedes")
+
+# The entries (owner, relation, target) that set_temoral_relationship()
+# appends to the topology of the maps A and B for a relation of B to A
+_TEMPORAL_RELATION_ENTRIES = {
+    "equal": (("B", "equal", "A"), ("A", "equal", "B")),
+    "during": (("B", "during", "A"), ("A", "contains", "B")),
+    "contains": (("B", "contains", "A"), ("A", "during", "B")),
+    "overlaps": (("B", "overlaps", "A"), ("A", "overlapped", "B")),
+    "overlapped": (("B", "overlapped", "A"), ("A", "overlaps", "B")),
+    "after": (),
+    "before": (),
+    "starts": (("B", "during", "A"), ("A", "contains", "B"),
+               ("B", "starts", "A"), ("A", "started", "B")),
+    "finishes": (("B", "during", "A"), ("A", "contains", "B"),
+                 ("B", "finishes", "A"), ("A", "finished", "B")),
+    "started": (("B", "contains", "A"), ("A", "during", "B"),
+                ("B", "started", "A"), ("A", "starts", "B")),
+    "finished": (("B", "contains", "A"), ("A", "during", "B"),
+                 ("B", "finished", "A"), ("A", "finishes", "B")),
+    "follows": (("B", "follows", "A"), ("A", "precedes", "B")),
+    "precedes": (("B", "precedes", "A"), ("A", "follows", "B")),
+}
+
+
+def compute_temporal_relations(start_a, end_a, has_end_a, start_b, end_b,
+                               has_end_b):
+    """Compute the temporal relations of the intervals B to the
+       intervals A element by element
+
+       The relations are identical to the relations computed by
+       TemporalExtent.temporal_relation() with B as this extent
+       and A as the provided extent.
+
+       .. code-block:: python
+
+            >>> codes = compute_temporal_relations(
+            ...     [0, 0, 0, 0, 5], [10, 10, 10, 10, 0],
+            ...     [True, True, True, True, False],
+            ...     [0, 2, 10, 0, 5], [10, 5, 0, 5, 0],
+            ...     [True, True, False, True, False])
+            >>> [TEMPORAL_RELATIONS[code] for code in codes]
+            ['equal', 'during', 'follows', 'starts', 'equal']
+            >>> compute_temporal_relations([0], [2], [True],
+            ...                            [3], [4], [True]).tolist()
+            [5]
+
+       :param start_a: An array of the start times of A
+       :param end_a: An array of the end times of A, the values of time
+                     instances are ignored
+       :param has_end_a: A boolean array that is False for time instances
+       :param start_b: An array of the start times of B
+       :param end_b: An array of the end times of B, the values of time
+                     instances are ignored
+       :param has_end_b: A boolean array that is False for time instances
+       :return: An integer array with the index of the relation in
+                TEMPORAL_RELATIONS, -1 if there is no relation
+    """
+    sA = numpy.asarray(start_a)
+    eA = numpy.asarray(end_a)
+    pA = numpy.asarray(has_end_a, dtype=bool)
+    sB = numpy.asarray(start_b)
+    eB = numpy.asarray(end_b)
+    pB = numpy.asarray(has_end_b, dtype=bool)
+    intervals = pA & pB
+
+    # Same order as in TemporalExtent.temporal_relation()
+    conditions = [
+        # equal
+        (sB == sA) & ((~pA & ~pB) | (intervals & (eB == eA))),
+        # during
+        pA & numpy.where(pB, (sB > sA) & (eB < eA), (sB >= sA) & (sB < eA)),
+        # contains
+        pB & numpy.where(pA, (sB < sA) & (eB > eA), (sB <= sA) & (eB > sA)),
+        # overlaps
+        intervals & (sB < sA) & (eB < eA) & (eB > sA),
+        # overlapped
+        intervals & (sB > sA) & (eB > eA) & (sB < eA),
+        # after
+        numpy.where(pA, sB > eA, sB > sA),
+        # before
+        numpy.where(pB, eB < sA, sB < sA),
+        # starts
+        intervals & (sB == sA) & (eB < eA),
+        # finishes
+        intervals & (eB == eA) & (sB > sA),
+        # started
+        intervals & (sB == sA) & (eB > eA),
+        # finished
+        intervals & (eB == eA) & (sB < sA),
+        # follows
+        pA & (sB == eA),
+        # precedes
+        pB & (eB == sA)]
+
+    return numpy.select(conditions, range(len(TEMPORAL_RELATIONS)),
+                        default=-1)
+
+
+def _get_topology_candidates(arrayA, arrayB, spatial=None,
+                             chunk_size=10000, max_pairs=1000000):
+    """Find the pairs of maps of which the closed spatio-temporal
+       extents intersect
+
+       This is the same test as the search in the R*-Tree. The maps of A
+       are grouped by the binary magnitude of their duration and sorted by
+       start time in each group. For each map of B the maps of a group
+       which start before the end of B and not earlier than the start of B
+       minus the longest duration of the group are searched with a binary
+       search. Hence a few long maps do not widen the search window of
+       all other maps. The pairs are reduced to the maps of A that end
+       after the start of B and optionally to the pairs with intersecting
+       spatial extents.
+
+       The maps of B are processed in chunks and the candidate pairs of a
+       chunk are expanded in parts to limit the memory.
+
+       :param arrayA: A RegisteredMapArray
+       :param arrayB: A RegisteredMapArray
+       :param spatial: None, "2D" or "3D"
+       :param chunk_size: The number of maps of B that are processed at once
+       :param max_pairs: The number of candidate pairs that are expanded
+                         at once, a single map of B may exceed it
+       :return: A generator of index array tuples (indices of A,
+                indices of B) ordered by the index of B and the index of A
+    """
+    # Time instances have the start time as end time in the search
+    startA = arrayA.start_time.data
+    endA = numpy.where(numpy.ma.getmaskarray(arrayA.end_time), startA,
+                       arrayA.end_time.data)
+    startB = arrayB.start_time.data
+    endB = numpy.where(numpy.ma.getmaskarray(arrayB.end_time), startB,
+                       arrayB.end_time.data)
+
+    validA = numpy.nonzero(~numpy.ma.getmaskarray(arrayA.start_time))[0]
+    validB = numpy.nonzero(~numpy.ma.getmaskarray(arrayB.start_time))[0]
+    if len(validA) == 0 or len(validB) == 0:
+        return
+
+    # Group the maps of A by the binary magnitude of their duration, the
+    # durations in a group differ at most by a factor of two
+    durations = endA[validA] - startA[validA]
+    classes = numpy.zeros(len(validA), dtype=numpy.int64)
+    positive = durations > 0
+    classes[positive] = numpy.floor(
+        numpy.log2(durations[positive].astype(numpy.float64))) + 1
+    groups = []
+    for duration_class in numpy.unique(classes):
+        members = validA[classes == duration_class]
+        order = members[numpy.argsort(startA[members], kind="mergesort")]
+        max_duration = max((endA[members] - startA[members]).max(), 0)
+        groups.append((order, startA[order], max_duration))
+
+    for index in xrange(0, len(validB), chunk_size):
+        b = validB[index:index + chunk_size]
+        found_a = []
+        found_b = []
+        for order, sorted_start, max_duration in groups:
+            lower = numpy.searchsorted(sorted_start, startB[b] - max_duration,
+                                       "left")
+            upper = numpy.searchsorted(sorted_start, endB[b], "right")
+            counts = upper - lower
+            cumulative = counts.cumsum()
+            # Expand the candidate pairs in parts of at most max_pairs pairs
+            part_start = 0
+            while part_start < len(b):
+                base = cumulative[part_start - 1] if part_start else 0
+                if cumulative[-1] == base:
+                    break
+                part_stop = max(numpy.searchsorted(cumulative,
+                                                   base + max_pairs, "right"),
+                                part_start + 1)
+                part = slice(part_start, part_stop)
+                a_indices, b_indices = _filter_candidate_pairs(
+                    arrayA, arrayB, endA, startB, order, lower[part],
+                    counts[part], b[part], spatial)
+                found_a.append(a_indices)
+                found_b.append(b_indices)
+                part_start = part_stop
+
+        if not found_a:
+            continue
+        a_indices = numpy.concatenate(found_a)
+        b_indices = numpy.concatenate(found_b)
+        if len(a_indices) == 0:
+            continue
+        pairs = numpy.lexsort((a_indices, b_indices))
+        yield a_indices[pairs], b_indices[pairs]
+
+
+def _filter_candidate_pairs(arrayA, arrayB, endA, startB, order, lower,
+                            counts, b, spatial):
+    """Expand the ranges of sorted A indices for each map of B and return
+       the pairs of which the closed extents intersect
+
+       :return: A tuple of index arrays (indices of A, indices of B)
+    """
+    total = counts.sum()
+    b_indices = numpy.repeat(b, counts)
+    offsets = numpy.arange(total) - numpy.repeat(counts.cumsum() - counts,
+                                                 counts)
+    a_indices = order[numpy.repeat(lower, counts) + offsets]
+
+    keep = endA[a_indices] >= startB[b_indices]
+    if spatial is not None:
+        keep &= (arrayA.west[a_indices] <= arrayB.east[b_indices]) & \
+            (arrayA.east[a_indices] >= arrayB.west[b_indices]) & \
+            (arrayA.south[a_indices] <= arrayB.north[b_indices]) & \
+            (arrayA.north[a_indices] >= arrayB.south[b_indices])
+    if spatial == "3D":
+        keep &= (arrayA.bottom[a_indices] <= arrayB.top[b_indices]) & \
+            (arrayA.top[a_indices] >= arrayB.bottom[b_indices])
+    return a_indices[keep], b_indices[keep]
+
+
+def _get_start_time_order(array):
+    """Return the indices of the maps sorted by start time
+
+       Maps without start time are placed first and the order of maps
+       with equal start time is kept, as by sorted() with
+       AbstractDatasetComparisonKeyStartTime.
+
+       :param array: A RegisteredMapArray
+       :return: A list of indices
+    """
+    valid = ~numpy.ma.getmaskarray(array.start_time)
+    return numpy.lexsort((array.start_time.data, valid)).tolist()
+
+###############################################################################
+
 
 def set_temoral_relationship(A, B, relation):
     if relation == "equal" or relation == "equals":
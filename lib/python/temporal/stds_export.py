@@ -29,6 +29,8 @@ import shutil
 import os
 import tarfile
 import tempfile
+from collections import deque
+from multiprocessing import Pool
 
 from space_time_datasets import *
 from factory import *
@@ -52,70 +54,143 @@ exported_maps = {}
 ############################################################################
 
 
-def _export_raster_maps_as_gdal(rows, tar, list_file, new_cwd, fs, format_):
+def _run_in_order(func, tasks, nprocs=1):
+    """Generator that calls func(*task) for each task and yields the
+       results in the order of the tasks.
+
+       If nprocs is larger than one the tasks are processed by a pool of
+       nprocs worker processes. At most 2 * nprocs tasks are processed
+       ahead of the consumer, so that the files created by the tasks
+       do not pile up on disk when the consumer is slower than the
+       workers.
+
+       :param func: A module level function that is called for each task
+       :param tasks: A list of argument tuples
+       :param nprocs: The number of worker processes
+    """
+    if nprocs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+
+    pool = Pool(processes=min(nprocs, len(tasks)))
+    pending = deque()
+    tasks = iter(tasks)
+    try:
+        while True:
+            for task in tasks:
+                pending.append(pool.apply_async(func, task))
+                if len(pending) >= 2 * nprocs:
+                    break
+            if not pending:
+                break
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+############################################################################
+
+
+def _add_exported_maps(func, tasks, tar, new_cwd, nprocs):
+    """Export the maps with func and add the created files to the tar
+       archive as soon as a map is exported. The files are removed
+       after they were added to the archive.
+
+       The export function must return a tuple with the list of created
+       file names and an error message that is None in case of success.
+    """
+    results = _run_in_order(func, tasks, nprocs)
+    try:
+        for files, error in results:
+            if error:
+                shutil.rmtree(new_cwd)
+                tar.close()
+                gscript.fatal(error)
+            for name in files:
+                tar.add(name)
+                os.remove(name)
+    finally:
+        results.close()
+
+############################################################################
+
+
+def _export_raster_map_as_gdal(name, datatype, min_val, max_val, format_):
+    try:
+        if format_ == "GTiff":
+            # Export the raster map with r.out.gdal as tif
+            out_name = name + ".tif"
+            if datatype == "CELL":
+                nodata = max_val + 1
+                if nodata < 256 and min_val >= 0:
+                    gdal_type = "Byte"
+                elif nodata < 65536 and min_val >= 0:
+                    gdal_type = "UInt16"
+                elif min_val >= 0:
+                    gdal_type = "UInt32"
+                else:
+                    gdal_type = "Int32"
+                gscript.run_command("r.out.gdal", flags="c", input=name,
+                                    output=out_name, nodata=nodata,
+                                    type=gdal_type, format="GTiff")
+            else:
+                gscript.run_command("r.out.gdal", flags="c",
+                                    input=name, output=out_name,
+                                    format="GTiff")
+        elif format_ == "AAIGrid":
+            # Export the raster map with r.out.gdal as Arc/Info ASCII Grid
+            out_name = name + ".asc"
+            gscript.run_command("r.out.gdal", flags="c", input=name,
+                                output=out_name, format="AAIGrid")
+
+    except CalledModuleError:
+        return [], _("Unable to export raster map <%s>" % name)
+
+    # Export the color rules
+    color_name = name + ".color"
+    try:
+        gscript.run_command("r.colors.out", map=name, rules=color_name)
+    except CalledModuleError:
+        return [], _("Unable to export color rules for raster "
+                     "map <%s> r.out.gdal" % name)
+
+    return [out_name, color_name], None
+
+
+def _export_raster_maps_as_gdal(rows, tar, list_file, new_cwd, fs, format_,
+                                nprocs=1):
+    tasks = []
     for row in rows:
         name = row["name"]
         start = row["start_time"]
         end = row["end_time"]
-        max_val = row["max"]
-        min_val = row["min"]
-        datatype = row["datatype"]
         if not end:
             end = start
         string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
         # Write the filename, the start_time and the end_time
         list_file.write(string)
+        tasks.append((name, row["datatype"], row["min"], row["max"],
+                      format_))
 
-        try:
-            if format_ == "GTiff":
-                # Export the raster map with r.out.gdal as tif
-                out_name = name + ".tif"
-                if datatype == "CELL":
-                    nodata = max_val + 1
-                    if nodata < 256 and min_val >= 0:
-                        gdal_type = "Byte"
-                    elif nodata < 65536 and min_val >= 0:
-                        gdal_type = "UInt16"
-                    elif min_val >= 0:
-                        gdal_type = "UInt32"
-                    else:
-                        gdal_type = "Int32"
-                    gscript.run_command("r.out.gdal", flags="c", input=name,
-                                        output=out_name, nodata=nodata,
-                                        type=gdal_type, format="GTiff")
-                else:
-                    gscript.run_command("r.out.gdal", flags="c",
-                                        input=name, output=out_name,
-                                        format="GTiff")
-            elif format_ == "AAIGrid":
-                # Export the raster map with r.out.gdal as Arc/Info ASCII Grid
-                out_name = name + ".asc"
-                gscript.run_command("r.out.gdal", flags="c", input=name,
-                                    output=out_name, format="AAIGrid")
+    _add_exported_maps(_export_raster_map_as_gdal, tasks, tar, new_cwd,
+                       nprocs)
 
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export raster map <%s>" % name))
+############################################################################
 
-        tar.add(out_name)
 
-        # Export the color rules
-        out_name = name + ".color"
-        try:
-            gscript.run_command("r.colors.out", map=name, rules=out_name)
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export color rules for raster "
-                            "map <%s> r.out.gdal" % name))
+def _export_raster_map(name):
+    # Export the raster map with r.pack
+    try:
+        gscript.run_command("r.pack", input=name, flags="c")
+    except CalledModuleError:
+        return [], _("Unable to export raster map <%s> with r.pack" % name)
 
-        tar.add(out_name)
+    return [name + ".pack"], None
 
-############################################################################
 
-
-def _export_raster_maps(rows, tar, list_file, new_cwd, fs):
+def _export_raster_maps(rows, tar, list_file, new_cwd, fs, nprocs=1):
+    tasks = []
     for row in rows:
         name = row["name"]
         start = row["start_time"]
@@ -125,21 +200,27 @@ def _export_raster_maps(rows, tar, list_file, new_cwd, fs):
         string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
         # Write the filename, the start_time and the end_time
         list_file.write(string)
-        # Export the raster map with r.pack
-        try:
-            gscript.run_command("r.pack", input=name, flags="c")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export raster map <%s> with r.pack" %
-                          name))
+        tasks.append((name,))
 
-        tar.add(name + ".pack")
+    _add_exported_maps(_export_raster_map, tasks, tar, new_cwd, nprocs)
 
 ############################################################################
 
 
-def _export_vector_maps_as_gml(rows, tar, list_file, new_cwd, fs):
+def _export_vector_map_as_gml(name, layer):
+    # Export the vector map with v.out.ogr
+    try:
+        gscript.run_command("v.out.ogr", input=name, output=(name + ".xml"),
+                            layer=layer, format="GML")
+    except CalledModuleError:
+        return [], _("Unable to export vector map <%s> as "
+                     "GML with v.out.ogr" % name)
+
+    return [name + ".xml", name + ".xsd"], None
+
+
+def _export_vector_maps_as_gml(rows, tar, list_file, new_cwd, fs, nprocs=1):
+    tasks = []
     for row in rows:
         name = row["name"]
         start = row["start_time"]
@@ -152,23 +233,26 @@ def _export_vector_maps_as_gml(rows, tar, list_file, new_cwd, fs):
         string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
         # Write the filename, the start_time and the end_time
         list_file.write(string)
-        # Export the vector map with v.out.ogr
-        try:
-            gscript.run_command("v.out.ogr", input=name, output=(name + ".xml"),
-                                layer=layer, format="GML")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export vector map <%s> as "
-                            "GML with v.out.ogr" % name))
-
-        tar.add(name + ".xml")
-        tar.add(name + ".xsd")
+        tasks.append((name, layer))
+
+    _add_exported_maps(_export_vector_map_as_gml, tasks, tar, new_cwd,
+                       nprocs)
 
 ############################################################################
 
 
-def _export_vector_maps(rows, tar, list_file, new_cwd, fs):
+def _export_vector_map(name):
+    # Export the vector map with v.pack
+    try:
+        gscript.run_command("v.pack", input=name, flags="c")
+    except CalledModuleError:
+        return [], _("Unable to export vector map <%s> with v.pack" % name)
+
+    return [name + ".pack"], None
+
+
+def _export_vector_maps(rows, tar, list_file, new_cwd, fs, nprocs=1):
+    tasks = []
     for row in rows:
         name = row["name"]
         start = row["start_time"]
@@ -186,23 +270,27 @@ def _export_vector_maps(rows, tar, list_file, new_cwd, fs):
         string = "%s:%s%s%s%s%s\n" % (name, layer, fs, start, fs, end)
         # Write the filename, the start_time and the end_time
         list_file.write(string)
-        # Export the vector map with v.pack
-        try:
-            gscript.run_command("v.pack", input=name, flags="c")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export vector map <%s> with v.pack" %
-                          name))
-
-        tar.add(name + ".pack")
+        tasks.append((name,))
 
         exported_maps[name] = name
 
+    _add_exported_maps(_export_vector_map, tasks, tar, new_cwd, nprocs)
+
 ############################################################################
 
 
-def _export_raster3d_maps(rows, tar, list_file, new_cwd, fs):
+def _export_raster3d_map(name):
+    # Export the raster 3d map with r3.pack
+    try:
+        gscript.run_command("r3.pack", input=name, flags="c")
+    except CalledModuleError:
+        return [], _("Unable to export raster map <%s> with r3.pack" % name)
+
+    return [name + ".pack"], None
+
+
+def _export_raster3d_maps(rows, tar, list_file, new_cwd, fs, nprocs=1):
+    tasks = []
     for row in rows:
         name = row["name"]
         start = row["start_time"]
@@ -212,22 +300,15 @@ def _export_raster3d_maps(rows, tar, list_file, new_cwd, fs):
         string = "%s%s%s%s%s\n" % (name, fs, start, fs, end)
         # Write the filename, the start_time and the end_time
         list_file.write(string)
-        # Export the raster 3d map with r3.pack
-        try:
-            gscript.run_command("r3.pack", input=name, flags="c")
-        except CalledModuleError:
-            shutil.rmtree(new_cwd)
-            tar.close()
-            gscript.fatal(_("Unable to export raster map <%s> with r3.pack" %
-                          name))
+        tasks.append((name,))
 
-        tar.add(name + ".pack")
+    _add_exported_maps(_export_raster3d_map, tasks, tar, new_cwd, nprocs)
 
 ############################################################################
 
 
 def export_stds(input, output, compression, directory, where, format_="pack",
-                type_="strds"):
+                type_="strds", nprocs=1):
     """Export space time datasets as tar archive with optional compression
 
         This method should be used to export space time datasets
@@ -259,6 +340,10 @@ def export_stds(input, output, compression, directory, where, format_="pack",
               - "strds" Space time raster dataset
               - "str3ds" Space time 3D raster dataset
               - "stvds" Space time vector dataset
+
+        :param nprocs: The number of processes used to export the maps,
+                       the exported files are added to the archive in
+                       temporal order as soon as they are available
     """
 
     # Save current working directory path
@@ -295,16 +380,19 @@ def export_stds(input, output, compression, directory, where, format_="pack",
         if type_ == "strds":
             if format_ == "GTiff" or format_ == "AAIGrid":
                 _export_raster_maps_as_gdal(
-                    rows, tar, list_file, new_cwd, fs, format_)
+                    rows, tar, list_file, new_cwd, fs, format_, nprocs)
             else:
-                _export_raster_maps(rows, tar, list_file, new_cwd, fs)
+                _export_raster_maps(rows, tar, list_file, new_cwd, fs,
+                                    nprocs)
         elif type_ == "stvds":
             if format_ == "GML":
-                _export_vector_maps_as_gml(rows, tar, list_file, new_cwd, fs)
+                _export_vector_maps_as_gml(rows, tar, list_file, new_cwd, fs,
+                                           nprocs)
             else:
-                _export_vector_maps(rows, tar, list_file, new_cwd, fs)
+                _export_vector_maps(rows, tar, list_file, new_cwd, fs,
+                                    nprocs)
         elif type_ == "str3ds":
-            _export_raster3d_maps(rows, tar, list_file, new_cwd, fs)
+            _export_raster3d_maps(rows, tar, list_file, new_cwd, fs, nprocs)
 
     list_file.close()
 
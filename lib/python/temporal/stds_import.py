@@ -35,6 +35,7 @@ import tarfile
 
 from space_time_datasets import *
 from register import *
+from stds_export import _run_in_order
 import factory
 from factory import *
 import grass.script as gscript
@@ -52,48 +53,61 @@ imported_maps = {}
 ############################################################################
 
 
+def _import_raster_map_from_gdal(name, filename, color_filename, link,
+                                 impflags, overwrite):
+    try:
+        if link:
+            gscript.run_command("r.external", input=filename,
+                                output=name,
+                                flags=impflags,
+                                overwrite=overwrite)
+        else:
+            gscript.run_command("r.in.gdal", input=filename,
+                                output=name,
+                                flags=impflags,
+                                overwrite=overwrite)
+
+    except CalledModuleError:
+        return _("Unable to import/link raster map <%s> from file"
+                 " %s.") % (name, filename)
+
+    # Set the color rules if present
+    if os.path.isfile(color_filename):
+        try:
+            gscript.run_command("r.colors", map=name,
+                                rules=color_filename,
+                                overwrite=overwrite)
+        except CalledModuleError:
+            return _("Unable to set the color rules for "
+                     "raster map <%s>.") % name
+
+    return None
+
+
 def _import_raster_maps_from_gdal(maplist, overr, exp, location, link, format_,
-                                  set_current_region=False):
+                                  set_current_region=False, nprocs=1):
     impflags = ""
     if overr:
         impflags += "o"
     if exp or location:
         impflags += "e"
+        # The extension of the location extents is not safe for
+        # concurrent imports
+        nprocs = 1
+    if format_ == "AAIGrid" and not overr:
+        impflags += "o"
+
+    tasks = []
     for row in maplist:
         name = row["name"]
         if format_ == "GTiff":
             filename = row["filename"] + ".tif"
         elif format_ == "AAIGrid":
             filename = row["filename"] + ".asc"
-            if not overr:
-                impflags += "o"
-
-        try:
-            if link:
-                gscript.run_command("r.external", input=filename,
-                                    output=name,
-                                    flags=impflags,
-                                    overwrite=gscript.overwrite())
-            else:
-                gscript.run_command("r.in.gdal", input=filename,
-                                    output=name,
-                                    flags=impflags,
-                                    overwrite=gscript.overwrite())
+        tasks.append((name, filename, row["filename"] + ".color", link,
+                      impflags, gscript.overwrite()))
 
-        except CalledModuleError:
-            gscript.fatal(_("Unable to import/link raster map <%s> from file"
-                            " %s.") % (name, filename))
-
-        # Set the color rules if present
-        filename = row["filename"] + ".color"
-        if os.path.isfile(filename):
-            try:
-                gscript.run_command("r.colors", map=name,
-                                    rules=filename,
-                                    overwrite=gscript.overwrite())
-            except CalledModuleError:
-                gscript.fatal(_("Unable to set the color rules for "
-                                "raster map <%s>.") % name)
+    _import_maps(_import_raster_map_from_gdal, tasks, nprocs)
 
     # Set the computational region from the last map imported
     if set_current_region is True:
@@ -102,22 +116,31 @@ def _import_raster_maps_from_gdal(maplist, overr, exp, location, link, format_,
 ############################################################################
 
 
-def _import_raster_maps(maplist, set_current_region=False):
+def _import_raster_map(name, filename, impflags, overwrite):
+    try:
+        gscript.run_command("r.unpack", input=filename,
+                            output=name, flags=impflags,
+                            overwrite=overwrite,
+                            verbose=True)
+
+    except CalledModuleError:
+        return _("Unable to unpack raster map <%s> from file "
+                 "%s.") % (name, filename)
+
+    return None
+
+
+def _import_raster_maps(maplist, set_current_region=False, nprocs=1):
     # We need to disable the projection check because of its
     # simple implementation
     impflags = "o"
+    tasks = []
     for row in maplist:
         name = row["name"]
         filename = row["filename"] + ".pack"
-        try:
-            gscript.run_command("r.unpack", input=filename,
-                                output=name, flags=impflags,
-                                overwrite=gscript.overwrite(),
-                                verbose=True)
+        tasks.append((name, filename, impflags, gscript.overwrite()))
 
-        except CalledModuleError:
-            gscript.fatal(_("Unable to unpack raster map <%s> from file "
-                            "%s.") % (name, filename))
+    _import_maps(_import_raster_map, tasks, nprocs)
 
     # Set the computational region from the last map imported
     if set_current_region is True:
@@ -126,6 +149,21 @@ def _import_raster_maps(maplist, set_current_region=False):
 ############################################################################
 
 
+def _import_maps(func, tasks, nprocs):
+    """Import the maps with func using nprocs processes, the import
+       function must return None in case of success or an error message
+    """
+    results = _run_in_order(func, tasks, nprocs)
+    try:
+        for error in results:
+            if error:
+                gscript.fatal(error)
+    finally:
+        results.close()
+
+############################################################################
+
+
 def _import_vector_maps_from_gml(maplist, overr, exp, location, link):
     impflags = "o"
     if exp or location:
@@ -173,7 +211,8 @@ def _import_vector_maps(maplist):
 
 def import_stds(input, output, directory, title=None, descr=None, location=None,
                 link=False, exp=False, overr=False, create=False,
-                stds_type="strds", base=None, set_current_region=False):
+                stds_type="strds", base=None, set_current_region=False,
+                nprocs=1):
     """Import space time datasets of type raster and vector
 
         :param input: Name of the input archive file
@@ -194,6 +233,11 @@ def import_stds(input, output, directory, title=None, descr=None, location=None,
                          should be imported
         :param base: The base name of the new imported maps, it will be
                      extended using a numerical index.
+        :param set_current_region: Set the current region from the last
+                                   map that was imported
+        :param nprocs: The number of processes used to import raster maps,
+                       the imported maps are registered at once in the
+                       new space time dataset
     """
 
     global raise_on_error
@@ -437,9 +481,10 @@ def import_stds(input, output, directory, title=None, descr=None, location=None,
         if type_ == "strds":
             if format_ == "GTiff" or format_ == "AAIGrid":
                 _import_raster_maps_from_gdal(maplist, overr, exp, location,
-                                              link, format_, set_current_region)
+                                              link, format_, set_current_region,
+                                              nprocs)
             if format_ == "pack":
-                _import_raster_maps(maplist, set_current_region)
+                _import_raster_maps(maplist, set_current_region, nprocs)
         elif type_ == "stvds":
             if format_ == "GML":
                 _import_vector_maps_from_gml(
@@ -654,7 +654,7 @@ class TemporalAlgebraLexer(object):
 
     # Build the lexer
     def build(self,**kwargs):
-        self.lexer = lex.lex(module=self, optimize=False, debug=False, **kwargs)
+        self.lexer = build_lexer(self, debug=False, **kwargs)
 
     # Just for testing
     def test(self,data):
@@ -724,9 +724,110 @@ class FatalError(Exception):
 
 ###############################################################################
 
+class TemporalAlgebraExpression(object):
+    """A temporal algebra expression compiled into a list of lexer tokens
+
+       Compiled expressions are created with the compile() method of a
+       temporal algebra parser and are evaluated with its parse() method.
+       The expression is tokenized and checked for lexical errors only
+       once, the names of the space time datasets can be replaced to
+       evaluate the same expression with other space time datasets.
+
+       .. code-block:: python
+
+           >>> import grass.temporal as tgis
+           >>> tgis.init()
+           >>> p = tgis.TemporalAlgebraParser(run=False, debug=False)
+           >>> expr = p.compile("C = A : tmap(D) : B")
+           >>> expr.get_stds_names()
+           ['C', 'A', 'B']
+           >>> new_expr = expr.substitute({"A": "prec", "C": "result"})
+           >>> new_expr.expression
+           'result = prec : tmap(D) : B'
+           >>> [tok.value for tok in new_expr.tokens if tok.type == "NAME"]
+           ['result', 'prec', 'D', 'B']
+           >>> expr.expression
+           'C = A : tmap(D) : B'
+
+    """
+    def __init__(self, expression, tokens):
+        self.expression = expression
+        self.tokens = tokens
+
+    def _get_stds_token_indices(self):
+        """Return the indices of the tokens that are space time dataset
+           names, names of single maps defined with map() or tmap() are
+           ignored"""
+        indices = []
+        for i, tok in enumerate(self.tokens):
+            # Ignore map layer
+            if i > 1 and self.tokens[i - 2].type in ["MAP", "TMAP"]:
+                continue
+            if tok.type == "NAME":
+                indices.append(i)
+        return indices
+
+    def get_stds_names(self):
+        """Return the names of the space time datasets of the expression
+
+           Names of single maps defined with map() or tmap() are ignored.
+
+           :return: A list of names in the order of the expression
+        """
+        return [self.tokens[i].value for i in self._get_stds_token_indices()]
+
+    def substitute(self, names):
+        """Return a new compiled expression with replaced space time
+           dataset names
+
+           :param names: A dictionary that maps the names in the expression
+                         to new names
+           :return: A new TemporalAlgebraExpression object
+        """
+        stds_indices = set(self._get_stds_token_indices())
+        expression = ""
+        tokens = []
+        pos = 0
+        shift = 0
+        for i, tok in enumerate(self.tokens):
+            new_tok = lex.LexToken()
+            new_tok.type = tok.type
+            new_tok.value = tok.value
+            new_tok.lineno = tok.lineno
+            new_tok.lexpos = tok.lexpos + shift
+            if i in stds_indices and tok.value in names:
+                new_tok.value = names[tok.value]
+                expression += self.expression[pos:tok.lexpos] + new_tok.value
+                pos = tok.lexpos + len(tok.value)
+                shift += len(new_tok.value) - len(tok.value)
+            tokens.append(new_tok)
+        expression += self.expression[pos:]
+        return TemporalAlgebraExpression(expression, tokens)
+
+###############################################################################
+
+class TemporalAlgebraTokenStream(object):
+    """Provide the tokens of a compiled expression to the parser like a
+       PLY lexer, so that the expression is not tokenized again"""
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.lineno = 1
+        self.lexpos = 0
+
+    def input(self, data):
+        pass
+
+    def token(self):
+        return next(self.tokens, None)
+
+###############################################################################
+
 class TemporalAlgebraParser(object):
     """The temporal algebra class"""
 
+    # The lexer class of the algebra
+    lexer_class = TemporalAlgebraLexer
+
     # Get the tokens from the lexer class
     tokens = TemporalAlgebraLexer.tokens
 
@@ -757,6 +858,11 @@ class TemporalAlgebraParser(object):
         self.m_copy = pymod.Module('g.copy')
         self.nprocs = nprocs
         self.use_granularity = False
+        # The lexer and the parser are built once by the first call of
+        # compile() or parse() and reused by all further calls
+        self.lexer = None
+        self.parser = None
+        self.operator_parser = None
 
     def __del__(self):
         if self.dbif.connected:
@@ -847,11 +953,52 @@ class TemporalAlgebraParser(object):
         
         return True
 
+    def build(self):
+        """Build the lexer and the parser of the algebra
+
+           The lexer and the parser tables are read from the table directory
+           of get_parser_table_dir() if available. The lexer and the parser
+           are only built once for each parser object.
+        """
+        if self.parser is None:
+            self.lexer = self.lexer_class()
+            self.lexer.build()
+            self.parser = build_parser(self, debug=self.debug)
+
+    def compile(self, expression):
+        """Compile an expression into a TemporalAlgebraExpression object
+
+           The compiled expression can be evaluated several times with
+           parse() without tokenizing the expression again.
+
+           :param expression: The algebra expression string or a compiled
+                              expression that is returned unchanged
+           :return: A TemporalAlgebraExpression object
+        """
+        if isinstance(expression, TemporalAlgebraExpression):
+            return expression
+        self.build()
+        self.lexer.lexer.lineno = 1
+        self.lexer.lexer.input(expression)
+        tokens = []
+        while True:
+            tok = self.lexer.lexer.token()
+            if not tok: break
+            tokens.append(tok)
+        return TemporalAlgebraExpression(expression, tokens)
+
+    def parse_compiled(self, compiled):
+        """Evaluate a compiled expression with the parser
+
+           :param compiled: A TemporalAlgebraExpression object
+        """
+        self.build()
+        self.expression = compiled.expression
+        self.parser.parse(lexer=TemporalAlgebraTokenStream(compiled.tokens))
+
     def parse(self, expression, stdstype = 'strds', maptype = 'rast',  mapclass = RasterDataset, 
                       basename = None, overwrite=False):
-        self.lexer = TemporalAlgebraLexer()
-        self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug)
+        compiled = self.compile(expression)
 
         self.overwrite = overwrite
         self.count = 0
@@ -859,8 +1006,7 @@ class TemporalAlgebraParser(object):
         self.maptype = maptype
         self.mapclass = mapclass
         self.basename = basename
-        self.expression = expression
-        self.parser.parse(expression)
+        self.parse_compiled(compiled)
 
     def generate_map_name(self):
         """Generate an unique  map name and register it in the objects map list
@@ -1467,7 +1613,9 @@ class TemporalAlgebraParser(object):
              (['during'], 'l', '+')
 
         """
-        p = TemporalOperatorParser()
+        if self.operator_parser is None:
+            self.operator_parser = TemporalOperatorParser()
+        p = self.operator_parser
         p.parse(operator, optype)
         p.relations = [rel.upper() for rel in p.relations]
         
@@ -2024,6 +2172,12 @@ class TemporalAlgebraParser(object):
                 register_list = []      
                 if num > 0:
                     process_queue = pymod.ParallelModuleQueue(int(self.nprocs))
+                    # Select the registered maps with a single query
+                    selected_maps = {}
+                    for map_i in select_datasets(t[3][0],
+                                                 ids=[map_i.get_id() for map_i in t[3]],
+                                                 dbif=dbif):
+                        selected_maps[map_i.get_id()] = map_i
                     for map_i in t[3]:
                         # Test if temporal extents have been changed by temporal 
                         # relation operators (i|r). 
@@ -2041,8 +2195,11 @@ class TemporalAlgebraParser(object):
                                                            "resulting space time dataset have different types."))
 
                         map_i_extent = map_i.get_temporal_extent_as_tuple()
-                        map_test = map_i.get_new_instance(map_i.get_id())
-                        map_test.select(dbif)
+                        if map_i.get_id() in selected_maps:
+                            map_test = selected_maps[map_i.get_id()]
+                        else:
+                            map_test = map_i.get_new_instance(map_i.get_id())
+                            map_test.select(dbif)
                         map_test_extent = map_test.get_temporal_extent_as_tuple()
                         if map_test_extent != map_i_extent:
                             # Create new map with basename
@@ -19,6 +19,9 @@ for details.
 """
 from abstract_dataset import *
 from datetime_math import *
+from registered_map_array import *
+from spatio_temporal_relationships import *
+import numpy
 
 ###############################################################################
 
@@ -108,7 +111,8 @@ def compute_relative_time_granularity(maps):
         is only correct in case of not overlapping intervals.
         Hence a correct temporal topology is required for computation.
 
-        :param maps: a ordered by start_time list of map objects
+        :param maps: a ordered by start_time list of map objects or a
+                     RegisteredMapArray
         :return: An integer
 
 
@@ -210,6 +214,9 @@ def compute_relative_time_granularity(maps):
             21
 
     """
+    map_array = create_registered_map_array(maps)
+    if map_array is not None:
+        return compute_relative_time_granularity_from_array(map_array)
 
     # The interval time must be scaled to days resolution
     granularity = None
@@ -262,7 +269,8 @@ def compute_absolute_time_granularity(maps):
         The computed granularity is returned as number of seconds or minutes
         or hours or days or months or years.
 
-        :param maps: a ordered by start_time list of map objects
+        :param maps: a ordered by start_time list of map objects or a
+                     RegisteredMapArray
         :return: The temporal topology as string "integer unit"
 
         .. code-block:: python
@@ -332,6 +340,9 @@ def compute_absolute_time_granularity(maps):
             '6 hours'
 
     """
+    map_array = create_registered_map_array(maps)
+    if map_array is not None:
+        return compute_absolute_time_granularity_from_array(map_array)
 
     has_seconds = False
     has_minutes = False
@@ -495,6 +506,252 @@ def compute_absolute_time_granularity(maps):
 
 ###############################################################################
 
+# The units of the absolute time granularity from the finest to the coarsest
+_ABSOLUTE_TIME_GRANULARITY_UNITS = ("second", "minute", "hour", "day",
+                                    "month", "year")
+
+# The factors of the units that are exactly converted into a finer unit
+# by compute_absolute_time_granularity()
+_ABSOLUTE_TIME_GRANULARITY_FACTORS = {("year", "month"): 12,
+                                      ("day", "hour"): 24}
+
+
+def _get_time_delta_pairs(maps, end_time=None):
+    """Return the start and end times of the intervals and of the gaps
+       between the maps that are used to compute the granularity
+
+       Gaps are between maps of which the following map is located after
+       the map. The conditions of compute_relative_time_granularity() and
+       compute_absolute_time_granularity() are applied.
+
+       :param maps: A RegisteredMapArray ordered by start time
+       :param end_time: The end time of maps that precede the maps of the
+                        array, the gap between the end time and the first
+                        map is added
+       :return: A tuple of two integer arrays (start, end) with the
+                integer representation of the time stamps
+    """
+    start = maps.start_time.data
+    end = maps.end_time.data
+    has_start = ~numpy.ma.getmaskarray(maps.start_time)
+    has_end = ~numpy.ma.getmaskarray(maps.end_time)
+    relative = maps.get_temporal_type() == "relative"
+
+    # Relative time stamps with the value 0 are ignored like None
+    if relative:
+        has_end &= end != 0
+
+    # The intervals
+    interval = has_start & has_end
+    starts = [start[interval]]
+    ends = [end[interval]]
+
+    # The gaps between the maps
+    after = compute_temporal_relations(
+        start[:-1], end[:-1], ~numpy.ma.getmaskarray(maps.end_time)[:-1],
+        start[1:], end[1:], ~numpy.ma.getmaskarray(maps.end_time)[1:]) == \
+        TEMPORAL_RELATIONS.index("after")
+    after &= has_start[:-1] & has_start[1:]
+    if relative:
+        after &= start[1:] != 0
+    starts.append(numpy.where(has_end[:-1], end[:-1], start[:-1])[after])
+    ends.append(start[1:][after])
+
+    # The gap between the end time and the first map
+    if end_time is not None and has_start.any():
+        first = start[has_start][0]
+        end_time = maps.time_to_number(end_time)
+        if first > end_time and not (relative and first == 0):
+            starts.insert(0, numpy.array([end_time], dtype=start.dtype))
+            ends.insert(0, numpy.array([first], dtype=start.dtype))
+
+    return numpy.concatenate(starts), numpy.concatenate(ends)
+
+
+def compute_relative_time_granularity_from_array(maps, granularity=None,
+                                                 end_time=None):
+    """Compute the relative time granularity of a RegisteredMapArray
+
+        The result is identical to compute_relative_time_granularity(),
+        the time deltas of all intervals and gaps are computed at once.
+
+        The granularity of a space time dataset can be updated with the
+        maps that were registered after its end time, by providing the
+        granularity and the end time of the space time dataset.
+
+        :param maps: A RegisteredMapArray ordered by start time
+        :param granularity: The granularity of the maps that precede the
+                            maps of the array
+        :param end_time: The end time of the maps that precede the maps of
+                         the array
+        :return: An integer
+
+        .. code-block:: python
+
+            >>> maps = RegisteredMapArray(None, "relative", "days",
+            ...                           ["a@P", "b@P", "c@P"],
+            ...                           [0, 8, 18], [8, 12, None])
+            >>> compute_relative_time_granularity_from_array(maps)
+            2
+            >>> maps = RegisteredMapArray(None, "relative", "days",
+            ...                           ["d@P", "e@P"], [27, 30], [30, 33])
+            >>> compute_relative_time_granularity_from_array(maps, 2, 18)
+            1
+            >>> compute_relative_time_granularity_from_array(maps, 6, 24)
+            3
+    """
+    start, end = _get_time_delta_pairs(maps, end_time)
+    ulist = numpy.unique(numpy.abs(end - start)).tolist()
+    if granularity is not None and granularity not in ulist:
+        ulist.append(granularity)
+
+    if len(ulist) > 1:
+        # Find greatest common divisor
+        return gcd_list(ulist)
+    elif len(ulist) == 1:
+        return ulist[0]
+    return 0
+
+
+def _convert_absolute_time_deltas(delta, unit):
+    """Convert the datetime deltas into a single time unit in the same way
+       as compute_absolute_time_granularity()
+
+       :param delta: The dictionary of compute_datetime_delta_array()
+       :param unit: The time unit
+       :return: An integer array
+    """
+    second = delta["second"]
+    minute = delta["minute"]
+    hour = delta["hour"]
+    day = delta["day"]
+    month = numpy.where(delta["has_month"], delta["month"], 0)
+    year = delta["year"]
+    max_days = delta["max_days"]
+
+    if unit == "second":
+        return numpy.select([second > 0, minute > 0, hour > 0, day > 0],
+                            [second, minute * 60, hour * 3600,
+                             day * 24 * 3600], max_days * 24 * 3600)
+    elif unit == "minute":
+        return numpy.select([minute > 0, hour > 0],
+                            [minute, hour * 60], day * 24 * 60)
+    elif unit == "hour":
+        return numpy.select([hour > 0, day > 0],
+                            [hour, day * 24], max_days * 24)
+    elif unit == "day":
+        return numpy.where(day > 0, day, max_days)
+    elif unit == "month":
+        # Deltas without months and years are ignored
+        return numpy.where(month > 0, month, year * 12)[(month > 0) |
+                                                        (year > 0)]
+    return year
+
+
+def compute_absolute_time_granularity_from_array(maps, granularity=None,
+                                                 end_time=None):
+    """Compute the absolute time granularity of a RegisteredMapArray
+
+        The result is identical to compute_absolute_time_granularity(),
+        the datetime deltas of all intervals and gaps are computed at once
+        with compute_datetime_delta_array().
+
+        The granularity of a space time dataset can be updated with the
+        maps that were registered after its end time, by providing the
+        granularity and the end time of the space time dataset. This is
+        not possible if the new maps require a finer time unit than the
+        provided granularity, except for years to months and days to hours.
+
+        :param maps: A RegisteredMapArray ordered by start time
+        :param granularity: The granularity of the maps that precede the
+                            maps of the array
+        :param end_time: The end time of the maps that precede the maps of
+                         the array
+        :return: The granularity as string "integer unit", None in case no
+                 granularity was found or the provided granularity can not
+                 be updated
+
+        .. code-block:: python
+
+            >>> dt = datetime
+            >>> maps = RegisteredMapArray(None, "absolute", None,
+            ...                           ["a@P", "b@P"],
+            ...                           [dt(2000, 1, 1), dt(2005, 5, 4, 12)],
+            ...                           [dt(2000, 2, 1), dt(2007, 5, 20, 6)])
+            >>> compute_absolute_time_granularity_from_array(maps)
+            '6 hours'
+            >>> maps = RegisteredMapArray(None, "absolute", None,
+            ...                           ["c@P", "d@P"],
+            ...                           [dt(2001, 3, 1), dt(2001, 5, 1)],
+            ...                           [dt(2001, 4, 1), dt(2001, 6, 1)])
+            >>> compute_absolute_time_granularity_from_array(maps, "1 year",
+            ...                                              dt(2001, 1, 1))
+            '1 month'
+            >>> compute_absolute_time_granularity_from_array(maps, "4 days",
+            ...                                              dt(2001, 1, 1))
+            '1 day'
+            >>> compute_absolute_time_granularity_from_array(maps, "1 month",
+            ...                                              dt(2001, 1, 1, 12))
+    """
+    unit = None
+    number = None
+    if granularity is not None:
+        try:
+            number, unit = granularity.split()
+            number = int(number)
+            unit = unit.rstrip("s")
+        except ValueError:
+            return None
+        if unit not in _ABSOLUTE_TIME_GRANULARITY_UNITS:
+            return None
+
+    start, end = _get_time_delta_pairs(maps, end_time)
+    delta = compute_datetime_delta_array(maps.to_datetime64(start),
+                                         maps.to_datetime64(end))
+
+    # Find the finest time unit of the deltas
+    has_unit = {"second": delta["second"] > 0,
+                "minute": delta["minute"] > 0,
+                "hour": delta["hour"] > 0,
+                "day": delta["day"] > 0,
+                "month": delta["has_month"] & (delta["month"] > 0),
+                "year": delta["year"] > 0}
+    for delta_unit in _ABSOLUTE_TIME_GRANULARITY_UNITS:
+        if delta_unit == unit:
+            break
+        if has_unit[delta_unit].any():
+            if unit is not None:
+                factor = _ABSOLUTE_TIME_GRANULARITY_FACTORS.get(
+                    (unit, delta_unit))
+                if factor is None:
+                    # The granularity can not be converted into the unit
+                    return None
+                number *= factor
+            unit = delta_unit
+            break
+
+    if unit is None:
+        return None
+
+    ulist = numpy.unique(_convert_absolute_time_deltas(delta, unit)).tolist()
+    if number is not None and number not in ulist:
+        ulist.append(number)
+
+    if len(ulist) == 0:
+        return None
+
+    if len(ulist) > 1:
+        # Find greatest common divisor
+        granularity = gcd_list(ulist)
+    else:
+        granularity = ulist[0]
+
+    if granularity == 1:
+        return "%i %s" % (granularity, unit)
+    return "%i %ss" % (granularity, unit)
+
+###############################################################################
+
 def compute_common_relative_time_granularity(gran_list):
 	"""Compute the greatest common granule from a list of relative time granules
     
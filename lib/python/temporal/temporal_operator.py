@@ -110,6 +110,149 @@ try:
 except:
     pass
 
+import os
+import sys
+import glob
+import hashlib
+
+###############################################################################
+
+def get_parser_table_dir():
+    """Return the directory in which the lexer and parser tables of the
+       temporal algebra are stored
+
+       The directory is located in the GRASS user configuration directory
+       and is created if it does not exist.
+
+       :return: The path of the directory or None if it is not available
+    """
+    if sys.platform == 'win32':
+        config_dir = os.path.join(os.getenv('APPDATA', ''), 'GRASS7')
+    else:
+        config_dir = os.path.join(os.getenv('HOME', ''), '.grass7')
+    if not os.path.isdir(config_dir):
+        return None
+    table_dir = os.path.join(config_dir, 'temporal_algebra_tables')
+    try:
+        if not os.path.isdir(table_dir):
+            os.mkdir(table_dir)
+    except OSError:
+        if not os.path.isdir(table_dir):
+            return None
+    if not os.access(table_dir, os.W_OK):
+        return None
+    return table_dir
+
+def get_parser_table_name(module, prefix):
+    """Return the name of the Python module that stores the lexer or
+       parser tables of a lexer or parser object
+
+       The name depends on the class of the object, on the modification
+       times of the files that define the class and its base classes and
+       on the PLY version, so that modified grammars never use old tables.
+
+       :param module: The lexer or parser object
+       :param prefix: The prefix of the module name, lextab or parsetab
+       :return: The module name
+    """
+    key = [type(module).__name__, getattr(lex, "__version__", "")]
+    for cls in type(module).__mro__:
+        path = getattr(sys.modules.get(cls.__module__), "__file__", None)
+        if path and os.path.exists(path):
+            key.append("%s:%f" % (path, os.path.getmtime(path)))
+    digest = hashlib.md5("\n".join(key).encode("utf-8")).hexdigest()
+    return "%s_%s_%s" % (prefix, type(module).__name__.lower(), digest)
+
+def _remove_old_tables(table_dir, name):
+    """Remove the tables of the same lexer or parser class that were
+       written for older versions of the grammar
+
+       :param table_dir: The table directory
+       :param name: The module name of the current tables
+    """
+    # The module names differ only in the digest after the last underscore
+    pattern = os.path.join(table_dir, name.rsplit("_", 1)[0] + "_*.py*")
+    current = [os.path.join(table_dir, name + extension)
+               for extension in [".py", ".pyc"]]
+    for path in glob.glob(pattern):
+        if path not in current:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _build_with_table_dir(function, name, **kwargs):
+    """Call lex.lex() or yacc.yacc() with the table directory in the
+       Python path, so that tables written by former calls are imported
+
+       When new tables are written the tables of older versions of the
+       grammar are removed. Broken table files, for example written by an
+       interrupted process, are removed and the tables are built without
+       the table directory.
+    """
+    table_dir = kwargs["outputdir"]
+    new_tables = not os.path.exists(os.path.join(table_dir, name + ".py"))
+    sys.path.insert(0, table_dir)
+    try:
+        result = function(**kwargs)
+        if new_tables:
+            _remove_old_tables(table_dir, name)
+        return result
+    except (SyntaxError, ValueError, AttributeError, EOFError):
+        for extension in [".py", ".pyc"]:
+            try:
+                os.remove(os.path.join(table_dir, name + extension))
+            except OSError:
+                pass
+    finally:
+        sys.path.remove(table_dir)
+    sys.modules.pop(name, None)
+    for key in ["optimize", "outputdir", "lextab", "tabmodule",
+                "write_tables"]:
+        kwargs.pop(key, None)
+    return function(**kwargs)
+
+def build_lexer(module, **kwargs):
+    """Build a PLY lexer from a lexer object
+
+       The lexer is built in optimize mode and its tables are read from
+       or written to the table directory of get_parser_table_dir(). The
+       lexer is built without tables if the table directory is not
+       available.
+
+       :param module: The lexer object
+       :param kwargs: Additional keyword arguments of lex.lex()
+       :return: The PLY lexer
+    """
+    table_dir = get_parser_table_dir()
+    if table_dir is None:
+        return lex.lex(module=module, **kwargs)
+    name = get_parser_table_name(module, "lextab")
+    kwargs.update(optimize=True, lextab=name, outputdir=table_dir)
+    return _build_with_table_dir(lex.lex, name, module=module, **kwargs)
+
+def build_parser(module, **kwargs):
+    """Build a PLY parser from a parser object
+
+       The parser tables are read from the table directory of
+       get_parser_table_dir(), they are only generated and written to the
+       table directory if they do not exist. The tables are generated for
+       each call if the table directory is not available.
+
+       :param module: The parser object
+       :param kwargs: Additional keyword arguments of yacc.yacc()
+       :return: The PLY parser
+    """
+    table_dir = get_parser_table_dir()
+    if table_dir is None:
+        return yacc.yacc(module=module, **kwargs)
+    name = get_parser_table_name(module, "parsetab")
+    kwargs.update(optimize=True, write_tables=True, tabmodule=name,
+                  outputdir=table_dir)
+    return _build_with_table_dir(yacc.yacc, name, module=module, **kwargs)
+
+###############################################################################
+
 class TemporalOperatorLexer(object):
     """Lexical analyzer for the GRASS GIS temporal operator"""
 
@@ -224,7 +367,7 @@ class TemporalOperatorLexer(object):
 
     # Build the lexer
     def build(self,**kwargs):
-        self.lexer = lex.lex(module=self, **kwargs)
+        self.lexer = build_lexer(self, **kwargs)
 
     # Just for testing
     def test(self,data):
@@ -244,15 +387,20 @@ class TemporalOperatorParser(object):
     def __init__(self):
         self.lexer = TemporalOperatorLexer()
         self.lexer.build()
-        self.parser = yacc.yacc(module=self)
+        self.parser = build_parser(self)
         self.relations = None
         self.temporal  = None
         self.function  = None
         self.aggregate = None
 
     def parse(self, expression,  optype = 'relation'):
+        # Reset the results of a former parse call, the parser can be reused
+        self.relations = None
+        self.temporal  = None
+        self.function  = None
+        self.aggregate = None
         self.optype = optype        
-        self.parser.parse(expression)
+        self.parser.parse(expression, lexer=self.lexer.lexer)
         # The parameter optype can be of type: select {:, during, r}, boolean{&&, contains, |}, 
         #                                                            raster{*, equal, |}, vector {|, starts, &},
         #                                                            hash{#, during, l} or relation {during}.
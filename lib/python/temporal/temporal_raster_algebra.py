@@ -66,21 +66,12 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
         self.m_mremove = pymod.Module('g.remove')
 
     def parse(self, expression, basename = None, overwrite=False):
+        compiled = self.compile(expression)
+
         # Check for space time dataset type definitions from temporal algebra
-        l = TemporalRasterAlgebraLexer()
-        l.build()
-        l.lexer.input(expression)
-
-        while True:
-            tok = l.lexer.token()
-            if not tok: break
-            
+        for tok in compiled.tokens:
             if tok.type == "STVDS" or tok.type == "STRDS" or tok.type == "STR3DS":
                 raise SyntaxError("Syntax error near '%s'" %(tok.type))
-        
-        self.lexer = TemporalRasterAlgebraLexer()
-        self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug)
 
         self.overwrite = overwrite
         self.count = 0
@@ -88,8 +79,7 @@ class TemporalRasterAlgebraParser(TemporalRasterBaseAlgebraParser):
         self.maptype = "raster"
         self.mapclass = RasterDataset
         self.basename = basename
-        self.expression = expression
-        self.parser.parse(expression)
+        self.parse_compiled(compiled)
 
     ######################### Temporal functions ##############################
 
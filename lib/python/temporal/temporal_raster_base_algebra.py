@@ -128,6 +128,9 @@ class TemporalRasterAlgebraLexer(TemporalAlgebraLexer):
 class TemporalRasterBaseAlgebraParser(TemporalAlgebraParser):
     """The temporal algebra class"""
 
+    # The lexer class of the algebra
+    lexer_class = TemporalRasterAlgebraLexer
+
     # Get the tokens from the lexer class
     tokens = TemporalRasterAlgebraLexer.tokens
 
@@ -101,6 +101,9 @@ class TemporalVectorAlgebraLexer(TemporalAlgebraLexer):
 class TemporalVectorAlgebraParser(TemporalAlgebraParser):
     """The temporal algebra class"""
 
+    # The lexer class of the algebra
+    lexer_class = TemporalVectorAlgebraLexer
+
     # Get the tokens from the lexer class
     tokens = TemporalVectorAlgebraLexer.tokens
 
@@ -121,30 +124,20 @@ class TemporalVectorAlgebraParser(TemporalAlgebraParser):
         self.m_buffer = pygrass.Module('v.buffer', quiet=True, run_=False)
 
     def parse(self, expression, basename = None, overwrite = False):
+        compiled = self.compile(expression)
+
         # Check for space time dataset type definitions from temporal algebra
-        l = TemporalVectorAlgebraLexer()
-        l.build()
-        l.lexer.input(expression)
-
-        while True:
-            tok = l.lexer.token()
-            if not tok: break
-            
+        for tok in compiled.tokens:
             if tok.type == "STVDS" or tok.type == "STRDS" or tok.type == "STR3DS":
                 raise SyntaxError("Syntax error near '%s'" %(tok.type))
 
-        self.lexer = TemporalVectorAlgebraLexer()
-        self.lexer.build()
-        self.parser = yacc.yacc(module=self, debug=self.debug)
-
         self.overwrite = overwrite
         self.count = 0
         self.stdstype = "stvds"
         self.maptype = "vector"
         self.mapclass = VectorDataset
         self.basename = basename
-        self.expression = expression
-        self.parser.parse(expression)
+        self.parse_compiled(compiled)
 
     ######################### Temporal functions ##############################
 
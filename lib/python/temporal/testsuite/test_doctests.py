@@ -31,6 +31,7 @@ def load_tests(loader, tests, ignore):
     ##tests.addTests(doctest.DocTestSuite(grass.temporal.list_stds))
     tests.addTests(doctest.DocTestSuite(grass.temporal.metadata))
     tests.addTests(doctest.DocTestSuite(grass.temporal.register))
+    tests.addTests(doctest.DocTestSuite(grass.temporal.registered_map_array))
     tests.addTests(doctest.DocTestSuite(grass.temporal.space_time_datasets))
     tests.addTests(doctest.DocTestSuite(grass.temporal.spatial_extent))
     tests.addTests(doctest.DocTestSuite(grass.temporal.spatial_topology_dataset_connector))
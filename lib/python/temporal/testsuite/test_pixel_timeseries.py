@@ -0,0 +1,76 @@
+"""Unit test to extract the pixel time series of a space time raster
+   dataset using tgis.get_strds_values_at_points()
+
+(C) 2015 by the GRASS Development Team
+This program is free software under the GNU General Public
+License (>=v2). Read the file COPYING that comes with GRASS
+for details.
+"""
+
+import math
+import grass.temporal as tgis
+from grass.gunittest.case import TestCase
+from grass.gunittest.main import test
+
+
+class TestPixelTimeseries(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Initiate the temporal GIS, set the region and create the
+           space time raster dataset
+        """
+        # Use always the current mapset as temporal database
+        cls.runModule("g.gisenv", set="TGIS_USE_CURRENT_MAPSET=1")
+        tgis.init()
+        cls.use_temp_region()
+        cls.runModule('g.region', n=80.0, s=0.0, e=120.0, w=0.0,
+                      t=1.0, b=0.0, res=10.0)
+        cls.runModule("r.mapcalc", overwrite=True, quiet=True,
+                      expression="pixel_map_1 = row() + 100 * col()")
+        cls.runModule("r.mapcalc", overwrite=True, quiet=True,
+                      expression="pixel_map_2 = if(row() == 1, null(), "
+                                 "2 * (row() + 100 * col()))")
+        cls.runModule("r.mapcalc", overwrite=True, quiet=True,
+                      expression="pixel_map_3 = 3.5")
+        cls.runModule("t.create", type="strds", temporaltype="absolute",
+                      output="pixel_timeseries", title="Test",
+                      description="Test", overwrite=True)
+        cls.runModule("t.register", flags="i", type="raster",
+                      input="pixel_timeseries",
+                      maps="pixel_map_1,pixel_map_2,pixel_map_3",
+                      start="2001-01-01", increment="1 month",
+                      overwrite=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the space time raster dataset and the temporary region
+        """
+        cls.runModule("t.remove", flags="rf", type="strds",
+                      inputs="pixel_timeseries")
+        cls.del_temp_region()
+
+    def test_values(self):
+        points = [(5, 75), (15, 45), (200, 200)]
+        for nprocs in (1, 2):
+            maps, values = tgis.get_strds_values_at_points(
+                "pixel_timeseries", points, nprocs=nprocs)
+            self.assertEqual([row["id"].split("@")[0] for row in maps],
+                             ["pixel_map_1", "pixel_map_2", "pixel_map_3"])
+            self.assertEqual(values.shape, (3, 3))
+            self.assertEqual(values[0, 0], 101)
+            self.assertTrue(math.isnan(values[0, 1]))
+            self.assertEqual(values[0, 2], 3.5)
+            self.assertEqual(values[1].tolist(), [204, 408, 3.5])
+            self.assertTrue(all(math.isnan(value) for value in values[2]))
+
+    def test_where(self):
+        maps, values = tgis.get_strds_values_at_points(
+            "pixel_timeseries", [(5, 75)],
+            where="start_time >= '2001-03-01'")
+        self.assertEqual(len(maps), 1)
+        self.assertEqual(values.tolist(), [[3.5]])
+
+
+if __name__ == '__main__':
+    test()
@@ -173,6 +173,37 @@ class TestRegisterFunctions(TestCase):
         start, end = map.get_absolute_time()
         self.assertEqual(start, datetime.datetime(2001, 1, 1, 18, 30, 1))
 
+    def test_absolute_time_update(self):
+        """Test the update of maps that are already registered
+           in the temporal database
+        """
+        tgis.register_maps_in_space_time_dataset(type="raster", name=None,
+                 maps="register_map_1,register_map_2",
+                 start="2001-01-01", increment="1 day", interval=True)
+        overwrite = os.environ.get("GRASS_OVERWRITE")
+        os.environ["GRASS_OVERWRITE"] = "1"
+        try:
+            tgis.register_maps_in_space_time_dataset(type="raster", name=None,
+                     maps="register_map_1,register_map_2",
+                     start="2002-01-01", increment="1 month", interval=True)
+        finally:
+            if overwrite is None:
+                del os.environ["GRASS_OVERWRITE"]
+            else:
+                os.environ["GRASS_OVERWRITE"] = overwrite
+
+        map = tgis.RasterDataset("register_map_1@" + tgis.get_current_mapset())
+        map.select()
+        start, end = map.get_absolute_time()
+        self.assertEqual(start, datetime.datetime(2002, 1, 1))
+        self.assertEqual(end, datetime.datetime(2002, 2, 1))
+
+        map = tgis.RasterDataset("register_map_2@" + tgis.get_current_mapset())
+        map.select()
+        start, end = map.get_absolute_time()
+        self.assertEqual(start, datetime.datetime(2002, 2, 1))
+        self.assertEqual(end, datetime.datetime(2002, 3, 1))
+
     def test_relative_time_strds_1(self):
         """Test the registration of maps with relative time in a
            space time raster dataset
@@ -301,6 +332,115 @@ class TestRegisterFunctions(TestCase):
         self.assertEqual(end, 2000000)
         self.assertEqual(unit, "seconds")
 
+    def test_select_datasets(self):
+        """Test the selection of all registered maps with a single query
+        """
+        tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                 maps="register_map_1,register_map_2",
+                 start="2001-01-01", increment="1 day", interval=True)
+
+        mapset = tgis.get_current_mapset()
+        ids = ["register_map_1@" + mapset, "register_map_2@" + mapset,
+               "register_map_3@" + mapset]
+        maps = tgis.select_datasets(tgis.RasterDataset(None), ids=ids)
+        self.assertEqual(sorted([map.get_id() for map in maps]), ids[:2])
+
+        for map in maps:
+            selected = tgis.RasterDataset(map.get_id())
+            selected.select()
+            self.assertEqual(map.get_absolute_time(),
+                             selected.get_absolute_time())
+            self.assertEqual(map.get_spatial_extent_as_tuple(),
+                             selected.get_spatial_extent_as_tuple())
+            self.assertEqual(map.metadata.get_max(), selected.metadata.get_max())
+            self.assertEqual(map.stds_register.get_registered_stds(),
+                             selected.stds_register.get_registered_stds())
+
+        maps = tgis.select_datasets(tgis.RasterDataset(None),
+                                    where="name LIKE 'register_map_%' AND "
+                                          "start_time >= '2001-01-02'")
+        self.assertEqual([map.get_id() for map in maps], ids[1:2])
+
+        strds = tgis.select_datasets(self.strds_abs, ids=[self.strds_abs.get_id()])
+        self.assertEqual(len(strds), 1)
+        self.assertEqual(strds[0].metadata.get_number_of_maps(), 2)
+
+    def test_registered_maps_as_array(self):
+        """Test the compact array of registered maps
+        """
+        tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                 maps="register_map_1,register_map_2",
+                 start="2001-01-01", increment="1 day", interval=True)
+
+        maps = self.strds_abs.get_registered_maps_as_array()
+        self.assertEqual(len(maps), 2)
+        self.assertEqual(maps.north.tolist(), [80.0, 80.0])
+        self.assertEqual(maps.get_temporal_extent_as_tuple(1),
+                         (datetime.datetime(2001, 1, 2),
+                          datetime.datetime(2001, 1, 3)))
+
+        objects = self.strds_abs.get_registered_maps_as_objects()
+        for index in range(len(maps)):
+            self.assertEqual(maps[index].get_id(), objects[index].get_id())
+            self.assertEqual(maps[index].get_temporal_extent_as_tuple(),
+                             objects[index].get_temporal_extent_as_tuple())
+            self.assertEqual(maps[index].get_spatial_extent_as_tuple(),
+                             objects[index].get_spatial_extent_as_tuple())
+
+        tcount = self.strds_abs.count_temporal_types(maps)
+        self.assertEqual(tcount, {"point": 0, "interval": 2, "invalid": 0})
+
+    def test_granularity_update(self):
+        """Test the incremental update of the granularity after maps
+           are registered at the end of a space time dataset
+        """
+        tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                 maps="register_map_1", start="2001-01-01", increment="1 day", interval=True)
+        self.strds_abs.select()
+        self.assertEqual(self.strds_abs.get_granularity(), "1 day")
+
+        tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                 maps="register_map_2", start="2001-01-04 12:00:00", increment="1 day", interval=True)
+        self.strds_abs.select()
+        self.assertEqual(self.strds_abs.get_granularity(), "12 hours")
+        self.assertEqual(self.strds_abs.get_map_time(), "interval")
+
+        # The granularity computed from all maps is identical
+        strds = tgis.open_old_stds(self.strds_abs.get_id(), "strds")
+        strds.update_from_registered_maps()
+        strds.select()
+        self.assertEqual(strds.get_granularity(), "12 hours")
+        maps = strds.get_registered_maps_as_objects()
+        self.assertEqual(tgis.compute_absolute_time_granularity(maps), "12 hours")
+
+    def test_granularity_update_overwrite(self):
+        """Test the update of the granularity after registered maps are
+           overwritten and new maps are registered in the same call
+        """
+        tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                 maps="register_map_1", start="2001-01-01", increment="12 hours", interval=True)
+        self.strds_abs.select()
+        self.assertEqual(self.strds_abs.get_granularity(), "12 hours")
+
+        overwrite = os.environ.get("GRASS_OVERWRITE")
+        os.environ["GRASS_OVERWRITE"] = "1"
+        try:
+            tgis.register_maps_in_space_time_dataset(type="raster", name=self.strds_abs.get_name(),
+                     maps="register_map_1,register_map_2",
+                     start="2001-01-10", increment="1 day", interval=True)
+        finally:
+            if overwrite is None:
+                del os.environ["GRASS_OVERWRITE"]
+            else:
+                os.environ["GRASS_OVERWRITE"] = overwrite
+
+        self.strds_abs.select()
+        self.assertEqual(self.strds_abs.get_granularity(), "1 day")
+        self.assertEqual(self.strds_abs.get_map_time(), "interval")
+        start, end = self.strds_abs.get_absolute_time()
+        self.assertEqual(start, datetime.datetime(2001, 1, 10))
+        self.assertEqual(end, datetime.datetime(2001, 1, 12))
+
 
 class TestRegisterFails(TestCase):
 
@@ -85,6 +85,34 @@ class TestTemporalRasterAlgebra(TestCase):
         self.assertEqual( D.check_temporal_topology(),  False)
         self.assertEqual(D.get_granularity(),  u'2 days')
 
+    def test_compiled_expression(self):
+        """Testing the evaluation of a compiled expression with different
+            space time datasets"""
+        tra = tgis.TemporalRasterAlgebraParser(run = True, debug = True)
+        compiled = tra.compile("X = Y + Y")
+        self.assertEqual(compiled.get_stds_names(), ["X", "Y", "Y"])
+
+        tra.parse(expression=compiled.substitute({"X": "R", "Y": "A"}),
+                  basename="r", overwrite=True)
+
+        D = tgis.open_old_stds("R", type="strds")
+        D.select()
+        self.assertEqual(D.metadata.get_number_of_maps(), 4)
+        self.assertEqual(D.metadata.get_min_min(), 2) # 1 + 1
+        self.assertEqual(D.metadata.get_max_max(), 8) # 4 + 4
+
+        tra.parse(expression=compiled.substitute({"X": "R", "Y": "D"}),
+                  basename="r", overwrite=True)
+
+        D = tgis.open_old_stds("R", type="strds")
+        D.select()
+        self.assertEqual(D.metadata.get_number_of_maps(), 3)
+        self.assertEqual(D.metadata.get_min_min(), 16) # 8 + 8
+        self.assertEqual(D.metadata.get_max_max(), 20) # 10 + 10
+        start, end = D.get_absolute_time()
+        self.assertEqual(start, datetime.datetime(2001, 1, 3))
+        self.assertEqual(end, datetime.datetime(2001, 1, 6))
+
     def test_temporal_conditional_time_dimension_bug(self):
         """Testing the conditional time dimension bug, that uses the time 
             dimension of the conditional statement instead the time dimension 
@@ -7,7 +7,7 @@ Usage:
 
     import grass.temporal as tgis
 
-    tgis.print_gridded_dataset_univar_statistics(type, input, output, where, extended, no_header, fs, rast_region)
+    tgis.print_gridded_dataset_univar_statistics(type, input, output, where, extended, no_header, fs, rast_region, nprocs, in_process)
 
 ..
 
@@ -19,17 +19,173 @@ for details.
 :authors: Soeren Gebbert
 """
 
+import sys
+from multiprocessing import Pool
+import numpy
 from open_stds import *
 import grass.script as gscript
+from grass.pygrass.gis.region import Region
+from grass.pygrass.raster import RasterRow
+
+###############################################################################
+
+
+def _accumulate(total, values):
+    """Add the values one after the other to the total, in the same order
+       as r.univar does. numpy.sum() uses a pairwise summation that can
+       differ from r.univar in the last printed digit.
+
+       :param total: The current total
+       :param values: A numpy array of float64 values
+       :return: The new total
+    """
+    return numpy.add.accumulate(numpy.concatenate(([total], values)))[-1]
+
+
+def _format_univar_value(value):
+    """Format a value like the shell style output of r.univar, NaN
+       values are printed as -nan like by the C library of r.univar"""
+    if numpy.isnan(value):
+        return "-nan"
+    return "%.15g" % value
+
+
+def _compute_raster_univar(id, extended, rast_region):
+    """Compute the univariate statistics of a raster map in the current
+       process, reading the map row by row with pygrass.
+
+       The statistics are computed as r.univar does and are returned
+       as strings formatted like the shell style output of r.univar.
+
+       :param id: The id of the raster map
+       :param extended: If True compute extended statistics
+       :param rast_region: If True use the region of the raster map
+       :return: A dictionary with the statistics or None if the map
+                has no non-null cells
+    """
+    if rast_region:
+        window = Region()
+        window.get_current()
+        region = Region()
+        region.from_rast(id)
+        region.set_raster_region()
+
+    name, mapset = id.split("@")
+    n = 0
+    cells = 0
+    total = 0.0
+    sumsq = 0.0
+    sum_abs = 0.0
+    minimum = None
+    maximum = None
+    values = []
+
+    try:
+        with RasterRow(name, mapset, prefetch=2, data_only=True) as rast:
+            is_cell = rast.mtype == "CELL"
+            cell_null = numpy.iinfo(numpy.int32).min
+            for row in rast:
+                row = numpy.asarray(row)
+                cells += row.size
+                if is_cell:
+                    valid = row[row != cell_null]
+                else:
+                    valid = row[~numpy.isnan(row)]
+                if not valid.size:
+                    continue
+                data = valid.astype(numpy.float64)
+                n += data.size
+                total = _accumulate(total, data)
+                sumsq = _accumulate(sumsq, data * data)
+                sum_abs = _accumulate(sum_abs, numpy.abs(data))
+                row_min = data.min()
+                row_max = data.max()
+                if minimum is None or row_min < minimum:
+                    minimum = row_min
+                if maximum is None or row_max > maximum:
+                    maximum = row_max
+                if extended:
+                    values.append(data)
+    finally:
+        if rast_region:
+            window.set_raster_region()
+
+    if n == 0:
+        return None
+
+    mean = total / n
+    variance = (sumsq - total * total / n) / n
+    if variance < 1.0e-15:
+        variance = 0.0
+    stddev = numpy.sqrt(variance)
+    # A division by zero results in inf or nan as in r.univar
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        coeff_var = numpy.float64(stddev) / numpy.float64(mean) * 100.0
+
+    stats = {"n": str(n), "null_cells": str(cells - n),
+             "cells": str(cells), "min": "%.15g" % minimum,
+             "max": "%.15g" % maximum,
+             "range": "%.15g" % (maximum - minimum),
+             "mean": "%.15g" % mean,
+             "mean_of_abs": "%.15g" % (sum_abs / n),
+             "stddev": "%.15g" % stddev, "variance": "%.15g" % variance,
+             "coeff_var": _format_univar_value(coeff_var),
+             "sum": "%.15g" % total}
+
+    if extended:
+        values = numpy.sort(numpy.concatenate(values))
+        if n % 2:
+            median = values[n // 2]
+        else:
+            median = (values[n // 2 - 1] + values[n // 2]) / 2.0
+        stats["first_quartile"] = "%g" % values[int(n * 0.25 - 0.5)]
+        stats["median"] = "%g" % median
+        stats["third_quartile"] = "%g" % values[int(n * 0.75 - 0.5)]
+        stats["percentile_90"] = "%g" % values[int(n * 1e-2 * 90 - 0.5)]
+
+    return stats
+
+###############################################################################
+
+
+def _compute_univar_statistics(args):
+    """Compute the univariate statistics of a single map, this function
+       is called by the worker processes
+
+       :param args: A tuple (type, id, extended, rast_region, in_process)
+       :return: A dictionary with the statistics, empty or None if no
+                statistics are available
+    """
+    type, id, extended, rast_region, in_process = args
+
+    if type == "strds" and in_process is True:
+        return _compute_raster_univar(id, extended, rast_region)
+
+    flag = "g"
+
+    if extended is True:
+        flag += "e"
+    if type == "strds" and rast_region is True:
+        flag += "r"
+
+    if type == "strds":
+        return gscript.parse_command("r.univar", map=id, flags=flag)
+    elif type == "str3ds":
+        return gscript.parse_command("r3.univar", map=id, flags=flag)
 
 ###############################################################################
 
 
 def print_gridded_dataset_univar_statistics(type, input, output, where, extended,
                                             no_header=False, fs="|",
-                                            rast_region=False):
+                                            rast_region=False, nprocs=1,
+                                            in_process=False):
     """Print univariate statistics for a space time raster or raster3d dataset
 
+       The statistics of the registered maps can be computed by a pool
+       of nprocs worker processes, the results are printed in temporal
+       order as soon as they are available.
+
        :param type: Must be "strds" or "str3ds"
        :param input: The name of the space time dataset
        :param output: Name of the optional output file, if None stdout is used
@@ -40,6 +196,10 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
        :param rast_region: If set True ignore the current region settings
               and use the raster map regions for univar statistical calculation.
               Only available for strds.
+       :param nprocs: The number of processes used to compute the statistics
+       :param in_process: If set True the statistics are computed by reading
+              the raster maps with pygrass instead of running r.univar
+              for each map. Only available for strds.
     """
 
     # We need a database interface
@@ -48,18 +208,19 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
 
     sp = open_old_stds(input, type, dbif)
 
-    if output is not None:
-        out_file = open(output, "w")
-
     rows = sp.get_registered_maps(
         "id,start_time,end_time", where, "start_time", dbif)
 
+    dbif.close()
+
     if not rows:
-        dbif.close()
         gscript.fatal(_("Space time %(sp)s dataset <%(i)s> is empty") % {
                       'sp': sp.get_new_map_instance(None).get_type(),
                       'i': sp.get_id()})
 
+    if output is not None:
+        out_file = open(output, "w")
+
     if no_header is False:
         string = ""
         string += "id" + fs + "start" + fs + "end" + fs + "mean" + fs
@@ -75,49 +236,54 @@ def print_gridded_dataset_univar_statistics(type, input, output, where, extended
         else:
             out_file.write(string + "\n")
 
-    for row in rows:
-        string = ""
-        id = row["id"]
-        start = row["start_time"]
-        end = row["end_time"]
-
-        flag = "g"
-
-        if extended is True:
-            flag += "e"
-        if type == "strds" and rast_region is True:
-            flag += "r"
-
-        if type == "strds":
-            stats = gscript.parse_command("r.univar", map=id, flags=flag)
-        elif type == "str3ds":
-            stats = gscript.parse_command("r3.univar", map=id, flags=flag)
+    tasks = [(type, row["id"], extended, rast_region, in_process)
+             for row in rows]
 
-        if not stats:
-            if type == "strds":
-                gscript.warning(_("Unable to get statistics for raster map "
-                                  "<%s>") % id)
-            elif type == "str3ds":
-                gscript.warning(_("Unable to get statistics for 3d raster map"
-                                  " <%s>") % id)
-            continue
-
-        string += str(id) + fs + str(start) + fs + str(end)
-        string += fs + str(stats["mean"]) + fs + str(stats["min"])
-        string += fs + str(stats["max"]) + fs + str(stats["mean_of_abs"])
-        string += fs + str(stats["stddev"]) + fs + str(stats["variance"])
-        string += fs + str(stats["coeff_var"]) + fs + str(stats["sum"])
-        string += fs + str(stats["null_cells"]) + fs + str(stats["cells"])
-        if extended is True:
-            string += fs + str(stats["first_quartile"]) + fs + str(stats["median"])
-            string += fs + str(stats["third_quartile"]) + fs + str(stats["percentile_90"])
-
-        if output is None:
-            print string
-        else:
-            out_file.write(string + "\n")
+    pool = None
+    if nprocs > 1 and len(tasks) > 1:
+        pool = Pool(processes=min(nprocs, len(tasks)))
+        # imap yields the results in the order of the maps
+        results = pool.imap(_compute_univar_statistics, tasks)
+    else:
+        results = (_compute_univar_statistics(task) for task in tasks)
+
+    try:
+        for i, stats in enumerate(results):
+            string = ""
+            row = rows[i]
+            id = row["id"]
+            start = row["start_time"]
+            end = row["end_time"]
+
+            if not stats:
+                if type == "strds":
+                    gscript.warning(_("Unable to get statistics for raster map "
+                                      "<%s>") % id)
+                elif type == "str3ds":
+                    gscript.warning(_("Unable to get statistics for 3d raster map"
+                                      " <%s>") % id)
+                continue
+
+            string += str(id) + fs + str(start) + fs + str(end)
+            string += fs + str(stats["mean"]) + fs + str(stats["min"])
+            string += fs + str(stats["max"]) + fs + str(stats["mean_of_abs"])
+            string += fs + str(stats["stddev"]) + fs + str(stats["variance"])
+            string += fs + str(stats["coeff_var"]) + fs + str(stats["sum"])
+            string += fs + str(stats["null_cells"]) + fs + str(stats["cells"])
+            if extended is True:
+                string += fs + str(stats["first_quartile"]) + fs + str(stats["median"])
+                string += fs + str(stats["third_quartile"]) + fs + str(stats["percentile_90"])
 
-    dbif.close()
+            if output is None:
+                print string
+                sys.stdout.flush()
+            else:
+                out_file.write(string + "\n")
+                out_file.flush()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
 
     if output is not None:
         out_file.close()
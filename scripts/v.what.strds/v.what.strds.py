@@ -43,17 +43,28 @@
 #% key: t_where
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of processes used to read the raster maps in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: u
 #% label: Update attribute table of input vector map
 #% description: Instead of creating a new vector map update the attribute table with value(s)
 #%end
 
+import numpy
 import grass.script as grass
 import grass.temporal as tgis
 from grass.pygrass.utils import copy as gcopy
 from grass.pygrass.messages import Messenger
-from grass.pygrass.vector import Vector
+from grass.pygrass.vector import Vector, VectorTopo
+from grass.pygrass.vector import sql
 from grass.exceptions import CalledModuleError
 
 ############################################################################
@@ -94,6 +105,7 @@ def main():
     strds = options["strds"]
     where = options["where"]
     tempwhere = options["t_where"]
+    nprocs = int(options["nprocs"])
 
     if output and flags['u']:
         grass.fatal(_("Cannot combine 'output' option and 'u' flag"))
@@ -107,11 +119,6 @@ def main():
 
     overwrite = grass.overwrite()
 
-    quiet = True
-
-    if grass.verbosity() > 2:
-        quiet = False
-
     # Check the number of sample strds and the number of columns
     strds_names = strds.split(",")
 
@@ -193,8 +200,6 @@ def main():
         output = input
 
     msgr = Messenger()
-    perc_curr = 0
-    perc_tot = len(samples)
     pymap = Vector(output)
     try:
         pymap.open('r')
@@ -209,16 +214,18 @@ def main():
             dbif.close()
             grass.fatal(_("Impossible add table to vector %s" % output))
     pymap.close()
+
+    columns = []
     for sample in samples:
         raster_names = sample.raster_names
-        # Call v.what.rast for each raster map
 
         for name in raster_names:
             coltype = "DOUBLE PRECISION"
             # Get raster map type
             raster_map = tgis.RasterDataset(name)
             raster_map.load()
-            if raster_map.metadata.get_datatype() == "CELL":
+            is_int = raster_map.metadata.get_datatype() == "CELL"
+            if is_int:
                 coltype = "INT"
             day = sample.printDay()
             column_name = "%s_%s" % (sample.strds_name, day)
@@ -232,20 +239,60 @@ def main():
                 dbif.close()
                 grass.fatal(_("Unable to add column %s to vector map "
                               "<%s> ") % (column_string, output))
-            try:
-                grass.run_command("v.what.rast", map=output, raster=name,
-                                  column=column_name, where=where,
-                                  quiet=quiet)
-            except CalledModuleError:
-                dbif.close()
-                grass.fatal(_("Unable to run v.what.rast for vector map"
-                              " <%s> and raster map <%s>") %
-                            (output, str(raster_names)))
-
-        msgr.percent(perc_curr, perc_tot, 1)
-        perc_curr += 1
+            columns.append((column_name, name, is_int))
 
     dbif.close()
+
+    # Read the points that should be updated
+    pymap = VectorTopo(output)
+    pymap.open('r')
+    table = pymap.table
+    if where:
+        cur = table.execute(sql.SELECT_WHERE.format(cols=table.key,
+                                                    tname=table.name,
+                                                    condition=where))
+        selected = set(row[0] for row in cur.fetchall())
+    cats = []
+    coords = []
+    for point in pymap.viter('points'):
+        if point.cat is None or (where and point.cat not in selected):
+            continue
+        cats.append(point.cat)
+        coords.append((point.x, point.y))
+
+    # Sample all raster maps at once
+    values = tgis.get_raster_values_at_points([col[1] for col in columns],
+                                              coords, nprocs)
+
+    for i, (column_name, name, is_int) in enumerate(columns):
+        # Points with the same category but different values are set
+        # to NULL as done by v.what.rast
+        cat_values = {}
+        for cat, value in zip(cats, values[:, i]):
+            if numpy.isnan(value):
+                value = None
+            elif is_int:
+                value = int(value)
+            else:
+                value = float(value)
+            if cat in cat_values and cat_values[cat] != value:
+                value = None
+            cat_values[cat] = value
+
+        sqlcode = sql.UPDATE_WHERE.format(tname=table.name,
+                                          values="%s=?" % column_name,
+                                          condition="%s=?" % table.key)
+        if cat_values:
+            table.execute(sqlcode, many=True,
+                          values=[(value, cat) for cat, value in
+                                  cat_values.items()])
+        msgr.percent(i, len(columns), 1)
+
+    table.conn.commit()
+    pymap.close()
+    msgr.percent(1, 1, 1)
+
+
 if __name__ == "__main__":
     options, flags = grass.parser()
     main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the build of the temporal topology between two map lists
+with the vectorized numpy based SpatioTemporalTopologyBuilder and the
+R*-Tree based builder.
+
+The maps of the first list have daily intervals of one to three days,
+the maps of the second list are shifted by random offsets. The maps
+are not registered in the temporal database.
+
+Needs to be run in a GRASS session.
+
+Usage::
+
+    python benchmark_topology.py -m 1000,10000,100000 -r 10000 -n 3
+"""
+from __future__ import (nested_scopes, generators, division, absolute_import,
+                        with_statement, print_function, unicode_literals)
+
+import optparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import grass.temporal as tgis
+
+
+def create_maps(prefix, nmaps, shift, spatial):
+    start = datetime(2000, 1, 1)
+    maps = []
+    for i in range(nmaps):
+        map_ = tgis.RasterDataset("%s_%i@benchmark" % (prefix, i))
+        begin = start + timedelta(days=i, hours=shift())
+        map_.set_absolute_time(begin, begin + timedelta(days=1 + i % 3))
+        if spatial:
+            west = (i % 100) * 10
+            south = (i // 100 % 100) * 10
+            map_.set_spatial_extent_from_values(north=south + 15,
+                                                south=south,
+                                                east=west + 15, west=west,
+                                                top=0, bottom=0)
+        maps.append(map_)
+    return maps
+
+
+def count_relations(maps):
+    count = 0
+    for map_ in maps:
+        for key, value in map_.get_temporal_relations().items():
+            if key not in ["NEXT", "PREV"]:
+                count += len(value)
+    return count
+
+
+def mytimer(func, runs=1):
+    times = []
+    for _ in range(runs):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return sum(times) / runs, times
+
+
+def run_benchmark(nmaps_list, rtree_max, runs, spatial):
+    random.seed(1)
+    results = []
+    for nmaps in nmaps_list:
+        mapsA = create_maps("a", nmaps, lambda: 0, spatial)
+        mapsB = create_maps("b", nmaps, lambda: random.randint(-48, 48),
+                            spatial)
+        print("maps = {0} x {0}".format(nmaps))
+        counts = []
+        for name, vectorized in [("vectorized", True), ("rtree", False)]:
+            if not vectorized and nmaps > rtree_max:
+                print("    {0:<20} skipped".format(name))
+                continue
+            builder = tgis.SpatioTemporalTopologyBuilder(vectorized=vectorized)
+            mean, times = mytimer(lambda: builder.build(mapsA, mapsB,
+                                                        spatial), runs)
+            counts.append(count_relations(mapsA) + count_relations(mapsB))
+            results.append((nmaps, name, mean))
+            print("    {0:<20} {1: 12.6f}s {2:>12} relations".format(
+                name, mean, counts[-1]))
+        if len(counts) > 1 and counts[0] != counts[1]:
+            print("    The number of relations differs")
+    return results
+
+
+def main():
+    """Main function"""
+    parser = optparse.OptionParser(usage="usage: %prog [options]")
+    parser.add_option("-n", "--ntimes", dest="ntime", default=3, type="int",
+                      help="Number of run for each test.")
+    parser.add_option("-m", "--maps", action="store", type="string",
+                      dest="nmaps", default='1000,10000,100000',
+                      help="Number of maps in each list separated by comma.")
+    parser.add_option("-r", "--rtree-max", dest="rtree_max", default=10000,
+                      type="int",
+                      help="Maximum number of maps for the R*-Tree build.")
+    parser.add_option("-s", "--spatial", dest="spatial", default=None,
+                      help="Build the spatio-temporal topology: 2D or 3D.")
+    options, args = parser.parse_args()
+    nmaps = [int(n) for n in options.nmaps.split(',')]
+    tgis.init()
+    run_benchmark(nmaps, options.rtree_max, options.ntime, options.spatial)
+
+
+if __name__ == "__main__":
+    main()
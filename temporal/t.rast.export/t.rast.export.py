@@ -60,6 +60,15 @@
 #%option G_OPT_T_WHERE
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of export processes to run in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 import grass.script as grass
 import grass.temporal as tgis
 
@@ -74,12 +83,14 @@ def main():
     directory = options["directory"]
     where = options["where"]
     _format = options["format"]
+    nprocs = int(options["nprocs"])
 
     # Make sure the temporal database exists
     tgis.init()
     # Export the space time raster dataset
     tgis.export_stds(
-        _input, output, compression, directory, where, _format, "strds")
+        _input, output, compression, directory, where, _format, "strds",
+        nprocs)
 
 ############################################################################
 if __name__ == "__main__":
@@ -36,6 +36,8 @@ t.rast.export format=GTiff input=precip_abs1 output=strds_export_gtiff.tar compr
 t.rast.export format=pack input=precip_abs1 output=strds_export_pack.tar.bz2 compression=bzip2 directory=/tmp
 t.rast.export format=pack input=precip_abs1 output=strds_export_pack.tar.gz compression=gzip directory=/tmp
 t.rast.export format=pack input=precip_abs1 output=strds_export_pack.tar compression=no directory=/tmp
+# Export the maps in parallel
+t.rast.export format=pack input=precip_abs1 output=strds_export_pack_parallel.tar compression=no directory=/tmp nprocs=4
 
 t.unregister type=raster maps=prec_1,prec_2,prec_3,prec_4,prec_5,prec_6
 t.remove type=strds input=precip_abs1
@@ -45,3 +47,4 @@ rm strds_export_gtiff.tar
 rm strds_export_pack.tar.bz2
 rm strds_export_pack.tar.gz
 rm strds_export_pack.tar
+rm strds_export_pack_parallel.tar
@@ -67,6 +67,15 @@
 #% multiple: no
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of import processes to run in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: r
 #% description: Set the current region from the last map that was imported
@@ -112,12 +121,13 @@ def main():
     exp = flags["e"]
     overr = flags["o"]
     create = flags["c"]
+    nprocs = int(options["nprocs"])
 
     tgis.init()
 
     tgis.import_stds(input, output, directory, title, descr, location,
-                     link, exp, overr, create, "strds", base, 
-                     set_current_region)
+                     link, exp, overr, create, "strds", base,
+                     set_current_region, nprocs)
 
 if __name__ == "__main__":
     options, flags = grass.parser()
@@ -70,6 +70,13 @@ r.info prec_1
 t.rast.import --o input=strds_export_pack.tar.bz2 output=precip_abs1 directory=test\
               title="A test" description="Description of a test"
 r.info prec_1
+# Import the maps in parallel
+t.rast.import --o input=strds_export_pack.tar output=precip_abs1 directory=test\
+              title="A test" description="Description of a test" nprocs=4
+r.info prec_1
+t.rast.import --o input=strds_export.tar.gz output=precip_abs1 directory=test\
+              title="A test" description="Description of a test" nprocs=4
+r.info prec_1
 
 # Cleaning up
 t.unregister type=raster maps=prec_1,prec_2,prec_3,prec_4,prec_5,prec_6
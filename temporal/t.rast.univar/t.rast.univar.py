@@ -38,6 +38,15 @@
 #% guisection: Formatting
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of processes to run in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: e
 #% description: Calculate extended statistics
@@ -54,6 +63,11 @@
 #% guisection: Formatting
 #%end
 
+#%flag
+#% key: p
+#% description: Compute the statistics with the Python raster library instead of running r.univar for each map
+#%end
+
 import grass.script as grass
 import grass.temporal as tgis
 
@@ -69,7 +83,9 @@ def main():
     extended = flags["e"]
     no_header = flags["s"]
     rast_region = bool(flags["r"])
+    in_process = bool(flags["p"])
     separator = grass.separator(options["separator"])
+    nprocs = int(options["nprocs"])
 
     # Make sure the temporal database exists
     tgis.init()
@@ -80,7 +96,8 @@ def main():
         output = None
 
     tgis.print_gridded_dataset_univar_statistics(
-        "strds", input, output, where, extended, no_header, separator, rast_region)
+        "strds", input, output, where, extended, no_header, separator,
+        rast_region, nprocs, in_process)
 
 if __name__ == "__main__":
     options, flags = grass.parser()
@@ -139,6 +139,38 @@ a_4@testing|2001-10-01 00:00:00|2002-01-01 00:00:00|400|400|400|400|0|0|0|384000
                 res_line = res.split("|", 1)[1]
                 self.assertLooksLike(ref_line,  res_line)
 
+    def test_parallel(self):
+
+        self.runModule("g.region", res=10)
+        reference = SimpleModule("t.rast.univar", input="A", flags="e",
+                                 overwrite=True, verbose=True)
+        self.assertModule(reference)
+
+        t_rast_univar = SimpleModule("t.rast.univar", input="A", flags="e",
+                                     nprocs=2, overwrite=True, verbose=True)
+        self.assertModule(t_rast_univar)
+        self.assertEqual(reference.outputs.stdout,
+                         t_rast_univar.outputs.stdout)
+
+        t_rast_univar = SimpleModule("t.rast.univar", input="A", flags="ep",
+                                     nprocs=2, overwrite=True, verbose=True)
+        self.assertModule(t_rast_univar)
+        self.assertEqual(reference.outputs.stdout,
+                         t_rast_univar.outputs.stdout)
+
+    def test_in_process_raster_region(self):
+
+        self.runModule("g.region", res=10)
+        reference = SimpleModule("t.rast.univar", input="A", flags="r",
+                                 overwrite=True, verbose=True)
+        self.assertModule(reference)
+
+        t_rast_univar = SimpleModule("t.rast.univar", input="A", flags="rp",
+                                     overwrite=True, verbose=True)
+        self.assertModule(t_rast_univar)
+        self.assertEqual(reference.outputs.stdout,
+                         t_rast_univar.outputs.stdout)
+
     def test_6_error_handling_empty_strds(self):
         # Empty strds
         self.assertModuleFail("t.rast.univar", input="A",
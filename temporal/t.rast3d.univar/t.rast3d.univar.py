@@ -40,6 +40,15 @@
 #% guisection: Formatting
 #%end
 
+#%option
+#% key: nprocs
+#% type: integer
+#% description: Number of r3.univar processes to run in parallel
+#% required: no
+#% multiple: no
+#% answer: 1
+#%end
+
 #%flag
 #% key: e
 #% description: Calculate extended statistics
@@ -66,6 +75,7 @@ def main():
     extended = flags["e"]
     no_header = flags["s"]
     separator = grass.separator(options["separator"])
+    nprocs = int(options["nprocs"])
 
     # Make sure the temporal database exists
     tgis.init()
@@ -76,7 +86,8 @@ def main():
         output = None
 
     tgis.print_gridded_dataset_univar_statistics(
-        "str3ds", input, output, where, extended, no_header, separator)
+        "str3ds", input, output, where, extended, no_header, separator,
+        nprocs=nprocs)
 
 if __name__ == "__main__":
     options, flags = grass.parser()
@@ -123,7 +123,7 @@ def main():
 
     if map_update:
         #Update the registered maps from the grass spatial database
-        statement = ""
+        batch = tgis.SQLStatementBatch(ordered=False)
         # This dict stores the datasets that must be updated
         dataset_dict = {}
 
@@ -144,7 +144,7 @@ def main():
             if map.map_exists():
                 # Read new metadata from the spatial database
                 map.load()
-                statement += map.update(dbif=dbif, execute=False)
+                map.update(dbif=dbif, execute=False, batch=batch)
             else:
                 # Delete the map from the temporal database
                 # We need to update all effected space time datasets
@@ -153,10 +153,11 @@ def main():
                     for dataset in datasets:
                         dataset_dict[dataset] = dataset
                 # Collect the delete statements
-                statement += map.delete(dbif=dbif, update=False, execute=False)
+                map.delete(dbif=dbif, update=False, execute=False,
+                           batch=batch)
 
         # Execute the collected SQL statements
-        dbif.execute_transaction(statement)
+        dbif.execute_batch(batch)
 
         # Update the effected space time datasets
         for id in dataset_dict:
@@ -110,7 +110,8 @@ def main():
     update_dict = {}
     count = 0
 
-    statement = ""
+    # The gathered SQL statements
+    batch = tgis.SQLStatementBatch(ordered=False)
 
     # Unregister already registered maps
     grass.message(_("Unregister maps"))
@@ -125,8 +126,8 @@ def main():
             # Unregister from a single dataset
             if input:
                 # Collect SQL statements
-                statement += sp.unregister_map(
-                    map=map, dbif=dbif, execute=False)
+                sp.unregister_map(map=map, dbif=dbif, execute=False,
+                                  batch=batch)
 
             # Unregister from temporal database
             else:
@@ -138,7 +139,8 @@ def main():
                     for dataset in datasets:
                         update_dict[dataset] = dataset
                 # Collect SQL statements
-                statement += map.delete(dbif=dbif, update=False, execute=False)
+                map.delete(dbif=dbif, update=False, execute=False,
+                           batch=batch)
         else:
             grass.warning(_("Unable to find %s map <%s> in temporal database" %
                             (map.get_type(), map.get_id())))
@@ -146,8 +148,7 @@ def main():
         count += 1
 
     # Execute the collected SQL statenents
-    if statement:
-        dbif.execute_transaction(statement)
+    dbif.execute_batch(batch)
 
     grass.percent(num_maps, num_maps, 1)
 